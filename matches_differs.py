@@ -5,8 +5,15 @@ import os
 import logging
 import math
 import random
+import sys
 from datetime import datetime
-from collections import deque, Counter
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from digit_stats import DigitDistribution, DIGITS
+from ticks import last_digit
 
 
 # Configuration
@@ -20,9 +27,9 @@ MAX_TIMEOUT = 5  # Maximum timeout for trade responses in seconds
 
 
 class DerivBot:
-    def __init__(self):
+    def __init__(self, endpoint=None):
         self.logger = logging.getLogger("DerivBot")
-        self.endpoint = f"wss://ws.binaryws.com/websockets/v3?app_id={DERIV_APP_ID}"
+        self.endpoint = endpoint or os.getenv("DERIV_WS_URL") or f"wss://ws.binaryws.com/websockets/v3?app_id={DERIV_APP_ID}"
         self.balance = 0
         self.base_stake = MIN_STAKE
         self.stake = self.base_stake
@@ -33,7 +40,8 @@ class DerivBot:
         self.profit_percentage = PROFIT_PERCENTAGE / 100
         self.base_profit_on_win = self.profit_percentage * self.stake
         self.outcome_on_win = self.stake + self.base_profit_on_win
-        self.tick_history = deque(maxlen=1000)  # Store last 1000 ticks
+        self.digits = DigitDistribution((1000,), symbol=SYMBOL)  # Last digits of the last 1000 ticks
+        self.pip_size = 2  # Quoted decimals of SYMBOL, refreshed from ticks_history
         self.least_digit = 0
 
     async def connect_forever(self):
@@ -45,7 +53,7 @@ class DerivBot:
                     await self.authorize()
                     # Fetch initial 1000 ticks
                     initial_ticks = await self.fetch_ticks(count=1000)
-                    self.tick_history.extend(initial_ticks)
+                    self.add_ticks(initial_ticks)
                     await self.trade_loop()
             except websockets.exceptions.ConnectionClosedError:
                 self.logger.warning(f"WebSocket failed. Reconnecting in {reconnect_delay}s...")
@@ -75,6 +83,7 @@ class DerivBot:
         try:
             res = json.loads(await self.ws.recv())
             if res.get("msg_type") == "history":
+                self.pip_size = int(res.get("pip_size", self.pip_size))
                 return res["history"]["prices"]
             else:
                 self.logger.error("Failed to fetch ticks")
@@ -83,11 +92,13 @@ class DerivBot:
             self.logger.error("Invalid JSON in ticks response")
             return []
 
-    def get_least_occurring_digit(self, ticks):
-        last_digits = [int(str(price).split('.')[1][-1]) for price in ticks if len(str(price).split('.')) > 1]
-        digit_counts = Counter(last_digits)
-        if digit_counts:
-            return min(digit_counts, key=digit_counts.get)
+    def add_ticks(self, prices):
+        self.digits.extend([last_digit(price, self.pip_size) for price in prices])
+
+    def get_least_occurring_digit(self, window):
+        # Digits that never appeared count as zero
+        if window.total:
+            return min(range(DIGITS), key=window.counts.__getitem__)
         return random.randint(0, 9)  # Fallback if no digits found
 
     async def trade_loop(self):
@@ -96,10 +107,10 @@ class DerivBot:
             await asyncio.sleep(0.01)
 
     async def place_trade(self):
-        # Fetch latest 20 ticks and update tick_history
+        # Fetch latest 20 ticks and update the digit counts
         latest_ticks = await self.fetch_ticks(count=20)
-        self.tick_history.extend(latest_ticks)  # Replaces oldest 20 due to maxlen=1000
-        self.least_digit = self.get_least_occurring_digit(self.tick_history)
+        self.add_ticks(latest_ticks)  # Replaces oldest 20 in the 1000 tick window
+        self.least_digit = self.get_least_occurring_digit(self.digits[1000])
         buy_request = {
             "buy": 1,
             "price": self.stake,
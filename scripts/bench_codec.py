@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+JSON codec benchmark
+Messages per second for Deriv tick, proposal and buy frames on each installed codec
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from codec import available_codecs, get_codec
+
+
+# Representative frames as Deriv sends them
+INBOUND_FRAMES = {
+    "tick": (
+        '{"echo_req":{"subscribe":1,"ticks":"1HZ10V"},"msg_type":"tick",'
+        '"subscription":{"id":"2c6ad4ab-0a94-3fe4-8b4c-d3b1f0cbd4e2"},'
+        '"tick":{"ask":6342.711,"bid":6342.491,"epoch":1718000000,'
+        '"id":"2c6ad4ab-0a94-3fe4-8b4c-d3b1f0cbd4e2","pip_size":2,'
+        '"quote":6342.6,"symbol":"1HZ10V"}}'
+    ),
+    "proposal": (
+        '{"echo_req":{"amount":1,"basis":"stake","contract_type":"DIGITEVEN","currency":"USD",'
+        '"duration":1,"duration_unit":"t","proposal":1,"subscribe":1,"symbol":"R_50"},'
+        '"msg_type":"proposal","proposal":{"ask_price":1,"date_expiry":1718000002,'
+        '"date_start":1718000000,"display_value":"1.00",'
+        '"id":"5e4a8a3f-0c19-6bb4-0f6e-1b3c0c9b7a5d","longcode":"Win payout if the last '
+        'digit of Volatility 50 Index is even after 1 ticks.","payout":1.95,"spot":253.4521,'
+        '"spot_time":1718000000},"req_id":3,"subscription":{"id":"5e4a8a3f-0c19-6bb4-0f6e-1b3c0c9b7a5d"}}'
+    ),
+    "buy": (
+        '{"buy":{"balance_after":9985.42,"buy_price":1,"contract_id":243515849708,'
+        '"longcode":"Win payout if the last digit of Volatility 50 Index is even after 1 ticks.",'
+        '"payout":1.95,"purchase_time":1718000000,"shortcode":"DIGITEVEN_R_50_1.95_1718000000_1T_S0P_0",'
+        '"start_time":1718000000,"transaction_id":486401627748},'
+        '"echo_req":{"buy":"5e4a8a3f-0c19-6bb4-0f6e-1b3c0c9b7a5d","price":1},"msg_type":"buy","req_id":4}'
+    ),
+}
+
+OUTBOUND_MESSAGES = {
+    "tick": {"ticks": "1HZ10V", "subscribe": 1, "req_id": 2},
+    "proposal": {
+        "proposal": 1, "subscribe": 1, "amount": 1.0, "basis": "stake", "contract_type": "DIGITEVEN",
+        "currency": "USD", "symbol": "R_50", "duration": 1, "duration_unit": "t", "req_id": 3
+    },
+    "buy": {"buy": "5e4a8a3f-0c19-6bb4-0f6e-1b3c0c9b7a5d", "price": 1.0, "req_id": 4},
+}
+
+
+def messages_per_second(func, payload, iterations: int) -> float:
+    """Best-of-three throughput of func(payload)"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(payload)
+        best = min(best, time.perf_counter() - start)
+    return iterations / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON codecs on Deriv frames")
+    parser.add_argument("--iterations", type=int, default=100_000, help="Messages per measurement")
+    args = parser.parse_args()
+
+    print(f"{'codec':<8} {'frame':<10} {'decode msg/s':>14} {'encode msg/s':>14}")
+    print("-" * 50)
+
+    for name in available_codecs():
+        codec = get_codec(name)
+        for frame in INBOUND_FRAMES:
+            decode_rate = messages_per_second(codec.loads, INBOUND_FRAMES[frame], args.iterations)
+            encode_rate = messages_per_second(codec.dumps, OUTBOUND_MESSAGES[frame], args.iterations)
+            print(f"{name:<8} {frame:<10} {decode_rate:>14,.0f} {encode_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Event loop benchmark
+Tick throughput and tick-to-callback latency of DerivClient on asyncio and uvloop
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+
+# Add src to path
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC)
+
+from deriv_client import DerivClient
+from event_loop import LOOP_CHOICES, available_loops, run
+from local_server import DEFAULT_SYMBOLS
+from metrics import LatencyHistogram
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, tick_rate: float, seed: int) -> subprocess.Popen:
+    """
+    Local server in its own process, so the loop under test only runs the client
+
+    The server always runs on plain asyncio - it is the same for every loop measured.
+    """
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SRC, "local_server.py"), "--port", str(port),
+         "--tick-rate", str(tick_rate), "--seed", str(seed)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+
+    server.kill()
+    raise RuntimeError("Local server did not start")
+
+
+async def measure(url: str, duration: float, warmup: float) -> dict:
+    """Subscribe to every server symbol and count ticks delivered over duration seconds"""
+    client = DerivClient("1089", "bench-token", ws_url=url)
+    assert await client.connect() and await client.authenticate()
+
+    delivered = 0
+
+    async def on_tick(tick):
+        nonlocal delivered
+        delivered += 1
+
+    for symbol in DEFAULT_SYMBOLS:
+        await client.subscribe_ticks(symbol, on_tick)
+
+    await asyncio.sleep(warmup)
+    client.metrics.tick_to_callback = LatencyHistogram()  # Measure steady state only
+    start_ticks, start_wall, start_cpu = delivered, time.perf_counter(), time.process_time()
+
+    await asyncio.sleep(duration)
+
+    ticks = delivered - start_ticks
+    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    latency = client.get_metrics()["tick_to_callback"]
+    await client.disconnect()
+
+    return {
+        "ticks_per_s": ticks / wall,
+        "cpu_us_per_tick": cpu / max(ticks, 1) * 1e6,
+        "p50_ms": latency["p50_ms"],
+        "p99_ms": latency["p99_ms"],
+        "dropped": client.tick_stats["dropped"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DerivClient on each event loop")
+    parser.add_argument("--tick-rate", type=float, default=200.0, help="Server ticks per second per symbol")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per loop")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds discarded before measuring")
+    parser.add_argument("--seed", type=int, default=1, help="Server quote seed")
+    args = parser.parse_args()
+
+    loops = available_loops()
+    port = free_port()
+    server = start_server(port, args.tick_rate, args.seed)
+    url = f"ws://127.0.0.1:{port}"
+
+    offered = args.tick_rate * len(DEFAULT_SYMBOLS)
+    print(f"{len(DEFAULT_SYMBOLS)} symbols x {args.tick_rate:g} ticks/s = {offered:,.0f} ticks/s offered")
+    print(f"{'loop':<8} {'ticks/s':>10} {'cpu us/tick':>12} {'p50 ms':>8} {'p99 ms':>8} {'dropped':>8}")
+    print("-" * 60)
+
+    try:
+        for name in loops:
+            result = run(measure(url, args.duration, args.warmup), name)
+            print(f"{name:<8} {result['ticks_per_s']:>10,.0f} {result['cpu_us_per_tick']:>12.1f} " +
+                  f"{result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f} {result['dropped']:>8,}")
+    finally:
+        server.terminate()
+        server.wait()
+
+    for name in LOOP_CHOICES:
+        if name not in loops:
+            print(f"{name}: not installed (pip install {name})")
+
+
+if __name__ == "__main__":
+    main()
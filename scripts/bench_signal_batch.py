@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Batch signal benchmark
+Offline signal evaluation per tick (add_quote + analyze_signal) vs analyze_signal_batch
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from strategy_even_odd import OddEvenStrategy
+
+
+def synthetic_stream(count: int, seed: int = 7):
+    """Digits and quotes of a volatility index style random walk"""
+    rng = np.random.default_rng(seed)
+    quotes = np.round(6340.0 + np.cumsum(rng.normal(0, 0.5, count)), 2)
+    digits = (np.round(quotes * 100) % 10).astype(np.uint8)
+    return digits, quotes
+
+
+def per_tick(config, digits, quotes, payout_ratio: float):
+    strategy = OddEvenStrategy(config)
+    sides = []
+    for digit, quote in zip(digits.tolist(), quotes.tolist()):
+        strategy.add_quote(quote, digit)
+        sides.append(strategy.analyze_signal(10.0, payout_ratio).side)
+    return sides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch signal evaluation")
+    parser.add_argument("--ticks", type=int, default=1_000_000, help="Ticks for the batch run")
+    parser.add_argument("--per-tick", type=int, default=100_000, help="Ticks for the per-tick run (extrapolated)")
+    parser.add_argument("--estimator", choices=("welford", "ewma"), default="welford")
+    args = parser.parse_args()
+
+    config = {"cooldown_between_trades": 0, "volatility_estimator": args.estimator}
+    digits, quotes = synthetic_stream(args.ticks)
+
+    strategy = OddEvenStrategy(config)
+    runs = []
+    for _ in range(3):
+        start = time.perf_counter()
+        batch = strategy.analyze_signal_batch(digits, quotes, 1.9)
+        runs.append(time.perf_counter() - start)
+    batch_seconds = min(runs)
+
+    count = min(args.per_tick, args.ticks)
+    start = time.perf_counter()
+    sides = per_tick(config, digits[:count], quotes[:count], 1.9)
+    per_tick_seconds = (time.perf_counter() - start) * args.ticks / count
+
+    prefix = strategy.analyze_signal_batch(digits[:count], quotes[:count], 1.9)
+    identical = sides == prefix.side.tolist()
+
+    print(f"ticks:              {args.ticks:>12,}")
+    print(f"signals:            {int((batch.side != 'SKIP').sum()):>12,}")
+    print(f"per tick:           {per_tick_seconds:>11.2f}s (from {count:,} ticks)")
+    print(f"batch:              {batch_seconds:>11.3f}s")
+    print(f"speedup:            {per_tick_seconds / batch_seconds:>11.0f}x")
+    print(f"identical sides:    {'yes' if identical else 'NO':>12}")
+
+
+if __name__ == "__main__":
+    main()
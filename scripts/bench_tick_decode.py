@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tick decoding benchmark
+Stage "digits": the pip_size last-digit decoder against the old str(float(quote)) extraction
+Stage "frames": ticks per second per core from raw frame to callback, full JSON decode vs the tick fast path
+"""
+
+import sys
+import os
+import time
+import random
+import asyncio
+import argparse
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from codec import available_codecs, get_codec
+from deriv_client import DerivClient
+from ticks import decode_tick, decode_tick_frame
+
+
+SUBSCRIPTION_ID = "2c6ad4ab-0a94-3fe4-8b4c-d3b1f0cbd4e2"
+
+
+# Stage "digits" - last-digit extraction from decoded tick payloads
+
+def legacy_decode(tick_data):
+    """The string-splitting decoder DerivClient used before ticks.decode_tick"""
+    tick = {
+        "symbol": tick_data.get("symbol"),
+        "quote": float(tick_data.get("quote", 0)),
+        "epoch": int(tick_data.get("epoch", 0)),
+        "timestamp": time.time()
+    }
+
+    quote_str = str(tick["quote"])
+    if "." in quote_str:
+        last_digit = int(quote_str.split(".")[-1][-1])
+        tick["last_digit"] = last_digit
+        tick["is_odd"] = last_digit % 2 == 1
+
+    return tick
+
+
+def payloads_per_second(decoder, payloads) -> float:
+    """Best-of-three decode throughput"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for payload in payloads:
+            decoder(payload)
+        best = min(best, time.perf_counter() - start)
+    return len(payloads) / best
+
+
+def bench_digits(count: int):
+    rng = random.Random(42)
+    payloads = [
+        {"symbol": "R_50", "epoch": 1718000000 + i, "pip_size": 4,
+         "quote": round(250 + rng.gauss(0, 5), 4)}
+        for i in range(count)
+    ]
+
+    # Digits the legacy path gets wrong because JSON drops trailing zeros
+    wrong = sum(
+        1 for payload in payloads
+        if legacy_decode(payload).get("last_digit") != decode_tick(payload).last_digit
+    )
+
+    legacy_rate = payloads_per_second(legacy_decode, payloads)
+    decoder_rate = payloads_per_second(decode_tick, payloads)
+
+    print(f"legacy str() decoder:  {legacy_rate:>12,.0f} ticks/s")
+    print(f"pip_size decoder:      {decoder_rate:>12,.0f} ticks/s  ({decoder_rate / legacy_rate:.2f}x)")
+    print(f"legacy digit errors:   {wrong:>12,} / {len(payloads):,} ({wrong / len(payloads):.1%})")
+
+
+# Stage "frames" - raw tick frames, full JSON decode vs the fast path
+
+def tick_frames(count: int):
+    """Compact tick frames as Deriv pushes them, quotes varying like a live stream"""
+    return [
+        '{"echo_req":{"req_id":2,"subscribe":1,"ticks":"1HZ10V"},"msg_type":"tick","req_id":2,'
+        f'"subscription":{{"id":"{SUBSCRIPTION_ID}"}},'
+        f'"tick":{{"ask":{6342.711 + i / 100:.3f},"bid":{6342.491 + i / 100:.3f},"epoch":{1718000000 + i},'
+        f'"id":"{SUBSCRIPTION_ID}","pip_size":2,"quote":{6342.6 + i / 100:.2f},"symbol":"1HZ10V"}}}}'
+        for i in range(count)
+    ]
+
+
+def decodes_per_second(codec: str, fast: bool, frames) -> float:
+    """Frames turned into TickRecords per CPU second, decoding only"""
+    loads = get_codec(codec).loads
+
+    start = time.process_time()
+    if fast:
+        for frame in frames:
+            decode_tick_frame(frame)
+    else:
+        for frame in frames:
+            decode_tick(loads(frame)["tick"])
+    return len(frames) / (time.process_time() - start)
+
+
+async def ticks_per_second(codec: str, fast: bool, frames) -> float:
+    """Frames pushed through DerivClient._handle_frame until every callback ran, per CPU second"""
+    client = DerivClient("bench", "bench", json_codec=codec, fast_tick_decode=fast, tick_overflow="block")
+    delivered = 0
+
+    async def on_tick(tick):
+        nonlocal delivered
+        delivered += 1
+
+    client.route_ticks("1HZ10V", on_tick)
+    client._adopt_stream(client.codec.loads(frames[0]))
+
+    start = time.process_time()
+    for frame in frames:
+        await client._handle_frame(frame)
+    await client._tick_queue.join()
+    elapsed = time.process_time() - start
+
+    client._stop_tick_consumers()
+    assert delivered == len(frames)
+    return len(frames) / elapsed
+
+
+def bench_frames(count: int):
+    frames = tick_frames(count)
+
+    print(f"{'codec':<8} {'stage':<18} {'full decode/s':>14} {'fast path/s':>14} {'speedup':>8}")
+    print("-" * 67)
+
+    stages = {
+        "decode": decodes_per_second,
+        "frame to callback": lambda name, fast, frames: asyncio.run(ticks_per_second(name, fast, frames)),
+    }
+
+    for name in available_codecs():
+        for stage, measure in stages.items():
+            # Best of five, alternating so drift hits both paths alike.
+            # One core, so per second of CPU is per core.
+            runs = [(measure(name, False, frames), measure(name, True, frames)) for _ in range(5)]
+            full, fast = max(run[0] for run in runs), max(run[1] for run in runs)
+            print(f"{name:<8} {stage:<18} {full:>14,.0f} {fast:>14,.0f} {fast / full:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tick decoding")
+    parser.add_argument("--stage", choices=("digits", "frames", "all"), default="all",
+                        help="digits: last-digit decoders; frames: raw frame full decode vs fast path")
+    parser.add_argument("--ticks", type=int, default=200_000, help="Ticks per measurement")
+    args = parser.parse_args()
+
+    if args.stage in ("digits", "all"):
+        bench_digits(args.ticks)
+    if args.stage == "all":
+        print()
+    if args.stage in ("frames", "all"):
+        bench_frames(args.ticks)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from scipy import stats
 import time
 import random
 
+from tick_store import TickStore
+
 
 class BacktestEngine:
     """Backtest odd/even strategy with statistical validation"""
@@ -27,16 +29,17 @@ class BacktestEngine:
         
         # Results storage
         self.backtest_results = []
-        self.synthetic_ticks = []
+        self.synthetic_ticks = TickStore(1)
     
-    def generate_synthetic_ticks(self, count: int, symbol: str = "R_50") -> List[Dict]:
+    def generate_synthetic_ticks(self, count: int, symbol: str = "R_50") -> TickStore:
         """
         Generate synthetic tick data for backtesting
         Uses realistic price movements and digit distribution
         """
         self.logger.info(f"Generating {count} synthetic ticks for backtesting")
         
-        ticks = []
+        ticks = TickStore(count, symbol)
+        start_epoch = int(time.time())
         base_price = 100.0
         
         for i in range(count):
@@ -52,16 +55,7 @@ class BacktestEngine:
             price_str = f"{price:.5f}"
             last_digit = int(price_str[-1])
             
-            tick = {
-                "symbol": symbol,
-                "quote": price,
-                "epoch": int(time.time()) + i,
-                "last_digit": last_digit,
-                "is_odd": last_digit % 2 == 1,
-                "timestamp": time.time() + i
-            }
-            
-            ticks.append(tick)
+            ticks.append(start_epoch + i, price, last_digit)
         
         self.synthetic_ticks = ticks
         return ticks
@@ -81,63 +75,62 @@ class BacktestEngine:
         self.logger.info("Starting backtest simulation")
         
         # Generate synthetic data if needed
-        if not self.synthetic_ticks:
+        if not len(self.synthetic_ticks):
             self.generate_synthetic_ticks(self.min_samples)
+        ticks = self.synthetic_ticks
+        digits = ticks.digits().tolist()
+        
+        # Every tick's signal at once - the strategy's own history is left alone
+        signals = strategy.analyze_signal_batch(ticks.digits(), ticks.quotes(), payout_ratio)
         
         # Initialize simulation
         balance = starting_balance
         trades = []
         equity_curve = [balance]
         
-        # Process each tick
-        for i, tick in enumerate(self.synthetic_ticks):
-            strategy.add_tick(tick)
-            
-            # Skip initial period for strategy warmup
+        # Process each signalled tick, skipping the initial period for strategy warmup
+        for i in np.flatnonzero(signals.side != "SKIP").tolist():
             if i < strategy.lookback_window:
                 continue
             
-            # Get strategy signal
-            signal = strategy.analyze_signal(balance, payout_ratio)
+            signal = signals.signal(i)
             
-            if signal.side != "SKIP":
-                # Calculate stake
-                stake = signal.stake_fraction * balance
-                stake = min(stake, balance * 0.02)  # Risk limit
-                stake = max(stake, 0.01)  # Minimum stake
+            # Calculate stake
+            stake = signal.stake_fraction * balance
+            stake = min(stake, balance * 0.02)  # Risk limit
+            stake = max(stake, 0.01)  # Minimum stake
+            
+            if stake > balance:
+                continue  # Skip if insufficient balance
+            
+            # Simulate trade outcome using actual tick
+            next_tick_idx = i + 1
+            if next_tick_idx < len(digits):
+                actual_outcome = "ODD" if digits[next_tick_idx] % 2 == 1 else "EVEN"
+                
+                win = (signal.side == actual_outcome)
+                
+                if win:
+                    profit = stake * (payout_ratio - 1)
+                else:
+                    profit = -stake
+                
+                balance += profit
                 
-                if stake > balance:
-                    continue  # Skip if insufficient balance
+                trade = {
+                    "tick_index": i,
+                    "side": signal.side,
+                    "stake": stake,
+                    "actual_outcome": actual_outcome,
+                    "win": win,
+                    "profit": profit,
+                    "balance": balance,
+                    "confidence": signal.confidence,
+                    "reason": signal.reason
+                }
                 
-                # Simulate trade outcome using actual tick
-                next_tick_idx = i + 1
-                if next_tick_idx < len(self.synthetic_ticks):
-                    outcome_tick = self.synthetic_ticks[next_tick_idx]
-                    actual_outcome = "ODD" if outcome_tick["is_odd"] else "EVEN"
-                    
-                    win = (signal.side == actual_outcome)
-                    
-                    if win:
-                        profit = stake * (payout_ratio - 1)
-                    else:
-                        profit = -stake
-                    
-                    balance += profit
-                    
-                    trade = {
-                        "tick_index": i,
-                        "side": signal.side,
-                        "stake": stake,
-                        "actual_outcome": actual_outcome,
-                        "win": win,
-                        "profit": profit,
-                        "balance": balance,
-                        "confidence": signal.confidence,
-                        "reason": signal.reason
-                    }
-                    
-                    trades.append(trade)
-                    equity_curve.append(balance)
+                trades.append(trade)
+                equity_curve.append(balance)
         
         # Calculate performance metrics
         results = self._calculate_metrics(trades, equity_curve, starting_balance, payout_ratio)
@@ -0,0 +1,388 @@
+"""
+Sharded Deriv Connection Pool
+Spreads subscriptions and requests over several authenticated connections
+"""
+
+import asyncio
+import logging
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from deriv_client import SIDE_CONTRACT_TYPES, DerivClient, TickRoute
+from metrics import ClientMetrics
+
+
+class DerivClientPool:
+    """
+    Several DerivClient connections behind the single-client API
+
+    Symbol streams (ticks, proposals) live on the member picked by a stable
+    hash of the symbol, so one symbol's ticks, quotes and buys share a
+    connection. Other requests go to the least-loaded member. Streams move to
+    where the hash wants them as soon as a member reconnects, and a pool
+    watchdog moves them off members that stay down.
+    """
+
+    def __init__(self, clients: List[DerivClient]):
+        if not clients:
+            raise ValueError("DerivClientPool needs at least one client")
+
+        self.clients = clients
+        self.logger = logging.getLogger(__name__)
+
+        # Pool-level stream records - what to re-open when a stream moves member
+        self._placements: Dict[Tuple, DerivClient] = {}  # stream key -> member holding it
+        self._tick_routes: Dict[str, TickRoute] = {}
+        self._tick_backfill: Dict[str, int] = {}
+        self._contract_owners: Dict[str, DerivClient] = {}  # contract_id -> member that bought it
+
+        # Rebalancing - on every member recovery, and on a timer for members that stay down
+        self.watchdog_interval = min(client.watchdog_interval for client in clients)
+        self._watchdog_task: Optional[asyncio.Task] = None
+        self._rebalance_lock = asyncio.Lock()
+        self.on_recovery_failed: Optional[Callable] = None  # Awaited with (pool, reason) once no member is left
+        for client in clients:
+            client.on_reconnect = self._on_member_reconnect
+            client.on_recovery_failed = self._on_member_failed
+
+    # Members
+
+    @property
+    def live_clients(self) -> List[DerivClient]:
+        """Members with an open connection"""
+        return [client for client in self.clients if client.is_connected]
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self.live_clients)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(client.in_flight for client in self.clients)
+
+    def _shard(self, symbol: str) -> DerivClient:
+        """Member that owns a symbol - the next live one if its own is down"""
+        start = zlib.crc32(symbol.encode()) % len(self.clients)
+        for offset in range(len(self.clients)):
+            client = self.clients[(start + offset) % len(self.clients)]
+            if client.is_connected:
+                return client
+        return self.clients[start]
+
+    def _least_loaded(self) -> DerivClient:
+        """Live member with the fewest requests awaiting a response"""
+        return min(self.live_clients or self.clients, key=lambda client: client.in_flight)
+
+    def _owner(self, key: Tuple) -> DerivClient:
+        """Member a pool stream should live on"""
+        if key[0] == "balance":
+            return (self.live_clients or self.clients)[0]
+        return self._shard(key[1])
+
+    # Connection lifecycle
+
+    async def connect(self) -> bool:
+        """Open every member connection - True if at least one is up"""
+        results = await asyncio.gather(*(client.connect() for client in self.clients))
+        if not all(results):
+            self.logger.warning(f"Pool connected {sum(results)}/{len(self.clients)} members")
+        if self._watchdog_task is None or self._watchdog_task.done():
+            self._watchdog_task = asyncio.create_task(self._watchdog())
+        return any(results)
+
+    async def authenticate(self) -> bool:
+        """Authorize every connected member"""
+        results = await asyncio.gather(*(client.authenticate() for client in self.live_clients))
+        return bool(results) and all(results)
+
+    async def disconnect(self):
+        """Disconnect every member"""
+        if self._watchdog_task is not None:
+            self._watchdog_task.cancel()
+            self._watchdog_task = None
+        await asyncio.gather(*(client.disconnect() for client in self.clients))
+
+    async def reconnect(self) -> bool:
+        """Reconnect dropped members, then move streams back to their owners"""
+        dropped = [client for client in self.clients if not client.is_connected]
+        if dropped:
+            await asyncio.gather(*(client.reconnect() for client in dropped))
+
+        if not self.is_connected:
+            return False
+
+        await self.rebalance()
+        return True
+
+    async def rebalance(self) -> int:
+        """
+        Move every pool stream to the member that owns it now
+
+        Returns:
+            Number of streams moved
+        """
+        moved = 0
+        async with self._rebalance_lock:
+            for key, current in list(self._placements.items()):
+                owner = self._owner(key)
+                if self._placements.get(key) is not current or owner is current or not owner.is_connected:
+                    continue
+
+                await self._move_stream(key, current, owner)
+                moved += 1
+
+        if moved:
+            self.logger.info(f"Rebalanced {moved} streams across {len(self.live_clients)} connections")
+        return moved
+
+    async def _on_member_reconnect(self, client: DerivClient):
+        """Move streams back to a member as soon as it has recovered"""
+        await self.rebalance()
+
+    async def _on_member_failed(self, client: DerivClient, reason: str):
+        """Retire a member that cannot recover - escalate once no member is left"""
+        self.logger.error(f"Retiring pool member after failed recoveries ({reason})")
+        await client.disconnect()
+        await self.rebalance()
+        if not self.is_connected and self.on_recovery_failed is not None:
+            await self.on_recovery_failed(self, reason)
+
+    async def _watchdog(self):
+        """Move streams off members that stay down, and back once they recover"""
+        while True:
+            await asyncio.sleep(self.watchdog_interval)
+            try:
+                await self.rebalance()
+            except Exception as e:
+                self.logger.error(f"Pool rebalance failed: {e}")
+
+    async def _move_stream(self, key: Tuple, source: DerivClient, target: DerivClient):
+        """Close a stream on one member and open it on another"""
+        if key[0] == "ticks":
+            symbol = key[1]
+            # Carry delivery position over so the target's backfill is not replayed
+            last_epoch = source._last_tick_epoch.get(symbol, 0)
+            await source.unsubscribe_ticks(symbol)
+            target._last_tick_epoch[symbol] = max(last_epoch, target._last_tick_epoch.get(symbol, 0))
+            await self._open_ticks(target, symbol)
+        elif key[0] == "proposal":
+            # Carry over why the stream is held - quoted, armed or both
+            for source_holds, target_holds in ((source.quoted_proposals, target.quoted_proposals),
+                                               (source.armed_orders, target.armed_orders)):
+                if key[1:] in source_holds:
+                    source_holds.discard(key[1:])
+                    target_holds.add(key[1:])
+            await source.unsubscribe(key)
+            await target._open_proposal(key[1:])
+        else:
+            await source.unsubscribe(key)
+            await target.subscribe_balance()
+
+        self._placements[key] = target
+
+    # Subscriptions
+
+    async def subscribe_balance(self) -> float:
+        """Hold the account balance stream on one member"""
+        client = self._owner(("balance",))
+        self._placements[("balance",)] = client
+        return await client.subscribe_balance()
+
+    @property
+    def balance(self) -> float:
+        return self._placements.get(("balance",), self.clients[0]).balance
+
+    async def get_balance(self, force_refresh: bool = False) -> float:
+        client = self._placements.get(("balance",))
+        if client is None or not client.is_connected:
+            client = self._least_loaded()
+        return await client.get_balance(force_refresh)
+
+    async def subscribe_ticks(self, symbol: str = "R_50", callback: Optional[Callable] = None,
+                              backfill: int = 0, history_callback: Optional[Callable] = None):
+        """Subscribe to a symbol's ticks on the member that owns the symbol"""
+        route = self._tick_routes.get(symbol)
+        if route is None:
+            route = self._tick_routes[symbol] = TickRoute(symbol)
+        if callback and callback not in route.callbacks:
+            route.callbacks.append(callback)
+        if history_callback and history_callback not in route.history_callbacks:
+            route.history_callbacks.append(history_callback)
+        self._tick_backfill[symbol] = max(backfill, self._tick_backfill.get(symbol, 0))
+
+        client = self._placements.get(("ticks", symbol)) or self._shard(symbol)
+        self._placements[("ticks", symbol)] = client
+        await self._open_ticks(client, symbol)
+
+    async def _open_ticks(self, client: DerivClient, symbol: str):
+        """Register the pool's consumers for a symbol on a member and open its stream"""
+        route = self._tick_routes[symbol]
+        member_route = client.tick_routes.get(symbol)
+        if member_route is None:
+            member_route = client.tick_routes[symbol] = TickRoute(symbol)
+
+        # Every consumer is in place before the stream (and its backfill) opens
+        for callbacks, member_callbacks in ((route.callbacks, member_route.callbacks),
+                                            (route.history_callbacks, member_route.history_callbacks)):
+            member_callbacks.extend(callback for callback in callbacks if callback not in member_callbacks)
+
+        await client.subscribe_ticks(symbol, backfill=self._tick_backfill.get(symbol, 0))
+
+    async def unsubscribe_ticks(self, symbol: str, callback: Optional[Callable] = None) -> bool:
+        """Remove a tick consumer; the stream is forgotten with its last consumer"""
+        route = self._tick_routes.get(symbol)
+        client = self._placements.get(("ticks", symbol))
+        if route is None or client is None:
+            return False
+
+        if callback is None:
+            route.callbacks.clear()
+            route.history_callbacks.clear()
+        else:
+            for callbacks in (route.callbacks, route.history_callbacks):
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        if not (route.callbacks or route.history_callbacks):
+            del self._tick_routes[symbol]
+            del self._placements[("ticks", symbol)]
+            self._tick_backfill.pop(symbol, None)
+
+        return await client.unsubscribe_ticks(symbol, callback)
+
+    @property
+    def tick_symbols(self) -> List[str]:
+        return list(self._tick_routes)
+
+    async def fetch_pip_sizes(self) -> Dict[str, int]:
+        """Load pip sizes on every member - each decodes its own ticks"""
+        results = await asyncio.gather(*(client.fetch_pip_sizes() for client in self.live_clients))
+        return next((pip_sizes for pip_sizes in results if pip_sizes), {})
+
+    # Proposals and trading
+
+    async def subscribe_proposal(self, symbol: str = "R_50", contract_type: str = "DIGITEVEN",
+                                 stake: float = 1) -> Dict:
+        """Stream proposals on the member that owns the symbol (proposal ids are per connection)"""
+        key = ("proposal", symbol, contract_type, DerivClient._stake_bucket(stake))
+        client = self._placements.get(key) or self._shard(symbol)
+        self._placements[key] = client
+        return await client.subscribe_proposal(symbol, contract_type, stake)
+
+    async def unsubscribe_proposal(self, symbol: str = "R_50", contract_type: str = "DIGITEVEN",
+                                   stake: float = 1) -> bool:
+        key = ("proposal", symbol, contract_type, DerivClient._stake_bucket(stake))
+        client = self._placements.get(key)
+        if client is None:
+            return False
+        released = await client.unsubscribe_proposal(symbol, contract_type, stake)
+        self._drop_closed_placement(key, client)
+        return released
+
+    async def arm_order(self, side: str, stake: float, symbol: str = "R_50") -> Dict:
+        """Keep a proposal id ready on the member that owns the symbol"""
+        key = ("proposal", symbol, SIDE_CONTRACT_TYPES[side], DerivClient._stake_bucket(stake))
+        client = self._placements.get(key) or self._shard(symbol)
+        self._placements[key] = client
+        return await client.arm_order(side, stake, symbol)
+
+    async def disarm_order(self, side: str, stake: float, symbol: str = "R_50") -> bool:
+        key = ("proposal", symbol, SIDE_CONTRACT_TYPES[side], DerivClient._stake_bucket(stake))
+        client = self._placements.get(key)
+        if client is None:
+            return False
+        disarmed = await client.disarm_order(side, stake, symbol)
+        self._drop_closed_placement(key, client)
+        return disarmed
+
+    def _drop_closed_placement(self, key: Tuple, client: DerivClient):
+        """Forget where a proposal stream lives once nothing holds it open any more"""
+        if key not in client.subscriptions:
+            self._placements.pop(key, None)
+
+    def get_cached_proposal(self, symbol: str, contract_type: str, stake: float) -> Optional[Dict]:
+        client = self._placements.get(("proposal", symbol, contract_type, DerivClient._stake_bucket(stake)))
+        return client.get_cached_proposal(symbol, contract_type, stake) if client else None
+
+    async def get_payout_info(self, symbol: str = "R_50") -> Dict:
+        return await self._shard(symbol).get_payout_info(symbol)
+
+    async def place_odd_even_trade(self, side: str, stake: float, symbol: str = "R_50",
+                                   max_price: Optional[float] = None,
+                                   signal_ns: Optional[int] = None) -> Dict:
+        """
+        Place a trade on the member quoting it, else the least-loaded one
+
+        A cached proposal can only be bought on the connection that streamed it.
+        """
+        contract_type = SIDE_CONTRACT_TYPES.get(side)
+        client = self._placements.get(("proposal", symbol, contract_type, DerivClient._stake_bucket(stake)))
+        if client is None or not client.is_connected:
+            client = self._least_loaded()
+
+        result = await client.place_odd_even_trade(side, stake, symbol, max_price, signal_ns)
+        if result.get("success"):
+            self._contract_owners[result["contract_id"]] = client
+        return result
+
+    async def get_contract_result(self, contract_id: str) -> Dict:
+        return await self._least_loaded().get_contract_result(contract_id)
+
+    async def wait_for_settlement(self, contract_id: str, timeout: Optional[float] = None) -> Dict:
+        """Wait on the member that bought the contract, polling elsewhere if it dropped"""
+        client = self._contract_owners.pop(contract_id, None)
+        if client is None or not client.is_connected:
+            client = self._least_loaded()
+
+        result = await client.wait_for_settlement(contract_id, timeout)
+        if not result and not client.is_connected and self.is_connected:
+            result = await self.get_contract_result(contract_id)
+        return result
+
+    async def send_requests(self, requests: List[Dict]) -> List[Dict]:
+        """Send independent requests spread over the live members, least loaded first"""
+        members = sorted(self.live_clients or self.clients, key=lambda client: client.in_flight)
+        return list(await asyncio.gather(*(
+            members[index % len(members)]._send_request(request)
+            for index, request in enumerate(requests)
+        )))
+
+    # Health and metrics
+
+    async def health_check(self) -> bool:
+        """Healthy only when every member is - a dropped member triggers reconnect()"""
+        results = await asyncio.gather(*(client.health_check() for client in self.clients))
+        return all(results)
+
+    def get_tick_queue_stats(self) -> Dict:
+        """Tick queue counters summed over members"""
+        totals: Dict = {}
+        for client in self.clients:
+            for name, value in client.get_tick_queue_stats().items():
+                if isinstance(value, int):
+                    totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def get_metrics(self) -> Dict:
+        """Pool-wide latency and timeout metrics, plus each member's own snapshot"""
+        combined = ClientMetrics()
+        for client in self.clients:
+            combined.merge(client.metrics)
+
+        return {
+            **combined.snapshot(),
+            "tick_queue": self.get_tick_queue_stats(),
+            "in_flight": self.in_flight,
+            "connections": [
+                {"connected": client.is_connected, **client.get_metrics()}
+                for client in self.clients
+            ]
+        }
+
+    async def __aenter__(self):
+        await self.connect()
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
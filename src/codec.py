@@ -0,0 +1,85 @@
+"""
+JSON Codec Selection for the WebSocket Hot Path
+Uses orjson or ujson when installed, falling back to the standard library
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List
+
+
+# Fastest first - "auto" picks the first one that imports
+CODEC_PREFERENCE = ("orjson", "ujson", "json")
+
+
+class JsonCodec:
+    """Paired loads/dumps for one JSON library"""
+
+    def __init__(self, name: str, loads: Callable[[Any], Any], dumps: Callable[[Any], str]):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    # orjson encodes to bytes; Deriv expects text frames
+    return JsonCodec("orjson", orjson.loads, lambda obj: orjson.dumps(obj).decode())
+
+
+def _ujson_codec() -> JsonCodec:
+    import ujson
+
+    return JsonCodec("ujson", ujson.loads, ujson.dumps)
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec("json", json.loads, json.dumps)
+
+
+_CODEC_FACTORIES: Dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> List[str]:
+    """Names of the codecs whose library is importable, fastest first"""
+    names = []
+    for name in CODEC_PREFERENCE:
+        try:
+            _CODEC_FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """
+    Build the requested codec
+
+    Args:
+        name: "auto", "orjson", "ujson" or "json"
+
+    Returns:
+        The requested codec, or the standard library one if its package is missing
+    """
+    name = (name or "auto").lower()
+
+    if name == "auto":
+        return _CODEC_FACTORIES[available_codecs()[0]]()
+
+    if name not in _CODEC_FACTORIES:
+        raise ValueError(f"Unknown JSON codec '{name}' - choose from auto, {', '.join(CODEC_PREFERENCE)}")
+
+    try:
+        return _CODEC_FACTORIES[name]()
+    except ImportError:
+        logging.getLogger(__name__).warning(f"JSON codec '{name}' is not installed - using stdlib json")
+        return _stdlib_codec()
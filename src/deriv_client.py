@@ -4,25 +4,120 @@ Handles authentication, balance fetching, tick streaming, and trade execution
 """
 
 import asyncio
-import json
 import logging
 import os
 import time
-from typing import Dict, Optional, Callable, Any
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple
 import websockets
 from websockets.exceptions import ConnectionClosed, InvalidStatusCode
 
+from codec import get_codec
+from metrics import ClientMetrics
+from rate_limit import PriorityRateLimiter, lane_for
+from recorder import FrameRecorder
+from ticks import TickRecord, decode_tick, decode_tick_frame, pip_size_from_pip
+
+
+# What to do with a new tick when the tick queue is full
+TICK_OVERFLOW_POLICIES = ("block", "drop_oldest", "coalesce")
+
+def expected_tick_interval(symbol: str) -> float:
+    """Seconds between ticks - 1HZ indices tick every second, the others every two"""
+    return 1.0 if symbol.startswith("1HZ") else 2.0
+
+
+# Registry stream kind -> Deriv stream type (as used by forget_all)
+STREAM_TYPES = {
+    "ticks": "ticks",
+    "proposal": "proposal",
+    "balance": "balance",
+    "contract": "proposal_open_contract",
+}
+
+# Trade side -> digit contract type
+SIDE_CONTRACT_TYPES = {"ODD": "DIGITODD", "EVEN": "DIGITEVEN"}
+
+# Buy errors meaning the armed proposal id is gone - the order is re-armed on a fresh stream
+STALE_PROPOSAL_ERRORS = ("InvalidContractProposal",)
+
+# Error codes of requests that got no answer - a stream hit by one stays registered and is retried
+TRANSPORT_ERRORS = ("RequestTimeout", "TransportError")
+
+# Rounds of re-opening streams after a reconnect before giving up until the next one
+RESUBSCRIBE_ATTEMPTS = 3
+
+# Most ticks a single ticks_history request returns
+HISTORY_PAGE_SIZE = 5000
+
+# Seconds to wait for a response, keyed by request msg_type
+DEFAULT_REQUEST_TIMEOUTS = {
+    "default": 10.0,
+    "authorize": 10.0,
+    "balance": 5.0,
+    "proposal": 5.0,
+    "buy": 5.0,
+    "proposal_open_contract": 5.0,
+    "ping": 5.0,
+}
+
+
+@dataclass
+class Subscription:
+    """An open stream and the request that re-opens it after a reconnect"""
+    key: Tuple  # (stream kind, *identity) e.g. ("ticks", "R_50")
+    request: Dict  # Subscribe request without req_id
+    req_id: Optional[int] = None  # Echoed on every message of the current stream
+    subscription_id: Optional[str] = None
+    last_message_ns: int = 0  # Receive time of the stream's latest message (watchdog)
+
+
+@dataclass
+class TickRoute:
+    """Consumers of one symbol's ticks"""
+    symbol: str
+    callbacks: List[Callable] = field(default_factory=list)  # Awaited with each live tick
+    history_callbacks: List[Callable] = field(default_factory=list)  # Awaited with backfilled batches
+
+
+class TickQueue(asyncio.Queue):
+    """Tick queue whose overflow eviction skips backfill batches (lists)"""
+    
+    def evict_oldest_tick(self):
+        """Remove and return the oldest queued tick, or None if only batches are queued"""
+        for index, item in enumerate(self._queue):
+            if not isinstance(item, list):
+                del self._queue[index]
+                self.task_done()
+                return item
+        return None
+
+
+class SubscriptionError(Exception):
+    """The server refused to open a stream"""
+
 
 class DerivClient:
     """Secure WebSocket client for Deriv API with safety checks"""
     
-    def __init__(self, app_id: str, api_token: str, environment: str = "demo"):
+    def __init__(self, app_id: str, api_token: str, environment: str = "demo",
+                 max_in_flight: int = 32, request_timeouts: Optional[Dict[str, float]] = None,
+                 settlement_timeout: float = 15.0, json_codec: str = "auto",
+                 tick_queue_size: int = 10000, tick_overflow: str = "drop_oldest",
+                 tick_consumers: int = 1, ws_url: Optional[str] = None,
+                 rate_limits: Optional[Dict] = None, record_path: Optional[str] = None,
+                 watchdog_interval: float = 1.0, stale_tick_intervals: float = 5.0,
+                 max_ping_rtt: float = 5.0, fast_tick_decode: bool = True,
+                 max_recovery_attempts: int = 5):
         self.app_id = app_id
         self.api_token = api_token
         self.environment = environment
         self.websocket = None
+        self._reader_task: Optional[asyncio.Task] = None
         self.is_connected = False
         self.is_authenticated = False
+        self._authorized_websocket = None  # Socket the last successful authorize ran on
         self.account_info = None
         self.balance = 0.0
         self.logger = logging.getLogger(__name__)
@@ -31,19 +126,98 @@ class DerivClient:
         if environment.lower() != "demo":
             raise ValueError("SAFETY: Only demo environment allowed")
         
-        # WebSocket URL for demo environment
-        self.ws_url = f"wss://ws.derivws.com/websockets/v3?app_id={app_id}"
+        # WebSocket URL for demo environment (override points at e.g. local_server.py)
+        self.ws_url = ws_url or f"wss://ws.derivws.com/websockets/v3?app_id={app_id}"
+        
+        # Frame encoding - orjson/ujson when available
+        self.codec = get_codec(json_codec)
+        self.fast_tick_decode = fast_tick_decode  # Tick pushes skip full JSON decoding
         
         # Request tracking
         self.request_id = 1
         self.pending_requests = {}
-        self.tick_callbacks = []
+        self.tick_routes: Dict[str, TickRoute] = {}  # symbol -> consumers of its ticks
+        self.pip_sizes: Dict[str, int] = {}  # symbol -> quoted decimal places
+        
+        # Ticks are handed to callbacks through a bounded queue so slow
+        # strategy work never holds up the socket reader
+        if tick_overflow not in TICK_OVERFLOW_POLICIES:
+            raise ValueError(f"tick_overflow must be one of {TICK_OVERFLOW_POLICIES}")
+        self.tick_overflow = tick_overflow
+        self.tick_consumers = tick_consumers
+        self._tick_queue = TickQueue(maxsize=tick_queue_size)
+        self._latest_ticks: Dict[str, Any] = {}  # symbol -> newest tick (coalesce policy)
+        self._tick_consumer_tasks: List[asyncio.Task] = []
+        self.tick_stats = {"enqueued": 0, "dropped": 0, "coalesced": 0, "duplicates": 0, "unrouted": 0}
+        self._last_tick_epoch: Dict[str, int] = {}  # symbol -> newest epoch delivered
+        self._history_prefix: Dict[str, List] = {}  # symbol -> older pages awaiting the live stream
+        
+        # Request multiplexing - bounded window of concurrent in-flight requests
+        self.max_in_flight = max_in_flight
+        self.request_timeouts = {**DEFAULT_REQUEST_TIMEOUTS, **(request_timeouts or {})}
+        self._request_window = asyncio.Semaphore(max_in_flight)
+        
+        # Client-side call limits, buys first (None = unlimited)
+        self.rate_limiter = PriorityRateLimiter(rate_limits) if rate_limits is not None else None
+        
+        # Subscription registry - every stream we hold, re-opened once after a reconnect
+        self.subscriptions: Dict[Tuple, Subscription] = {}
+        self._streams_by_req_id: Dict[int, Subscription] = {}  # streams open on this connection
+        self._streams_by_subscription_id: Dict[str, Subscription] = {}
+        
+        # Message dispatch - msg_type -> handler(data, subscription), sync or async
+        self._handlers: Dict[str, Callable] = {
+            "tick": self._handle_tick,
+            "history": self._handle_history,
+            "proposal": self._handle_proposal,
+            "balance": self._handle_balance,
+            "proposal_open_contract": self._handle_open_contract,
+        }
+        self.message_stats = {"orphaned": 0}  # stream messages for streams no longer held
+        self.unhandled_messages = Counter()  # msg_type -> count, for types with no handler
+        
+        # Live proposal streams - (symbol, contract_type, stake bucket) -> latest quote
+        self.proposal_cache: Dict[Tuple[str, str, float], Dict] = {}
+        
+        # Why a proposal stream is held - a stream both quoted and armed is shared,
+        # and stays open until neither holds it
+        self.quoted_proposals: Set[Tuple[str, str, float]] = set()  # subscribe_proposal() callers
+        self.armed_orders: Set[Tuple[str, str, float]] = set()  # Pre-armed orders - a signal buys by id
+        self._rearm_tasks: Dict[Tuple[str, str, float], asyncio.Task] = {}
+        
+        # Open contract streams - contract_id -> future resolved once sold
+        self.settlement_timeout = settlement_timeout
+        self._settlements: Dict[Any, asyncio.Future] = {}
+        
+        # Latency histograms and timeout counters - see get_metrics()
+        self.metrics = ClientMetrics()
+        self._frame_received_ns = 0  # arrival time of the frame being processed
+        
+        # Watchdog - reconnects on quiet tick streams, slow transport pings, a dead or
+        # unauthorized socket, or registered streams left closed
+        self.watchdog_interval = watchdog_interval
+        self.stale_tick_intervals = stale_tick_intervals
+        self.max_ping_rtt = max_ping_rtt
+        self.max_recovery_attempts = max_recovery_attempts
+        self._watchdog_task: Optional[asyncio.Task] = None
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._reconnecting = False
+        self.watchdog_stats = {"recoveries": 0, "failed_recoveries": 0, "last_reason": None}
+        self.on_reconnect: Optional[Callable] = None  # Awaited with this client once reconnect() succeeds
+        # Awaited with (client, reason) once max_recovery_attempts watchdog recoveries in a row failed
+        self.on_recovery_failed: Optional[Callable] = None
+        
+        # Raw inbound frame capture for offline replay (recorder.FrameReplayer)
+        self.recorder = FrameRecorder(record_path) if record_path else None
         
     async def connect(self) -> bool:
         """Establish WebSocket connection with exponential backoff"""
         max_attempts = 5
         base_delay = 1.0
         
+        # Never leave a reader running on a previous socket
+        await self._stop_reader()
+        
         for attempt in range(max_attempts):
             try:
                 self.logger.info(f"Connecting to Deriv WebSocket (attempt {attempt + 1}/{max_attempts})")
@@ -56,7 +230,9 @@ class DerivClient:
                 self.logger.info("WebSocket connection established")
                 
                 # Start message handler
-                asyncio.create_task(self._message_handler())
+                self._reader_task = asyncio.create_task(self._message_handler(self.websocket))
+                if self._watchdog_task is None or self._watchdog_task.done():
+                    self._watchdog_task = asyncio.create_task(self._watchdog())
                 return True
                 
             except Exception as e:
@@ -82,6 +258,7 @@ class DerivClient:
         
         if "error" in response:
             self.logger.error(f"Authentication failed: {response['error']}")
+            self.is_authenticated = False
             return False
         
         self.account_info = response.get("authorize", {})
@@ -100,15 +277,56 @@ class DerivClient:
             raise RuntimeError("CONFIG: Real account required but demo account detected")
         
         self.is_authenticated = True
+        self._authorized_websocket = self.websocket
         account_desc = "Demo" if is_virtual else "Real"
         self.logger.info(f"Authenticated successfully - {account_desc} Account: {self.account_info.get('loginid')}")
         
         return True
             
-    async def get_balance(self) -> float:
-        """Fetch current account balance"""
+    async def subscribe_balance(self) -> float:
+        """Subscribe to balance updates so self.balance tracks the account without polling"""
+        if not self.is_authenticated:
+            raise RuntimeError("Must authenticate before subscribing to balance")
+        
+        if self._stream_open(("balance",)):
+            return self.balance
+        
+        balance_request = {
+            "balance": 1,
+            "subscribe": 1
+        }
+        
+        response = await self._open_stream(("balance",), balance_request)
+        
+        if "error" in response:
+            self.logger.error(f"Balance subscription failed: {response['error']}")
+            return self.balance
+        
+        self.logger.info(f"Subscribed to balance updates - Current balance: ${self.balance:.2f}")
+        return self.balance
+    
+    def _handle_balance(self, data: Dict, subscription: Optional[Subscription] = None):
+        """Update the cached balance from a pushed balance update"""
+        if "error" in data:
+            self.logger.warning(f"Balance stream error: {data['error']}")
+            self._close_stream(("balance",))
+            return
+        
+        balance_data = data.get("balance", {})
+        self.balance = float(balance_data.get("balance", self.balance))
+    
+    async def get_balance(self, force_refresh: bool = False) -> float:
+        """
+        Current account balance
+        
+        Served from the balance subscription when one is open; force_refresh
+        always asks the API.
+        """
         if not self.is_authenticated:
             raise RuntimeError("Must authenticate before getting balance")
+        
+        if self._stream_open(("balance",)) and not force_refresh:
+            return self.balance
             
         balance_request = {
             "balance": 1,
@@ -139,6 +357,16 @@ class DerivClient:
     
     async def get_payout_info(self, symbol: str = "R_50") -> Dict:
         """Get payout information for Odd/Even contracts"""
+        # Served from the live proposal stream when one is open
+        cached = self.get_cached_proposal(symbol, "DIGITEVEN", 1)
+        if cached:
+            return {
+                "payout_ratio": cached["payout_ratio"],
+                "ask_price": cached["ask_price"],
+                "payout": cached["payout"],
+                "symbol": symbol
+            }
+        
         proposal_request = {
             "proposal": 1,
             "amount": 1,  # Minimum stake for payout calculation
@@ -176,32 +404,518 @@ class DerivClient:
             self.logger.error(f"Payout info error: {e}")
             return {}
     
-    async def subscribe_ticks(self, symbol: str = "R_50", callback: Optional[Callable] = None):
-        """Subscribe to tick stream for specified symbol"""
-        if callback:
-            self.tick_callbacks.append(callback)
-            
-        tick_request = {
-            "ticks": symbol,
+    @staticmethod
+    def _stake_bucket(stake: float) -> float:
+        """Proposal cache bucket for a stake - Deriv prices stakes to the cent"""
+        return round(float(stake), 2)
+    
+    def get_cached_proposal(self, symbol: str, contract_type: str, stake: float) -> Optional[Dict]:
+        """Latest streamed proposal for the given contract, or None if not subscribed"""
+        return self.proposal_cache.get((symbol, contract_type, self._stake_bucket(stake)))
+    
+    async def subscribe_proposal(self, symbol: str = "R_50", contract_type: str = "DIGITEVEN",
+                                 stake: float = 1) -> Dict:
+        """
+        Open a streaming proposal and keep its payout and ask price cached
+        
+        The stream is held until unsubscribe_proposal(), even if an order
+        armed on the same contract is disarmed.
+        
+        Returns:
+            The cached proposal entry, or an empty dict if the subscription failed
+        """
+        key = (symbol, contract_type, self._stake_bucket(stake))
+        self.quoted_proposals.add(key)
+        return await self._open_proposal(key)
+    
+    async def unsubscribe_proposal(self, symbol: str = "R_50", contract_type: str = "DIGITEVEN",
+                                   stake: float = 1) -> bool:
+        """Stop quoting a contract - its stream stays open while an order is armed on it"""
+        key = (symbol, contract_type, self._stake_bucket(stake))
+        if key not in self.quoted_proposals:
+            return False
+        
+        self.quoted_proposals.discard(key)
+        if key not in self.armed_orders:
+            await self.unsubscribe(("proposal",) + key)
+        return True
+    
+    async def _open_proposal(self, key: Tuple[str, str, float]) -> Dict:
+        """Open the proposal stream for (symbol, contract_type, stake bucket) unless it is open"""
+        symbol, contract_type, amount = key
+        if self._stream_open(("proposal",) + key):
+            return self.proposal_cache.get(key, {})
+        
+        proposal_request = {
+            "proposal": 1,
             "subscribe": 1,
-            "req_id": self._get_request_id()
+            "amount": amount,
+            "basis": "stake",
+            "contract_type": contract_type,
+            "currency": "USD",
+            "symbol": symbol,
+            "duration": 1,
+            "duration_unit": "t"
         }
         
+        response = await self._open_stream(("proposal",) + key, proposal_request)
+        
+        if "error" in response:
+            self.logger.error(f"Proposal subscription failed: {response['error']}")
+            return {}
+        
+        self.logger.info(f"Subscribed to proposals for {contract_type} {symbol} ${amount:.2f}")
+        return self.proposal_cache.get(key, {})
+    
+    def _update_proposal_cache(self, key: Tuple[str, str, float], proposal: Dict) -> Dict:
+        """Store the latest proposal quote for a stream"""
+        payout = float(proposal.get("payout", 0))
+        ask_price = float(proposal.get("ask_price", 1))
+        
+        entry = {
+            "proposal_id": proposal.get("id"),
+            "payout": payout,
+            "ask_price": ask_price,
+            "payout_ratio": payout / ask_price if ask_price > 0 else 0,
+            "symbol": key[0],
+            "contract_type": key[1],
+            "stake": key[2],
+            "updated_at": time.time()
+        }
+        self.proposal_cache[key] = entry
+        return entry
+    
+    def _handle_proposal(self, data: Dict, subscription: Optional[Subscription] = None):
+        """Refresh the proposal cache from a pushed proposal update"""
+        if subscription is None:
+            return
+        key = subscription.key[1:]
+        
+        if "error" in data:
+            # Stream is dead - drop it so the next subscribe reopens it
+            self.logger.warning(f"Proposal stream error for {key}: {data['error']}")
+            self._close_stream(subscription.key)
+            self.proposal_cache.pop(key, None)
+            self._schedule_rearm(key)
+            return
+        
+        self._update_proposal_cache(key, data.get("proposal", {}))
+    
+    async def arm_order(self, side: str, stake: float, symbol: str = "R_50") -> Dict:
+        """
+        Keep a fresh proposal id ready for a trade that is likely to come
+        
+        place_odd_even_trade() for the same symbol, side and stake then buys
+        straight from the id - one round trip between signal and execution.
+        The order is re-armed when its id is rejected or its stream dies.
+        
+        Returns:
+            The armed proposal entry, or an empty dict if arming failed
+        """
+        if side not in SIDE_CONTRACT_TYPES:
+            raise ValueError("Side must be 'ODD' or 'EVEN'")
+        
+        key = (symbol, SIDE_CONTRACT_TYPES[side], self._stake_bucket(stake))
+        self.armed_orders.add(key)
+        return await self._open_proposal(key)
+    
+    async def disarm_order(self, side: str, stake: float, symbol: str = "R_50") -> bool:
+        """Stop keeping a proposal id ready - the stream closes unless subscribe_proposal() holds it"""
+        key = (symbol, SIDE_CONTRACT_TYPES[side], self._stake_bucket(stake))
+        if key not in self.armed_orders:
+            return False
+        
+        self.armed_orders.discard(key)
+        task = self._rearm_tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+        if key not in self.quoted_proposals:
+            await self.unsubscribe(("proposal",) + key)
+        return True
+    
+    def _schedule_rearm(self, key: Tuple[str, str, float], reopen: bool = False):
+        """Re-arm an armed order in the background (at most one attempt in flight per order)"""
+        if key not in self.armed_orders or key in self._rearm_tasks:
+            return
+        
+        task = asyncio.create_task(self._rearm(key, reopen))
+        self._rearm_tasks[key] = task
+        task.add_done_callback(lambda _: self._rearm_tasks.pop(key, None))
+    
+    async def _rearm(self, key: Tuple[str, str, float], reopen: bool):
+        """Open the order's proposal stream again - reopen forces a fresh id right away"""
         try:
-            await self._send_message(tick_request)
+            if reopen:
+                await self.unsubscribe(("proposal",) + key)
+            # While disconnected, reconnect() re-opens the stream from the registry
+            if key in self.armed_orders and self.is_connected:
+                await self._open_proposal(key)
+        except Exception as e:
+            self.logger.warning(f"Re-arming {key} failed: {e}")
+    
+    def _stream_open(self, key: Tuple) -> bool:
+        """Whether the stream is registered and open on the current connection"""
+        subscription = self.subscriptions.get(key)
+        return subscription is not None and subscription.req_id in self._streams_by_req_id
+    
+    async def _open_stream(self, key: Tuple, request: Dict) -> Dict:
+        """
+        Send a subscribe request and register the stream it opens
+        
+        Stream messages, the first response included, echo the subscribing
+        req_id - handlers find their stream through it. Only a refusal from
+        the server drops the stream from the registry; after a timeout or a
+        dead socket it stays registered, closed, for the next attempt.
+        """
+        subscription = self.subscriptions.get(key)
+        if subscription is None:
+            subscription = Subscription(key, request)
+            self.subscriptions[key] = subscription
+        
+        subscription.req_id = self._get_request_id()
+        subscription.last_message_ns = time.monotonic_ns()  # Grace period starts at open
+        self._streams_by_req_id[subscription.req_id] = subscription
+        
+        response = await self._send_request({**subscription.request, "req_id": subscription.req_id})
+        
+        if "error" in response:
+            if response["error"].get("code") in TRANSPORT_ERRORS:
+                self._streams_by_req_id.pop(subscription.req_id, None)
+            else:
+                self._close_stream(key)
+        elif "subscription" not in response:
+            # Nothing left to stream (e.g. contract already sold) - hand over the one message
+            self._close_stream(key)
+            await self._process_message(response)
+        else:
+            subscription.subscription_id = response["subscription"].get("id")
+        
+        return response
+    
+    def _close_stream(self, key: Tuple):
+        """Drop a stream from the registry"""
+        subscription = self.subscriptions.pop(key, None)
+        if subscription is not None:
+            self._streams_by_req_id.pop(subscription.req_id, None)
+            self._streams_by_subscription_id.pop(subscription.subscription_id, None)
+    
+    def _stream_key(self, request: Dict) -> Optional[Tuple]:
+        """Registry key of the stream a subscribe request opens"""
+        if "ticks" in request:
+            return ("ticks", request["ticks"])
+        if "ticks_history" in request:
+            return ("ticks", request["ticks_history"])
+        if "proposal" in request:
+            return ("proposal", request.get("symbol"), request.get("contract_type"),
+                    self._stake_bucket(request.get("amount", 0)))
+        if "balance" in request:
+            return ("balance",)
+        if "proposal_open_contract" in request:
+            return ("contract", request.get("contract_id"))
+        return None
+    
+    def _adopt_stream(self, data: Dict):
+        """Register a stream from its recorded subscribe response (replay has no requests)"""
+        req_id = data.get("req_id")
+        if "subscription" not in data or req_id in self._streams_by_req_id:
+            return
+        
+        request = data.get("echo_req", {})
+        key = self._stream_key(request)
+        if key is None:
+            return
+        
+        subscription = Subscription(key, request, req_id, data["subscription"].get("id"))
+        self.subscriptions[key] = subscription
+        self._streams_by_req_id[req_id] = subscription
+        self._streams_by_subscription_id[subscription.subscription_id] = subscription
+    
+    async def unsubscribe(self, key: Tuple) -> bool:
+        """
+        Close a registered stream, e.g. ("balance",) or ("proposal", "R_50", "DIGITEVEN", 1.0)
+        
+        The stream is forgotten server-side when the connection is up; either
+        way it is not re-opened after a reconnect.
+        
+        Returns:
+            True if the stream was registered
+        """
+        subscription = self.subscriptions.get(key)
+        if subscription is None:
+            return False
+        
+        self._close_stream(key)
+        if key[0] == "proposal":
+            self.proposal_cache.pop(key[1:], None)
+        
+        if subscription.subscription_id and self.is_connected:
+            response = await self._send_request({"forget": subscription.subscription_id})
+            if "error" in response:
+                self.logger.error(f"Forget failed for {key}: {response['error']}")
+        return True
+    
+    async def forget(self, subscription_id: str) -> bool:
+        """Stop one stream by its subscription id"""
+        subscription = self._streams_by_subscription_id.get(subscription_id)
+        if subscription is not None:
+            return await self.unsubscribe(subscription.key)
+        
+        response = await self._send_request({"forget": subscription_id})
+        return bool(response.get("forget"))
+    
+    async def forget_all(self, *stream_types: str) -> List[str]:
+        """
+        Stop every stream of the given Deriv types, e.g. forget_all("proposal", "ticks")
+        
+        Returns:
+            Subscription ids the server released
+        """
+        for key in list(self.subscriptions):
+            if STREAM_TYPES[key[0]] in stream_types:
+                self._close_stream(key)
+                if key[0] == "proposal":
+                    self.proposal_cache.pop(key[1:], None)
+                    self.quoted_proposals.discard(key[1:])
+        
+        if not self.is_connected:
+            return []
+        
+        response = await self._send_request({"forget_all": list(stream_types)})
+        if "error" in response:
+            self.logger.error(f"forget_all failed: {response['error']}")
+            return []
+        return response.get("forget_all", [])
+    
+    def register_handler(self, msg_type: str, handler: Callable):
+        """Route a message type to handler(data, subscription) - sync or async"""
+        self._handlers[msg_type] = handler
+        if msg_type == "tick":
+            self.fast_tick_decode = False  # The handler needs the full message
+    
+    async def _resubscribe_all(self) -> bool:
+        """
+        Re-open every registered stream on the current connection, concurrently
+        
+        Streams whose request timed out are tried again, up to
+        RESUBSCRIBE_ATTEMPTS rounds. If the socket drops meanwhile the rest
+        stay registered for the next reconnect.
+        
+        Returns:
+            True if every registered stream is open
+        """
+        for _ in range(RESUBSCRIBE_ATTEMPTS):
+            closed = [sub for sub in self.subscriptions.values() if not self._stream_open(sub.key)]
+            if not closed or not self.is_connected:
+                break
+            
+            self.logger.info(f"Re-establishing {len(closed)} subscriptions")
+            await asyncio.gather(*(self._open_stream(sub.key, sub.request) for sub in closed))
+        
+        return self.is_connected and all(self._stream_open(key) for key in self.subscriptions)
+    
+    def _on_connection_lost(self, reason: str):
+        """Fail everything waiting on the dead socket straight away"""
+        self.is_connected = False
+        
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError(reason))
+        self.pending_requests.clear()
+        
+        # Registry entries survive for reconnect(); their streams and quotes do not
+        self._streams_by_req_id.clear()
+        self._streams_by_subscription_id.clear()
+        self.proposal_cache.clear()
+    
+    async def fetch_pip_sizes(self) -> Dict[str, int]:
+        """Load quoted decimal places for every active symbol"""
+        symbols_request = {
+            "active_symbols": "brief",
+            "req_id": self._get_request_id()
+        }
+        
+        response = await self._send_request(symbols_request)
+        
+        if "error" in response:
+            self.logger.error(f"Active symbols fetch failed: {response['error']}")
+            return self.pip_sizes
+        
+        for symbol_info in response.get("active_symbols", []):
+            if symbol_info.get("pip"):
+                self.pip_sizes[symbol_info["symbol"]] = pip_size_from_pip(symbol_info["pip"])
+        
+        return self.pip_sizes
+    
+    async def subscribe_ticks(self, symbol: str = "R_50", callback: Optional[Callable] = None,
+                              backfill: int = 0, history_callback: Optional[Callable] = None):
+        """
+        Subscribe to tick stream for specified symbol
+        
+        Each symbol has its own consumers - a tick only reaches the callbacks
+        registered for its symbol. One stream is opened per symbol however
+        many consumers subscribe.
+        
+        Args:
+            symbol: Trading symbol
+            callback: Awaited with every live tick of this symbol
+            backfill: Historical ticks to deliver before the live stream starts
+            history_callback: Awaited with each backfilled batch (list of ticks);
+                without one, backfilled ticks go to the tick callbacks one by one
+        """
+        self.route_ticks(symbol, callback, history_callback)
+        
+        if self._stream_open(("ticks", symbol)):
+            return
+        
+        if backfill > 0:
+            # ticks_history with subscribe returns the latest page and then streams
+            # from the next tick, so there is no gap between history and live ticks.
+            # Larger backfills fetch all of it first; the page drops the overlap.
+            if backfill > HISTORY_PAGE_SIZE:
+                self._history_prefix[symbol] = await self._fetch_history(symbol, backfill)
+            tick_request = {
+                "ticks_history": symbol,
+                "count": min(backfill, HISTORY_PAGE_SIZE),
+                "end": "latest",
+                "style": "ticks",
+                "subscribe": 1
+            }
+        else:
+            tick_request = {
+                "ticks": symbol,
+                "subscribe": 1
+            }
+        
+        response = await self._open_stream(("ticks", symbol), tick_request)
+        self._history_prefix.pop(symbol, None)
+        
+        if "error" in response:
+            self.logger.error(f"Tick subscription error: {response['error']}")
+        else:
             self.logger.info(f"Subscribed to ticks for {symbol}")
+    
+    def route_ticks(self, symbol: str, callback: Optional[Callable] = None,
+                    history_callback: Optional[Callable] = None) -> TickRoute:
+        """Register tick consumers for a symbol without opening a stream (e.g. for replay)"""
+        route = self.tick_routes.get(symbol)
+        if route is None:
+            route = self.tick_routes[symbol] = TickRoute(symbol)
+        if callback and callback not in route.callbacks:
+            route.callbacks.append(callback)
+        if history_callback and history_callback not in route.history_callbacks:
+            route.history_callbacks.append(history_callback)
+        return route
+    
+    async def unsubscribe_ticks(self, symbol: str, callback: Optional[Callable] = None) -> bool:
+        """
+        Remove a tick consumer, or every consumer of the symbol when callback is None
+        
+        The symbol's stream is forgotten once its last consumer is gone.
+        
+        Returns:
+            True if the symbol had consumers
+        """
+        route = self.tick_routes.get(symbol)
+        if route is None:
+            return False
+        
+        if callback is None:
+            route.callbacks.clear()
+            route.history_callbacks.clear()
+        else:
+            for callbacks in (route.callbacks, route.history_callbacks):
+                if callback in callbacks:
+                    callbacks.remove(callback)
+        
+        if route.callbacks or route.history_callbacks:
+            return True
+        
+        # Last consumer gone - stop routing and close the stream
+        del self.tick_routes[symbol]
+        self._last_tick_epoch.pop(symbol, None)
+        if await self.unsubscribe(("ticks", symbol)):
+            self.logger.info(f"Unsubscribed from ticks for {symbol}")
+        return True
+    
+    @property
+    def tick_symbols(self) -> List[str]:
+        """Symbols with at least one tick consumer"""
+        return list(self.tick_routes)
+    
+    async def _fetch_history(self, symbol: str, count: int) -> List:
+        """
+        Fetch older ticks page by page, oldest first
+        
+        Pages run back from now, so the newest HISTORY_PAGE_SIZE of them
+        overlap the live subscription's own page; the overlap is dropped when
+        they are merged and the older pages make up the rest of the backfill.
+        """
+        ticks = []
+        end = "latest"
+        while len(ticks) < count:
+            response = await self._send_request({
+                "ticks_history": symbol,
+                "count": min(count - len(ticks), HISTORY_PAGE_SIZE),
+                "end": end,
+                "style": "ticks"
+            })
+            if "error" in response:
+                self.logger.error(f"Tick history error for {symbol}: {response['error']}")
+                break
             
-        except Exception as e:
-            self.logger.error(f"Tick subscription error: {e}")
+            page = self._decode_history(symbol, response)
+            if not page:
+                break
+            ticks[:0] = page
+            end = page[0].epoch - 1
+        
+        return ticks
+    
+    def _decode_history(self, symbol: str, data: Dict) -> List:
+        """Decode a ticks_history response into tick records, oldest first"""
+        history = data.get("history", {})
+        pip_size = data.get("pip_size", self.pip_sizes.get(symbol))
+        if pip_size is not None:
+            self.pip_sizes[symbol] = pip_size = int(pip_size)
+        
+        received_ns = self._frame_received_ns
+        return [
+            decode_tick({"symbol": symbol, "epoch": epoch, "quote": quote}, pip_size, received_ns)
+            for epoch, quote in zip(history.get("times", []), history.get("prices", []))
+        ]
     
-    async def place_odd_even_trade(self, side: str, stake: float, symbol: str = "R_50") -> Dict:
+    async def _handle_history(self, data: Dict, subscription: Optional[Subscription] = None):
+        """Queue the backfill page that opens a ticks_history stream"""
+        if subscription is None:
+            return
+        
+        symbol = subscription.key[1]
+        ticks = self._decode_history(symbol, data)
+        prefix = self._history_prefix.get(symbol)
+        if prefix and ticks:
+            ticks = [tick for tick in prefix if tick.epoch < ticks[0].epoch] + ticks
+        
+        if ticks:
+            if not self._tick_consumer_tasks:
+                self._start_tick_consumers()
+            # A batch is never dropped - it has to reach the callbacks before the live ticks
+            await self._tick_queue.put(ticks)
+    
+    async def place_odd_even_trade(self, side: str, stake: float, symbol: str = "R_50",
+                                   max_price: Optional[float] = None,
+                                   signal_ns: Optional[int] = None) -> Dict:
         """
         Place an Odd/Even trade
         
+        Buys by proposal id when an armed (or otherwise streamed) proposal
+        is cached for this stake, otherwise with full contract parameters.
+        
         Args:
             side: "ODD" or "EVEN"
             stake: Stake amount in USD
             symbol: Trading symbol (default R_50)
+            max_price: Most the buy may cost - Deriv rejects it if the price moved above (default: stake)
+            signal_ns: time.monotonic_ns() when the signal fired, for the signal-to-ack latency
             
         Returns:
             Trade result dictionary
@@ -213,36 +927,57 @@ class DerivClient:
         if self.environment.lower() != "demo":
             raise RuntimeError("SAFETY: Only demo trading allowed")
             
-        if side not in ["ODD", "EVEN"]:
+        if side not in SIDE_CONTRACT_TYPES:
             raise ValueError("Side must be 'ODD' or 'EVEN'")
             
         if stake <= 0:
             raise ValueError("Stake must be positive")
             
         # Map side to contract type
-        contract_type = "DIGITODD" if side == "ODD" else "DIGITEVEN"
-        
-        buy_request = {
-            "buy": 1,
-            "price": stake,
-            "parameters": {
-                "amount": stake,
-                "basis": "stake",
-                "contract_type": contract_type,
-                "currency": "USD",
-                "symbol": symbol,
-                "duration": 1,
-                "duration_unit": "t"
-            },
-            "req_id": self._get_request_id()
-        }
+        contract_type = SIDE_CONTRACT_TYPES[side]
+        price = stake if max_price is None else max_price
+        
+        # Buy straight from a streamed proposal when one is cached for this stake
+        cached = self.get_cached_proposal(symbol, contract_type, stake)
+        armed = bool(cached and cached.get("proposal_id"))
+        if armed:
+            buy_request = {
+                "buy": cached["proposal_id"],
+                "price": price,
+                "req_id": self._get_request_id()
+            }
+            # An id can be bought once - the stream pushes the next one
+            cached["proposal_id"] = None
+        else:
+            buy_request = {
+                "buy": 1,
+                "price": price,
+                "parameters": {
+                    "amount": stake,
+                    "basis": "stake",
+                    "contract_type": contract_type,
+                    "currency": "USD",
+                    "symbol": symbol,
+                    "duration": 1,
+                    "duration_unit": "t"
+                },
+                "req_id": self._get_request_id()
+            }
         
         try:
             response = await self._send_request(buy_request)
+            if signal_ns is not None:
+                self.metrics.observe_order(armed, time.monotonic_ns() - signal_ns)
             
+            key = (symbol, contract_type, self._stake_bucket(stake))
             if "error" in response:
                 self.logger.error(f"Trade execution failed: {response['error']}")
+                if armed and response["error"].get("code") in STALE_PROPOSAL_ERRORS:
+                    self._schedule_rearm(key, reopen=True)
                 return {"success": False, "error": response["error"]}
+            
+            if armed:
+                self._schedule_rearm(key)  # No-op while the stream is still open
                 
             buy_data = response.get("buy", {})
             contract_id = buy_data.get("contract_id")
@@ -255,6 +990,7 @@ class DerivClient:
                 "side": side,
                 "stake": stake,
                 "symbol": symbol,
+                "armed": armed,
                 "timestamp": time.time()
             }
             
@@ -279,24 +1015,113 @@ class DerivClient:
                 
             contract = response.get("proposal_open_contract", {})
             
-            return {
-                "contract_id": contract_id,
-                "is_sold": contract.get("is_sold", False),
-                "profit": float(contract.get("profit", 0)),
-                "payout": float(contract.get("payout", 0)),
-                "entry_tick": contract.get("entry_tick"),
-                "exit_tick": contract.get("exit_tick"),
-                "status": contract.get("status", "open")
-            }
+            return self._parse_contract(contract_id, contract)
             
         except Exception as e:
             self.logger.error(f"Contract result error: {e}")
             return {}
     
+    @staticmethod
+    def _parse_contract(contract_id: str, contract: Dict) -> Dict:
+        """Contract result dictionary from a proposal_open_contract payload"""
+        return {
+            "contract_id": contract_id,
+            "is_sold": bool(contract.get("is_sold", False)),
+            "profit": float(contract.get("profit", 0)),
+            "payout": float(contract.get("payout", 0)),
+            "entry_tick": contract.get("entry_tick"),
+            "exit_tick": contract.get("exit_tick"),
+            "status": contract.get("status", "open")
+        }
+    
+    async def track_contract(self, contract_id: str) -> asyncio.Future:
+        """
+        Stream an open contract and return a future that resolves when it is sold
+        
+        The future's result is the same dictionary get_contract_result returns.
+        If the stream cannot be opened the future fails with SubscriptionError.
+        """
+        future = self._settlements.get(contract_id)
+        if future is not None:
+            return future
+        
+        future = asyncio.get_running_loop().create_future()
+        self._settlements[contract_id] = future
+        
+        contract_request = {
+            "proposal_open_contract": 1,
+            "contract_id": contract_id,
+            "subscribe": 1
+        }
+        
+        response = await self._open_stream(("contract", contract_id), contract_request)
+        
+        if "error" in response:
+            self.logger.error(f"Contract subscription failed for {contract_id}: {response['error']}")
+            self._settlements.pop(contract_id, None)
+            self._close_stream(("contract", contract_id))  # Polled instead, never re-opened
+            if not future.done():
+                future.set_exception(SubscriptionError(response["error"].get("message", "Subscription failed")))
+        
+        return future
+    
+    def _handle_open_contract(self, data: Dict, subscription: Optional[Subscription] = None):
+        """Resolve a settlement future once its contract update reports is_sold"""
+        contract = data.get("proposal_open_contract", {})
+        contract_id = contract.get("contract_id")
+        future = self._settlements.get(contract_id)
+        if future is None:
+            return
+        
+        # Deriv closes the stream itself once the contract is sold
+        if contract.get("is_sold"):
+            self._settlements.pop(contract_id, None)
+            self._close_stream(("contract", contract_id))
+            if not future.done():
+                future.set_result(self._parse_contract(contract_id, contract))
+    
+    async def wait_for_settlement(self, contract_id: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Wait for a contract to settle, as soon as the sale is pushed
+        
+        Falls back to a single get_contract_result poll if nothing arrives in
+        time, or straight away if the contract stream could not be opened.
+        """
+        if timeout is None:
+            timeout = self.settlement_timeout
+        
+        future = await self.track_contract(contract_id)
+        
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+            
+        except asyncio.TimeoutError:
+            self.logger.warning(f"No settlement pushed for {contract_id} within {timeout}s - polling")
+            self._settlements.pop(contract_id, None)
+            self._close_stream(("contract", contract_id))
+            
+        except SubscriptionError as e:
+            self.logger.warning(f"No contract stream for {contract_id} ({e}) - polling")
+        
+        return await self.get_contract_result(contract_id)
+    
     async def disconnect(self):
         """Safely disconnect from WebSocket"""
         self.is_connected = False
         self.is_authenticated = False
+        self._authorized_websocket = None
+        self._on_connection_lost("Client disconnected")
+        self.subscriptions.clear()
+        self.quoted_proposals.clear()
+        self.armed_orders.clear()
+        for task in list(self._rearm_tasks.values()):
+            task.cancel()
+        self._stop_tick_consumers()
+        self._stop_watchdog()
+        await self._stop_reader()
+        
+        if self.recorder is not None:
+            self.recorder.close()
         
         if self.websocket:
             try:
@@ -305,6 +1130,124 @@ class DerivClient:
             except Exception as e:
                 self.logger.error(f"Disconnect error: {e}")
     
+    async def reconnect(self) -> bool:
+        """Reconnect, re-authorize and re-open every registered subscription exactly once"""
+        # Join a reconnect the watchdog already started rather than racing it
+        recovery = self._recovery_task
+        if recovery is not None and not recovery.done() and recovery is not asyncio.current_task():
+            return await asyncio.shield(recovery)
+        
+        self._reconnecting = True
+        try:
+            if not await self.connect():
+                return False
+            
+            if not await self.authenticate():
+                return False
+            
+            if not await self._resubscribe_all():
+                self.logger.warning("Some subscriptions could not be re-opened - they stay registered")
+                return False
+        finally:
+            self._reconnecting = False
+        
+        if self.on_reconnect is not None:
+            try:
+                await self.on_reconnect(self)
+            except Exception as e:
+                self.logger.error(f"Reconnect hook error: {e}")
+        return True
+    
+    async def _watchdog(self):
+        """Start a reconnect as soon as the connection looks dead - no API calls"""
+        while True:
+            await asyncio.sleep(self.watchdog_interval)
+            if self._reconnecting or (self._recovery_task is not None and not self._recovery_task.done()):
+                continue
+            
+            reason = self._unhealthy_reason()
+            if reason:
+                self.logger.warning(f"Watchdog: {reason} - reconnecting")
+                self.watchdog_stats["recoveries"] += 1
+                self.watchdog_stats["last_reason"] = reason
+                self._recovery_task = asyncio.create_task(self._recover(reason))
+    
+    async def _recover(self, reason: str) -> bool:
+        """Watchdog reconnect - counts failures in a row and escalates at max_recovery_attempts"""
+        try:
+            recovered = await self.reconnect()
+        except Exception as e:
+            self.logger.error(f"Reconnect failed: {e}")
+            recovered = False
+        
+        if recovered:
+            self.watchdog_stats["failed_recoveries"] = 0
+            return True
+        
+        self.watchdog_stats["failed_recoveries"] += 1
+        failures = self.watchdog_stats["failed_recoveries"]
+        if failures == self.max_recovery_attempts:
+            self.logger.error(f"Connection not restored after {failures} attempts ({reason})")
+            if self.on_recovery_failed is not None:
+                try:
+                    await self.on_recovery_failed(self, reason)
+                except Exception as e:
+                    self.logger.error(f"Recovery failure hook error: {e}")
+        return False
+    
+    def _unhealthy_reason(self) -> Optional[str]:
+        """Why the connection needs replacing, or None while it is healthy"""
+        if not self.is_connected or self.websocket is None:
+            return "Connection lost"
+        
+        # Authorization belongs to a socket - a new one that was never authorized is no use
+        if self._authorized_websocket is not None and self._authorized_websocket is not self.websocket:
+            return "Connected but not authorized"
+        
+        closed = [key for key in self.subscriptions if not self._stream_open(key)]
+        if closed:
+            return f"{len(closed)} registered streams not open"
+        
+        # Round trip of the last websockets keepalive ping (transport level, not an API call)
+        ping_rtt = getattr(self.websocket, "latency", 0.0)
+        if ping_rtt > self.max_ping_rtt:
+            return f"Transport ping RTT {ping_rtt:.2f}s"
+        
+        now = time.monotonic_ns()
+        for subscription in self._streams_by_req_id.values():
+            if subscription.key[0] != "ticks":
+                continue
+            quiet = (now - subscription.last_message_ns) / 1e9
+            if quiet > expected_tick_interval(subscription.key[1]) * self.stale_tick_intervals:
+                return f"No ticks for {subscription.key[1]} in {quiet:.1f}s"
+        
+        return None
+    
+    def _stop_watchdog(self):
+        """Cancel the watchdog and any reconnect it started"""
+        for task in (self._watchdog_task, self._recovery_task):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._watchdog_task = None
+        self._recovery_task = None
+    
+    async def _stop_reader(self):
+        """Cancel the message handler task and close the socket it was reading"""
+        if self._reader_task and not self._reader_task.done():
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        self._reader_task = None
+        
+        if self.websocket and self.is_connected:
+            self._on_connection_lost("WebSocket replaced by a new connection")
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+    
     def _get_request_id(self) -> int:
         """Generate unique request ID"""
         req_id = self.request_id
@@ -317,117 +1260,329 @@ class DerivClient:
             raise RuntimeError("WebSocket not connected")
             
         try:
-            await self.websocket.send(json.dumps(message))
+            await self.websocket.send(self.codec.dumps(message))
         except ConnectionClosed:
-            self.is_connected = False
+            self._on_connection_lost("WebSocket connection lost")
             raise RuntimeError("WebSocket connection lost")
     
-    async def _send_request(self, request: Dict, timeout: float = 10.0) -> Dict:
-        """Send request and wait for response"""
+    @staticmethod
+    def _request_type(request: Dict) -> str:
+        """Request msg_type - Deriv requests lead with the call name"""
+        return next(iter(request))
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently awaiting a response"""
+        return len(self.pending_requests)
+    
+    async def _send_request(self, request: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        Send request and wait for its response
+        
+        Any number of calls may be awaited concurrently - responses are matched
+        back by req_id, and at most max_in_flight requests are on the wire at once.
+        """
+        if "req_id" not in request:
+            request["req_id"] = self._get_request_id()
         req_id = request["req_id"]
         
-        # Store future for response
-        future = asyncio.Future()
-        self.pending_requests[req_id] = future
+        msg_type = self._request_type(request)
+        if timeout is None:
+            timeout = self.request_timeouts.get(msg_type, self.request_timeouts["default"])
         
-        try:
-            await self._send_message(request)
-            response = await asyncio.wait_for(future, timeout=timeout)
-            return response
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(lane_for(msg_type))
+        
+        async with self._request_window:
+            # Store future for response
+            future = asyncio.get_running_loop().create_future()
+            self.pending_requests[req_id] = future
             
-        except asyncio.TimeoutError:
-            self.logger.error(f"Request {req_id} timed out")
-            self.pending_requests.pop(req_id, None)
-            return {"error": {"message": "Request timeout"}}
+            try:
+                started_ns = time.monotonic_ns()
+                await self._send_message(request)
+                response = await asyncio.wait_for(future, timeout=timeout)
+                self.metrics.observe_request(msg_type, time.monotonic_ns() - started_ns)
+                return response
+                
+            except asyncio.TimeoutError:
+                self.metrics.record_timeout(msg_type)
+                self.logger.error(f"Request {req_id} timed out")
+                return {"error": {"code": "RequestTimeout", "message": "Request timeout"}}
+                
+            except Exception as e:
+                self.logger.error(f"Request {req_id} failed: {e}")
+                return {"error": {"code": "TransportError", "message": str(e)}}
             
-        except Exception as e:
-            self.logger.error(f"Request {req_id} failed: {e}")
-            self.pending_requests.pop(req_id, None)
-            return {"error": {"message": str(e)}}
+            finally:
+                self.pending_requests.pop(req_id, None)
+    
+    async def send_requests(self, requests: List[Dict]) -> List[Dict]:
+        """Send several independent requests concurrently, responses in request order"""
+        return list(await asyncio.gather(*(self._send_request(request) for request in requests)))
     
-    async def _message_handler(self):
+    async def _message_handler(self, websocket):
         """Handle incoming WebSocket messages"""
         try:
-            async for message in self.websocket:
-                try:
-                    data = json.loads(message)
-                    await self._process_message(data)
-                    
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Invalid JSON received: {e}")
+            async for message in websocket:
+                await self._handle_frame(message)
+            
+            # A clean close ends the iteration without raising
+            reason = "WebSocket connection closed"
                     
         except ConnectionClosed:
-            self.logger.warning("WebSocket connection closed")
-            self.is_connected = False
+            reason = "WebSocket connection closed"
             
         except Exception as e:
             self.logger.error(f"Message handler error: {e}")
-            self.is_connected = False
+            reason = f"Message handler error: {e}"
+        
+        self.logger.warning(reason)
+        if websocket is self.websocket:
+            self._on_connection_lost(reason)
+    
+    async def _handle_frame(self, message):
+        """Decode one inbound frame and dispatch it"""
+        self._frame_received_ns = time.monotonic_ns()
+        if self.recorder is not None:
+            self.recorder.write(self._frame_received_ns, message)
+        
+        if self.fast_tick_decode:
+            tick = self._decode_tick_frame(message)
+            if tick is not None:
+                await self._route_tick(tick)
+                return
+        
+        try:
+            data = self.codec.loads(message)
+        except ValueError as e:
+            self.logger.error(f"Invalid JSON received: {e}")
+            return
+        
+        await self._process_message(data)
+    
+    def _decode_tick_frame(self, message) -> Optional[TickRecord]:
+        """
+        Tick fast path - reads only the tick fields out of the raw frame
+        
+        Only pushes on streams whose subscription id is already bound take
+        it; a stream's first message (which answers the subscribe request)
+        and errors return None and go through full decoding.
+        """
+        decoded = decode_tick_frame(message, self._frame_received_ns)
+        if decoded is None:
+            return None
+        
+        subscription = self._streams_by_subscription_id.get(decoded[0])
+        if subscription is None:
+            return None
+        subscription.last_message_ns = self._frame_received_ns
+        return decoded[1]
+    
+    async def _route_tick(self, tick: TickRecord):
+        """Queue a decoded tick if its symbol is still routed"""
+        if tick.symbol not in self.tick_routes:
+            # Stream forgotten while this tick was on the wire
+            self.tick_stats["unrouted"] += 1
+            return
+        
+        try:
+            await self._enqueue_tick(tick)
+        except Exception as e:
+            self.logger.error(f"Tick processing error: {e}")
     
     async def _process_message(self, data: Dict):
-        """Process incoming message and route to appropriate handler"""
+        """Resolve the waiting request, then dispatch by msg_type to the owning stream"""
         # Handle request responses
         req_id = data.get("req_id")
-        if req_id and req_id in self.pending_requests:
+        subscription_info = data.get("subscription")
+        if req_id in self.pending_requests:
             future = self.pending_requests.pop(req_id)
             if not future.done():
                 future.set_result(data)
-            return
+            # The first message of a subscription also seeds its stream handler
+            if subscription_info is None:
+                return
         
-        # Handle tick data
-        if "tick" in data:
-            await self._handle_tick(data["tick"])
+        if subscription_info is not None:
+            subscription_id = subscription_info.get("id")
+            subscription = self._streams_by_subscription_id.get(subscription_id)
+            if subscription is None:
+                # First messages of a stream arrive before its id is known
+                subscription = self._streams_by_req_id.get(req_id)
+                if subscription is None:
+                    self.message_stats["orphaned"] += 1  # Forgotten, still draining
+                    return
+                subscription.subscription_id = subscription_id
+                self._streams_by_subscription_id[subscription_id] = subscription
+            subscription.last_message_ns = self._frame_received_ns
+        else:
+            # Stream errors carry no subscription id
+            subscription = self._streams_by_req_id.get(req_id)
         
-        # Handle other message types as needed
         msg_type = data.get("msg_type")
-        if msg_type:
-            self.logger.debug(f"Received {msg_type} message")
+        handler = self._handlers.get(msg_type)
+        if handler is None:
+            self.unhandled_messages[msg_type] += 1
+            return
+        
+        result = handler(data, subscription)
+        if result is not None:
+            await result
     
-    async def _handle_tick(self, tick_data: Dict):
-        """Process incoming tick data"""
+    async def _handle_tick(self, data: Dict, subscription: Optional[Subscription] = None):
+        """Decode incoming tick data and queue it for the callbacks"""
+        tick_data = data.get("tick", {})
+        if tick_data.get("symbol") not in self.tick_routes:
+            # Stream forgotten while this tick was on the wire
+            self.tick_stats["unrouted"] += 1
+            return
+        
         try:
-            tick = {
-                "symbol": tick_data.get("symbol"),
-                "quote": float(tick_data.get("quote", 0)),
-                "epoch": int(tick_data.get("epoch", 0)),
-                "timestamp": time.time()
-            }
-            
-            # Extract last digit for odd/even analysis
-            quote_str = str(tick["quote"])
-            if "." in quote_str:
-                last_digit = int(quote_str.split(".")[-1][-1])
-                tick["last_digit"] = last_digit
-                tick["is_odd"] = last_digit % 2 == 1
-            
-            # Call registered callbacks
-            for callback in self.tick_callbacks:
-                try:
-                    await callback(tick)
-                except Exception as e:
-                    self.logger.error(f"Tick callback error: {e}")
+            tick = decode_tick(tick_data, self.pip_sizes.get(tick_data.get("symbol")),
+                               self._frame_received_ns)
+            await self._enqueue_tick(tick)
                     
         except Exception as e:
             self.logger.error(f"Tick processing error: {e}")
     
-    async def health_check(self) -> bool:
-        """Check if connection and authentication are healthy"""
-        if not self.is_connected or not self.websocket:
-            return False
-            
-        try:
-            # Simple ping request
-            ping_request = {
-                "ping": 1,
-                "req_id": self._get_request_id()
+    async def _enqueue_tick(self, tick):
+        """Queue a tick for the consumers, applying the overflow policy"""
+        if not self._tick_consumer_tasks:
+            self._start_tick_consumers()
+        
+        if self.tick_overflow == "coalesce":
+            # One queue slot per symbol - later ticks replace the one waiting
+            if tick.symbol in self._latest_ticks:
+                self._latest_ticks[tick.symbol] = tick
+                self.tick_stats["coalesced"] += 1
+                return
+            self._latest_ticks[tick.symbol] = tick
+            tick = tick.symbol
+        
+        if self.tick_overflow == "block":
+            # Backpressure - the socket reader waits for a free slot
+            await self._tick_queue.put(tick)
+        else:
+            if self._tick_queue.full():
+                self.tick_stats["dropped"] += 1
+                dropped = self._tick_queue.evict_oldest_tick()
+                if dropped is None:
+                    # Only backfill batches are waiting - they go first, so lose this tick
+                    dropped, tick = tick, None
+                if self.tick_overflow == "coalesce":
+                    self._latest_ticks.pop(dropped, None)  # A symbol, never a batch
+                if tick is None:
+                    return
+            self._tick_queue.put_nowait(tick)
+        
+        self.tick_stats["enqueued"] += 1
+    
+    async def _tick_consumer(self):
+        """Deliver queued ticks to the registered callbacks"""
+        while True:
+            tick = await self._tick_queue.get()
+            try:
+                if isinstance(tick, list):
+                    await self._deliver_history(tick)
+                    continue
+                
+                if self.tick_overflow == "coalesce":
+                    tick = self._latest_ticks.pop(tick)
+                
+                route = self.tick_routes.get(tick.symbol)
+                if route is None:
+                    self.tick_stats["unrouted"] += 1
+                    continue
+                
+                # Backfill and resubscribes overlap the ticks already delivered
+                if tick.epoch <= self._last_tick_epoch.get(tick.symbol, 0):
+                    self.tick_stats["duplicates"] += 1
+                    continue
+                self._last_tick_epoch[tick.symbol] = tick.epoch
+                
+                if tick.received_ns:
+                    self.metrics.tick_to_callback.observe(time.monotonic_ns() - tick.received_ns)
+                
+                for callback in route.callbacks:
+                    try:
+                        await callback(tick)
+                    except Exception as e:
+                        self.logger.error(f"Tick callback error: {e}")
+            finally:
+                self._tick_queue.task_done()
+    
+    async def _deliver_history(self, ticks: List):
+        """Hand a backfilled batch to its symbol's callbacks, minus ticks already delivered"""
+        symbol = ticks[0].symbol
+        route = self.tick_routes.get(symbol)
+        if route is None:
+            self.tick_stats["unrouted"] += len(ticks)
+            return
+        
+        last_epoch = self._last_tick_epoch.get(symbol, 0)
+        fresh = [tick for tick in ticks if tick.epoch > last_epoch]
+        self.tick_stats["duplicates"] += len(ticks) - len(fresh)
+        if not fresh:
+            return
+        self._last_tick_epoch[symbol] = fresh[-1].epoch
+        
+        if route.history_callbacks:
+            callbacks, batches = route.history_callbacks, [fresh]
+        else:
+            callbacks, batches = route.callbacks, fresh
+        
+        for batch in batches:
+            for callback in callbacks:
+                try:
+                    await callback(batch)
+                except Exception as e:
+                    self.logger.error(f"Tick callback error: {e}")
+    
+    def _start_tick_consumers(self):
+        """Start the tick consumer tasks"""
+        self._tick_consumer_tasks = [
+            asyncio.create_task(self._tick_consumer()) for _ in range(self.tick_consumers)
+        ]
+    
+    def _stop_tick_consumers(self):
+        """Cancel the tick consumer tasks"""
+        for task in self._tick_consumer_tasks:
+            task.cancel()
+        self._tick_consumer_tasks = []
+    
+    def get_tick_queue_stats(self) -> Dict:
+        """Tick queue depth and overflow counters"""
+        return {
+            "depth": self._tick_queue.qsize(),
+            "maxsize": self._tick_queue.maxsize,
+            "policy": self.tick_overflow,
+            **self.tick_stats
+        }
+    
+    def get_metrics(self) -> Dict:
+        """
+        Snapshot of client instrumentation
+        
+        Returns:
+            Dictionary with per-msg_type request latency histograms, tick-to-callback
+            latency, timeout counts and tick queue stats (latencies in milliseconds)
+        """
+        return {
+            **self.metrics.snapshot(),
+            "tick_queue": self.get_tick_queue_stats(),
+            "in_flight": self.in_flight,
+            "messages": {**self.message_stats, "unhandled": dict(self.unhandled_messages)},
+            "rate_limits": self.rate_limiter.get_stats() if self.rate_limiter else None,
+            "watchdog": {
+                **self.watchdog_stats,
+                "ping_rtt_ms": getattr(self.websocket, "latency", 0.0) * 1000
             }
-            
-            response = await self._send_request(ping_request, timeout=5.0)
-            return "pong" in response
-            
-        except Exception as e:
-            self.logger.error(f"Health check failed: {e}")
-            return False
+        }
+    
+    async def health_check(self) -> bool:
+        """Check connection health from the watchdog's signals - sends nothing"""
+        return self._unhealthy_reason() is None
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -440,8 +1595,13 @@ class DerivClient:
         await self.disconnect()
 
 
-async def create_deriv_client() -> DerivClient:
-    """Factory function to create authenticated Deriv client from environment"""
+async def create_deriv_client(api_config: Optional[Dict] = None):
+    """
+    Factory function to create authenticated Deriv client from environment
+    
+    Returns a DerivClientPool with the same API when api.connections > 1.
+    """
+    api_config = api_config or {}
     app_id = os.getenv("DERIV_APP_ID")
     api_token = os.getenv("DERIV_API_TOKEN")
     environment = os.getenv("DERIV_ENV", "demo")
@@ -449,5 +1609,41 @@ async def create_deriv_client() -> DerivClient:
     if not app_id or not api_token:
         raise ValueError("DERIV_APP_ID and DERIV_API_TOKEN must be set")
     
-    client = DerivClient(app_id, api_token, environment)
+    connections = api_config.get("connections", 1)
+    record_path = api_config.get("record_frames")
+    if connections > 1:
+        from client_pool import DerivClientPool
+        # One recording per member - connections never share a file
+        return DerivClientPool([
+            _build_client(app_id, api_token, environment, api_config,
+                          f"{record_path}.{index}" if record_path else None)
+            for index in range(connections)
+        ])
+    
+    return _build_client(app_id, api_token, environment, api_config, record_path)
+
+
+def _build_client(app_id: str, api_token: str, environment: str, api_config: Dict,
+                  record_path: Optional[str] = None) -> DerivClient:
+    """One DerivClient configured from the api section"""
+    client = DerivClient(
+        app_id,
+        api_token,
+        environment,
+        max_in_flight=api_config.get("max_in_flight_requests", 32),
+        request_timeouts=api_config.get("request_timeouts"),
+        settlement_timeout=api_config.get("settlement_timeout", 15.0),
+        json_codec=api_config.get("json_codec", "auto"),
+        tick_queue_size=api_config.get("tick_queue_size", 10000),
+        tick_overflow=api_config.get("tick_overflow", "drop_oldest"),
+        tick_consumers=api_config.get("tick_consumers", 1),
+        ws_url=os.getenv("DERIV_WS_URL") or api_config.get("ws_url"),
+        rate_limits=api_config.get("rate_limits"),
+        record_path=record_path,
+        watchdog_interval=api_config.get("watchdog_interval", 1.0),
+        stale_tick_intervals=api_config.get("stale_tick_intervals", 5.0),
+        max_ping_rtt=api_config.get("max_ping_rtt", 5.0),
+        fast_tick_decode=api_config.get("fast_tick_decode", True),
+        max_recovery_attempts=api_config.get("max_recovery_attempts", 5)
+    )
     return client
@@ -0,0 +1,191 @@
+"""
+Last Digit Distribution
+Incremental 0-9 histograms over several windows with a streaming chi-square test
+"""
+
+import math
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+DIGITS = 10
+
+
+def chi_square_sf(statistic: float, dof: int) -> float:
+    """
+    Chi-square survival function (p-value) in closed form
+
+    Even degrees of freedom sum a Poisson tail; odd ones add the same kind of
+    series to erfc. O(dof) with no SciPy, so constant time for the digit test
+    (9 degrees of freedom).
+    """
+    if dof < 1:
+        raise ValueError("Degrees of freedom must be positive")
+    if statistic <= 0:
+        return 1.0
+
+    half = statistic / 2
+    if dof % 2 == 0:
+        term = total = 1.0
+        for j in range(1, dof // 2):
+            term *= half / j
+            total += term
+        return min(1.0, math.exp(-half) * total)
+
+    term = total = 0.0
+    if dof > 1:
+        term = total = 1.0
+        for j in range(2, (dof + 1) // 2):
+            term *= statistic / (2 * j - 1)
+            total += term
+    tail = math.sqrt(2 * statistic / math.pi) * math.exp(-half) * total
+    return min(1.0, math.erfc(math.sqrt(half)) + tail)
+
+
+class DigitWindow:
+    """
+    Digit counts over the last `size` ticks of a DigitDistribution
+
+    Keeps the sum of squared counts alongside the counts, so the chi-square
+    statistic against a uniform distribution is O(1):
+    chi2 = 10 / n * sum(count^2) - n.
+    """
+
+    __slots__ = ("size", "counts", "total", "odd_count", "_square_sum")
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Window size must be positive")
+
+        self.size = size
+        self.counts = [0] * DIGITS
+        self.total = 0
+        self.odd_count = 0
+        self._square_sum = 0  # sum(count^2), exact as integers
+
+    def __len__(self) -> int:
+        return self.total
+
+    @property
+    def full(self) -> bool:
+        return self.total == self.size
+
+    def _add(self, digit: int):
+        count = self.counts[digit]
+        self.counts[digit] = count + 1
+        self._square_sum += 2 * count + 1
+        self.total += 1
+        self.odd_count += digit & 1
+
+    def _remove(self, digit: int):
+        count = self.counts[digit]
+        self.counts[digit] = count - 1
+        self._square_sum -= 2 * count - 1
+        self.total -= 1
+        self.odd_count -= digit & 1
+
+    def _load(self, digits: Sequence[int]):
+        """Replace the window with the given digits (at most `size`)"""
+        self.counts = np.bincount(np.asarray(digits, dtype=np.intp), minlength=DIGITS).tolist()
+        self.total = len(digits)
+        self.odd_count = sum(self.counts[1::2])
+        self._square_sum = sum(count * count for count in self.counts)
+
+    @property
+    def even_count(self) -> int:
+        return self.total - self.odd_count
+
+    @property
+    def odd_frequency(self) -> float:
+        return self.odd_count / self.total if self.total else 0.5
+
+    def frequency(self, digit: int) -> float:
+        """Share of the window ending in digit - the matches rate"""
+        return self.counts[digit] / self.total if self.total else 1 / DIGITS
+
+    def matches(self, digit: int) -> int:
+        return self.counts[digit]
+
+    def differs(self, digit: int) -> int:
+        return self.total - self.counts[digit]
+
+    def over(self, barrier: int) -> int:
+        """Ticks whose last digit is above barrier"""
+        return sum(self.counts[barrier + 1:])
+
+    def under(self, barrier: int) -> int:
+        """Ticks whose last digit is below barrier"""
+        return sum(self.counts[:barrier])
+
+    @property
+    def chi_square(self) -> float:
+        """Pearson chi-square statistic against uniform digits"""
+        if not self.total:
+            return 0.0
+        return DIGITS * self._square_sum / self.total - self.total
+
+    @property
+    def p_value(self) -> float:
+        """Probability of a chi-square this large from uniform digits (9 dof)"""
+        return chi_square_sf(self.chi_square, DIGITS - 1)
+
+
+class DigitDistribution:
+    """
+    Last digit histograms of one symbol over several window sizes
+
+    One ring of the latest max(windows) digits feeds every window: a new
+    digit is added to each, and the digit that just fell out of a window is
+    read back from the ring at that window's distance and removed. O(number
+    of windows) per tick, independent of the window sizes.
+    """
+
+    def __init__(self, windows: Iterable[int] = (20, 200, 1000), symbol: Optional[str] = None):
+        sizes = sorted(set(windows))
+        if not sizes:
+            raise ValueError("At least one window size is required")
+
+        self.symbol = symbol
+        self.windows = {size: DigitWindow(size) for size in sizes}
+        self._window_list = list(self.windows.values())
+        self.capacity = sizes[-1]
+        self._ring: List[int] = [0] * self.capacity
+        self._next = 0  # Ring slot the next digit is written to
+
+    def __getitem__(self, size: int) -> DigitWindow:
+        return self.windows[size]
+
+    def __len__(self) -> int:
+        """Digits held - the largest window's fill"""
+        return self._window_list[-1].total
+
+    def push(self, digit: int):
+        """Add a tick's last digit"""
+        ring, slot = self._ring, self._next
+        for window in self._window_list:
+            if window.total == window.size:
+                # With size == capacity this reads the slot about to be overwritten
+                window._remove(ring[slot - window.size])
+            window._add(digit)
+
+        ring[slot] = digit
+        self._next = (slot + 1) % self.capacity
+
+    def extend(self, digits: Sequence[int]):
+        """Add last digits oldest first (a list or NumPy array)"""
+        if len(digits) < self.capacity:
+            for digit in (digits.tolist() if isinstance(digits, np.ndarray) else digits):
+                self.push(int(digit))
+            return
+
+        latest = [int(digit) for digit in digits[-self.capacity:]]
+        self._ring = latest
+        self._next = 0
+        for window in self._window_list:
+            window._load(latest[-window.size:])
+
+    def clear(self):
+        for window in self._window_list:
+            window._load([])
+        self._next = 0
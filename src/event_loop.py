@@ -0,0 +1,59 @@
+"""
+Event Loop Selection
+Runs the bot on uvloop when requested and installed, otherwise on asyncio
+"""
+
+import asyncio
+import logging
+import sys
+from typing import Any, Coroutine, List
+
+
+# Opt-in - "asyncio" unless uvloop is asked for explicitly
+LOOP_CHOICES = ("asyncio", "uvloop")
+
+
+def available_loops() -> List[str]:
+    """Names of the event loops that can run here"""
+    names = ["asyncio"]
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return names
+    names.append("uvloop")
+    return names
+
+
+def resolve_loop(name: str = "asyncio") -> str:
+    """
+    Loop that will actually run for a requested name
+
+    Args:
+        name: "asyncio" or "uvloop"
+
+    Returns:
+        The requested loop, or "asyncio" if uvloop is not installed
+    """
+    name = (name or "asyncio").lower()
+
+    if name not in LOOP_CHOICES:
+        raise ValueError(f"Unknown event loop '{name}' - choose from {', '.join(LOOP_CHOICES)}")
+
+    if name not in available_loops():
+        logging.getLogger(__name__).warning(f"Event loop '{name}' is not installed - using asyncio")
+        return "asyncio"
+    return name
+
+
+def run(main: Coroutine, loop: str = "asyncio") -> Any:
+    """asyncio.run() on the requested event loop"""
+    if resolve_loop(loop) == "asyncio":
+        return asyncio.run(main)
+
+    import uvloop
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+
+    uvloop.install()
+    return asyncio.run(main)
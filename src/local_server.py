@@ -0,0 +1,531 @@
+"""
+Local Deriv API Stand-in Server
+Emulates the subset of the Deriv WebSocket API the bots use, for tests and benchmarks
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import zlib
+from collections import deque
+from typing import Dict, List, Optional
+
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+
+# symbol -> (pip_size, starting quote, display name)
+DEFAULT_SYMBOLS = {
+    "R_10": (3, 6300.0, "Volatility 10 Index"),
+    "R_25": (3, 2500.0, "Volatility 25 Index"),
+    "R_50": (4, 250.0, "Volatility 50 Index"),
+    "R_75": (4, 90000.0, "Volatility 75 Index"),
+    "R_100": (2, 1400.0, "Volatility 100 Index"),
+    "1HZ10V": (2, 6340.0, "Volatility 10 (1s) Index"),
+    "1HZ100V": (2, 900.0, "Volatility 100 (1s) Index"),
+}
+
+# Payout per unit stake for digit contracts
+PAYOUT_MULTIPLIERS = {
+    "DIGITEVEN": 1.95,
+    "DIGITODD": 1.95,
+    "DIGITDIFF": 1.0571,
+    "DIGITMATCH": 9.0,
+}
+
+START_EPOCH = 1_700_000_000
+HISTORY_SIZE = 10_000  # Ticks kept per symbol for ticks_history
+
+
+class _TickStream:
+    """Seeded random-walk quotes for one symbol"""
+
+    def __init__(self, symbol: str, pip_size: int, start_quote: float, seed: Optional[int]):
+        self.symbol = symbol
+        self.pip_size = pip_size
+        self.rng = random.Random(None if seed is None else seed + zlib.crc32(symbol.encode()))
+        self.quote = start_quote
+        self.step = start_quote * 0.0002
+        self.epoch = START_EPOCH
+        self.history = deque(maxlen=HISTORY_SIZE)  # (epoch, quote)
+
+        # Pre-fill so ticks_history has data from the first request
+        for _ in range(HISTORY_SIZE // 2):
+            self.next_tick()
+
+    def next_tick(self) -> tuple:
+        self.quote = round(self.quote + self.rng.gauss(0, self.step), self.pip_size)
+        self.epoch += 1
+        self.history.append((self.epoch, self.quote))
+        return self.epoch, self.quote
+
+    def last_digit(self, quote: float) -> int:
+        return round(quote * 10 ** self.pip_size) % 10
+
+
+class _Session:
+    """Per-connection state"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.authorized = False
+        self.frames_sent = 0
+        self.subscriptions: Dict[str, Dict] = {}  # subscription id -> stream description
+
+
+class LocalDerivServer:
+    """
+    WebSocket server speaking the Deriv API messages the bots depend on
+
+    authorize, balance, active_symbols, ticks, ticks_history, proposal, buy,
+    proposal_open_contract, ping, forget and forget_all are emulated against
+    one virtual account. Ticks are seeded random walks pushed tick_rate times
+    per second per symbol; contracts settle on their exit tick.
+
+    Args:
+        tick_rate: Ticks per second per symbol (may exceed 1)
+        seed: Seed for quotes and jitter - None for non-deterministic runs
+        latency: Seconds added before every request response
+        jitter: Extra uniform random delay, in seconds, on top of latency
+        disconnect_after: Close each connection after this many frames sent
+        balance: Starting virtual account balance
+        is_virtual: Reported account type (0 exercises the real-account safety checks)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, tick_rate: float = 1.0,
+                 seed: Optional[int] = None, latency: float = 0.0, jitter: float = 0.0,
+                 disconnect_after: Optional[int] = None, balance: float = 10000.0,
+                 is_virtual: bool = True, symbols: Optional[Dict[str, tuple]] = None):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.latency = latency
+        self.jitter = jitter
+        self.disconnect_after = disconnect_after
+        self.balance = balance
+        self.is_virtual = is_virtual
+        self.stalled = False  # Stop pushing stream messages but keep sockets open
+        self.logger = logging.getLogger(__name__)
+
+        self.streams = {
+            symbol: _TickStream(symbol, pip_size, quote, seed)
+            for symbol, (pip_size, quote, _) in (symbols or DEFAULT_SYMBOLS).items()
+        }
+        self.display_names = {
+            symbol: info[2] for symbol, info in (symbols or DEFAULT_SYMBOLS).items()
+        }
+        self._jitter_rng = random.Random(seed)
+
+        self.sessions: List[_Session] = []
+        self.contracts: Dict[int, Dict] = {}
+        self.proposals: Dict[str, Dict] = {}  # proposal id -> contract parameters
+        self._ids = itertools.count(1)
+        self._server = None
+        self._tickers: List[asyncio.Task] = []
+
+    # Lifecycle
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/websockets/v3?app_id=1089"
+
+    async def start(self) -> str:
+        """Start serving and ticking; returns the URL to connect to"""
+        self._server = await websockets.serve(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tickers = [asyncio.create_task(self._run_ticker(stream)) for stream in self.streams.values()]
+        self.logger.info(f"Local Deriv server listening on {self.url}")
+        return self.url
+
+    async def stop(self):
+        """Stop ticking and close every connection"""
+        for task in self._tickers:
+            task.cancel()
+        self._tickers = []
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def drop_connections(self):
+        """Close every client connection - simulates a network drop"""
+        for session in list(self.sessions):
+            await session.websocket.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    # Connection handling
+
+    async def _handle_connection(self, websocket, *args):
+        session = _Session(websocket)
+        self.sessions.append(session)
+
+        try:
+            async for message in websocket:
+                try:
+                    request = json.loads(message)
+                except ValueError:
+                    await self._send(session, self._error({}, "InputValidationFailed", "Invalid JSON"))
+                    continue
+
+                # Each request answers independently, so responses may overtake each other
+                asyncio.create_task(self._answer(session, request))
+
+        except ConnectionClosed:
+            pass
+        finally:
+            self.sessions.remove(session)
+
+    async def _answer(self, session: _Session, request: Dict):
+        delay = self.latency + (self._jitter_rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        msg_type = next(iter(request), None)
+        handler = getattr(self, f"_on_{msg_type}", None)
+
+        if handler is None:
+            response = self._error(request, "UnrecognisedRequest", "Unrecognised request")
+        elif msg_type in ("balance", "buy", "proposal_open_contract") and not session.authorized:
+            response = self._error(request, "AuthorizationRequired", "Please log in.")
+        else:
+            response = handler(session, request)
+
+        await self._send(session, response)
+
+    async def _send(self, session: _Session, payload: Dict):
+        try:
+            # Compact separators, as Deriv sends its frames
+            await session.websocket.send(json.dumps(payload, separators=(",", ":")))
+        except ConnectionClosed:
+            return
+
+        session.frames_sent += 1
+        if self.disconnect_after and session.frames_sent >= self.disconnect_after:
+            await session.websocket.close()
+
+    async def _push(self, session: _Session, subscription_id: str, payload: Dict):
+        stream = session.subscriptions.get(subscription_id)
+        if stream is None or self.stalled:
+            return
+        await self._send(session, self._reply(stream["request"], payload, subscription_id))
+
+    # Message helpers
+
+    @staticmethod
+    def _reply(request: Dict, payload: Dict, subscription_id: Optional[str] = None) -> Dict:
+        message = {"echo_req": request, **payload}
+        if "req_id" in request:
+            message["req_id"] = request["req_id"]
+        if subscription_id is not None:
+            message["subscription"] = {"id": subscription_id}
+        return message
+
+    @staticmethod
+    def _error(request: Dict, code: str, message: str) -> Dict:
+        response = {
+            "echo_req": request,
+            "msg_type": next(iter(request), "error"),
+            "error": {"code": code, "message": message},
+        }
+        if "req_id" in request:
+            response["req_id"] = request["req_id"]
+        return response
+
+    def _subscribe(self, session: _Session, request: Dict, kind: str, **stream) -> str:
+        subscription_id = f"{next(self._ids):08x}-{kind}"
+        session.subscriptions[subscription_id] = {"kind": kind, "request": request, **stream}
+        return subscription_id
+
+    def _tick_payload(self, stream: _TickStream, epoch: int, quote: float, subscription_id: str) -> Dict:
+        return {
+            "msg_type": "tick",
+            "tick": {
+                "ask": quote, "bid": quote, "epoch": epoch, "id": subscription_id,
+                "pip_size": stream.pip_size, "quote": quote, "symbol": stream.symbol,
+            },
+        }
+
+    # Request handlers
+
+    def _on_authorize(self, session: _Session, request: Dict) -> Dict:
+        if not request.get("authorize"):
+            return self._error(request, "InvalidToken", "The token is invalid.")
+        session.authorized = True
+        return self._reply(request, {
+            "msg_type": "authorize",
+            "authorize": {
+                "balance": self.balance, "currency": "USD", "is_virtual": int(self.is_virtual),
+                "loginid": "VRTC1000001" if self.is_virtual else "CR1000001",
+            },
+        })
+
+    def _on_ping(self, session: _Session, request: Dict) -> Dict:
+        return self._reply(request, {"msg_type": "ping", "ping": "pong"})
+
+    def _on_balance(self, session: _Session, request: Dict) -> Dict:
+        subscription_id = self._subscribe(session, request, "balance") if request.get("subscribe") else None
+        return self._reply(request, self._balance_payload(), subscription_id)
+
+    def _balance_payload(self) -> Dict:
+        return {"msg_type": "balance", "balance": {"balance": round(self.balance, 2), "currency": "USD"}}
+
+    def _on_active_symbols(self, session: _Session, request: Dict) -> Dict:
+        return self._reply(request, {
+            "msg_type": "active_symbols",
+            "active_symbols": [
+                {"symbol": symbol, "display_name": self.display_names[symbol], "pip": 10 ** -stream.pip_size,
+                 "market": "synthetic_index", "exchange_is_open": 1}
+                for symbol, stream in self.streams.items()
+            ],
+        })
+
+    def _on_ticks(self, session: _Session, request: Dict) -> Dict:
+        stream = self.streams.get(request["ticks"])
+        if stream is None:
+            return self._error(request, "MarketIsClosed", "This market is presently closed.")
+
+        subscription_id = self._subscribe(session, request, "ticks", symbol=stream.symbol)
+        epoch, quote = stream.history[-1]
+        return self._reply(request, self._tick_payload(stream, epoch, quote, subscription_id), subscription_id)
+
+    def _on_ticks_history(self, session: _Session, request: Dict) -> Dict:
+        stream = self.streams.get(request["ticks_history"])
+        if stream is None:
+            return self._error(request, "InvalidSymbol", "Symbol is invalid.")
+
+        end = request.get("end", "latest")
+        end = stream.epoch if end == "latest" else int(end)
+        start = int(request.get("start", 0))
+        count = min(int(request.get("count", 5000)), 5000)
+
+        window = [(epoch, quote) for epoch, quote in stream.history if start <= epoch <= end][-count:]
+        subscription_id = None
+        if request.get("subscribe"):
+            subscription_id = self._subscribe(session, request, "ticks", symbol=stream.symbol)
+
+        return self._reply(request, {
+            "msg_type": "history",
+            "history": {"prices": [quote for _, quote in window], "times": [epoch for epoch, _ in window]},
+            "pip_size": stream.pip_size,
+        }, subscription_id)
+
+    def _price_contract(self, parameters: Dict) -> Optional[Dict]:
+        contract_type = parameters.get("contract_type")
+        if contract_type not in PAYOUT_MULTIPLIERS or parameters.get("symbol") not in self.streams:
+            return None
+
+        stake = round(float(parameters.get("amount", 0)), 2)
+        return {
+            "contract_type": contract_type,
+            "symbol": parameters["symbol"],
+            "barrier": parameters.get("barrier"),
+            "duration": int(parameters.get("duration", 1)),
+            "ask_price": stake,
+            "payout": round(stake * PAYOUT_MULTIPLIERS[contract_type], 2),
+        }
+
+    def _new_proposal(self, contract: Dict) -> Dict:
+        proposal_id = f"{next(self._ids):08x}-proposal"
+        self.proposals[proposal_id] = contract
+        return {
+            "msg_type": "proposal",
+            "proposal": {
+                "id": proposal_id, "ask_price": contract["ask_price"], "payout": contract["payout"],
+                "spot": self.streams[contract["symbol"]].quote,
+                "display_value": f"{contract['ask_price']:.2f}",
+            },
+        }
+
+    def _on_proposal(self, session: _Session, request: Dict) -> Dict:
+        contract = self._price_contract(request)
+        if contract is None:
+            return self._error(request, "ContractBuyValidationError", "Invalid contract parameters")
+
+        subscription_id = None
+        if request.get("subscribe"):
+            subscription_id = self._subscribe(session, request, "proposal", contract=contract)
+        return self._reply(request, self._new_proposal(contract), subscription_id)
+
+    def _on_buy(self, session: _Session, request: Dict) -> Dict:
+        if request["buy"] == 1 or request["buy"] == "1":
+            contract = self._price_contract(request.get("parameters", {}))
+        else:
+            # A proposal id can be bought once
+            contract = self.proposals.pop(request["buy"], None)
+
+        if contract is None:
+            return self._error(request, "InvalidContractProposal", "Unknown contract proposal")
+
+        price = float(request.get("price", 0))
+        if price < contract["ask_price"]:
+            return self._error(request, "PriceMoved", "The underlying market has moved too much")
+        if contract["ask_price"] > self.balance:
+            return self._error(request, "InsufficientBalance", "Your account balance is insufficient")
+
+        self.balance -= contract["ask_price"]
+        contract_id = next(self._ids)
+        stream = self.streams[contract["symbol"]]
+        self.contracts[contract_id] = {
+            **contract,
+            "contract_id": contract_id,
+            "entry_tick": stream.quote,
+            "exit_epoch": stream.epoch + contract["duration"],
+            "is_sold": 0,
+            "profit": 0.0,
+            "status": "open",
+            "exit_tick": None,
+        }
+        self._push_balance()
+
+        return self._reply(request, {
+            "msg_type": "buy",
+            "buy": {
+                "contract_id": contract_id, "buy_price": contract["ask_price"], "payout": contract["payout"],
+                "balance_after": round(self.balance, 2), "transaction_id": next(self._ids),
+                "start_time": stream.epoch,
+            },
+        })
+
+    def _contract_payload(self, contract: Dict) -> Dict:
+        return {
+            "msg_type": "proposal_open_contract",
+            "proposal_open_contract": {
+                "contract_id": contract["contract_id"], "contract_type": contract["contract_type"],
+                "is_sold": contract["is_sold"], "profit": contract["profit"], "payout": contract["payout"],
+                "buy_price": contract["ask_price"], "entry_tick": contract["entry_tick"],
+                "exit_tick": contract["exit_tick"], "status": contract["status"],
+                "current_balance": round(self.balance, 2),
+            },
+        }
+
+    def _on_proposal_open_contract(self, session: _Session, request: Dict) -> Dict:
+        contract = self.contracts.get(request.get("contract_id"))
+        if contract is None:
+            return self._error(request, "InvalidContractId", "Contract not found")
+
+        subscription_id = None
+        if request.get("subscribe") and not contract["is_sold"]:
+            subscription_id = self._subscribe(session, request, "contract", contract_id=contract["contract_id"])
+        return self._reply(request, self._contract_payload(contract), subscription_id)
+
+    def _on_forget(self, session: _Session, request: Dict) -> Dict:
+        removed = session.subscriptions.pop(request["forget"], None) is not None
+        return self._reply(request, {"msg_type": "forget", "forget": int(removed)})
+
+    def _on_forget_all(self, session: _Session, request: Dict) -> Dict:
+        kinds = request["forget_all"]
+        kinds = {kinds} if isinstance(kinds, str) else set(kinds)
+
+        removed = [sid for sid, stream in session.subscriptions.items() if stream["kind"] in kinds]
+        for subscription_id in removed:
+            del session.subscriptions[subscription_id]
+        return self._reply(request, {"msg_type": "forget_all", "forget_all": removed})
+
+    # Market simulation
+
+    async def _run_ticker(self, stream: _TickStream):
+        interval = 1.0 / self.tick_rate
+        while True:
+            await asyncio.sleep(interval)
+            epoch, quote = stream.next_tick()
+            self._settle_contracts(stream, epoch, quote)
+
+            for session in list(self.sessions):
+                for subscription_id, sub in list(session.subscriptions.items()):
+                    if sub.get("symbol") == stream.symbol:
+                        await self._push(session, subscription_id,
+                                         self._tick_payload(stream, epoch, quote, subscription_id))
+                    elif sub["kind"] == "proposal" and sub["contract"]["symbol"] == stream.symbol:
+                        await self._push(session, subscription_id, self._new_proposal(sub["contract"]))
+
+    def _settle_contracts(self, stream: _TickStream, epoch: int, quote: float):
+        digit = stream.last_digit(quote)
+        settled = False
+
+        for contract in self.contracts.values():
+            if contract["is_sold"] or contract["symbol"] != stream.symbol or epoch < contract["exit_epoch"]:
+                continue
+
+            contract_type = contract["contract_type"]
+            barrier = None if contract["barrier"] is None else int(contract["barrier"])
+            won = {
+                "DIGITEVEN": digit % 2 == 0,
+                "DIGITODD": digit % 2 == 1,
+                "DIGITDIFF": digit != barrier,
+                "DIGITMATCH": digit == barrier,
+            }[contract_type]
+
+            contract["is_sold"] = 1
+            contract["exit_tick"] = quote
+            contract["status"] = "won" if won else "lost"
+            contract["profit"] = round((contract["payout"] if won else 0.0) - contract["ask_price"], 2)
+            if won:
+                self.balance += contract["payout"]
+            settled = True
+
+            self._push_contract(contract)
+
+        if settled:
+            self._push_balance()
+
+    def _push_contract(self, contract: Dict):
+        for session in self.sessions:
+            for subscription_id, sub in list(session.subscriptions.items()):
+                if sub["kind"] == "contract" and sub["contract_id"] == contract["contract_id"]:
+                    message = self._reply(sub["request"], self._contract_payload(contract), subscription_id)
+                    asyncio.create_task(self._send(session, message))
+                    # Deriv ends a contract stream once the contract is sold
+                    if contract["is_sold"]:
+                        del session.subscriptions[subscription_id]
+
+    def _push_balance(self):
+        for session in self.sessions:
+            for subscription_id, sub in session.subscriptions.items():
+                if sub["kind"] == "balance":
+                    asyncio.create_task(self._push(session, subscription_id, self._balance_payload()))
+
+
+async def serve_forever(server: LocalDerivServer):
+    """Run a server until cancelled"""
+    async with server:
+        print(f"Local Deriv server listening on {server.url}")
+        print(f"Point the bots at it with DERIV_WS_URL={server.url}")
+        await asyncio.Future()
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Local Deriv API stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick-rate", type=float, default=1.0, help="Ticks per second per symbol")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for deterministic quotes")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random response delay (s)")
+    parser.add_argument("--disconnect-after", type=int, default=None, help="Drop clients after N frames")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = LocalDerivServer(
+        host=args.host, port=args.port, tick_rate=args.tick_rate, seed=args.seed,
+        latency=args.latency, jitter=args.jitter, disconnect_after=args.disconnect_after
+    )
+
+    try:
+        asyncio.run(serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
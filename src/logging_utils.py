@@ -51,7 +51,8 @@ class DashboardPrinter:
     
     @staticmethod
     def print_status(risk_status: Dict, strategy_stats: Dict, mode: str, 
-                    session_stats: Dict, validation_results: Dict = None):
+                    session_stats: Dict, validation_results: Dict = None,
+                    client_metrics: Dict = None):
         """Print comprehensive status dashboard"""
         
         print("="*70)
@@ -83,12 +84,29 @@ class DashboardPrinter:
         print(f"Ticks Processed: {strategy_stats.get('total_ticks', 0)} | " +
               f"Odd/Even Freq: {strategy_stats.get('odd_frequency', 0.5):.3f}/" +
               f"{strategy_stats.get('even_frequency', 0.5):.3f}")
+        if "digit_p_value" in strategy_stats:
+            print(f"Digit Chi-Square: {strategy_stats['digit_chi_square']:.2f} | " +
+                  f"Uniform p-value: {strategy_stats['digit_p_value']:.4f}")
         
         # Validation results if available
         if validation_results:
             print(f"Expected Value: {validation_results.get('expected_value', 0):.4f} | " +
                   f"Edge Detected: {'YES' if validation_results.get('validated', False) else 'NO'}")
         
+        # API latency if available (p50/p99 in ms)
+        if client_metrics:
+            latencies = [f"{msg_type} {h['p50_ms']:.1f}/{h['p99_ms']:.1f}"
+                         for msg_type, h in sorted(client_metrics.get('requests', {}).items())]
+            tick_latency = client_metrics.get('tick_to_callback', {})
+            print(f"Latency p50/p99 ms: {' | '.join(latencies) or 'n/a'}")
+            print(f"Tick->Callback: {tick_latency.get('p50_ms', 0):.2f}/{tick_latency.get('p99_ms', 0):.2f} ms | " +
+                  f"Timeouts: {client_metrics.get('total_timeouts', 0)}")
+            order_latency = client_metrics.get('signal_to_ack', {})
+            if order_latency.get('count'):
+                orders = client_metrics.get('orders', {})
+                print(f"Signal->Ack: {order_latency['p50_ms']:.1f}/{order_latency['p99_ms']:.1f} ms | " +
+                      f"Armed/Cold buys: {orders.get('armed', 0)}/{orders.get('cold', 0)}")
+        
         print("="*70)
     
     @staticmethod
@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from runner import TradingBot
+from event_loop import LOOP_CHOICES, run
 
 
 async def run_paper_test():
@@ -74,6 +75,12 @@ def main():
         default="config.yaml",
         help="Configuration file path"
     )
+    parser.add_argument(
+        "--loop",
+        choices=LOOP_CHOICES,
+        default="asyncio",
+        help="Event loop: 'uvloop' if installed, else falls back to asyncio"
+    )
     
     args = parser.parse_args()
     
@@ -90,9 +97,9 @@ def main():
     # Run appropriate mode
     try:
         if args.mode == "paper":
-            asyncio.run(run_paper_test())
+            run(run_paper_test(), args.loop)
         else:
-            asyncio.run(run_full_bot())
+            run(run_full_bot(), args.loop)
             
     except KeyboardInterrupt:
         print("\nShutdown requested by user")
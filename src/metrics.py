@@ -0,0 +1,121 @@
+"""
+Low-Overhead Latency Metrics for the Deriv Client
+Fixed-bucket histograms over monotonic nanosecond timings
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict
+
+
+# Bucket upper bounds in nanoseconds, 50us to 10s; slower samples land in overflow
+LATENCY_BUCKETS_NS = (
+    50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000,
+    100_000_000, 250_000_000, 500_000_000,
+    1_000_000_000, 2_500_000_000, 5_000_000_000, 10_000_000_000,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram - O(log buckets) to record, no per-sample storage"""
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, elapsed_ns: int):
+        """Record one sample"""
+        self.counts[bisect_left(LATENCY_BUCKETS_NS, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's samples to this one"""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, fraction: float) -> int:
+        """Upper bound (ns) of the bucket holding the given fraction of samples"""
+        if self.count == 0:
+            return 0
+
+        threshold = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= threshold:
+                return LATENCY_BUCKETS_NS[index] if index < len(LATENCY_BUCKETS_NS) else self.max_ns
+        return self.max_ns
+
+    def snapshot(self) -> Dict:
+        """Summary and bucket counts, in milliseconds"""
+        buckets = {f"le_{bound / 1e6:g}ms": count for bound, count in zip(LATENCY_BUCKETS_NS, self.counts)}
+        buckets["overflow"] = self.counts[-1]
+
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "max_ms": self.max_ns / 1e6,
+            "p50_ms": self.percentile(0.50) / 1e6,
+            "p90_ms": self.percentile(0.90) / 1e6,
+            "p99_ms": self.percentile(0.99) / 1e6,
+            "buckets": buckets,
+        }
+
+
+class ClientMetrics:
+    """Round-trip latency per msg_type, tick-to-callback and signal-to-ack latency, timeout counts"""
+
+    def __init__(self):
+        self.request_latency: Dict[str, LatencyHistogram] = {}
+        self.tick_to_callback = LatencyHistogram()
+        self.signal_to_ack = LatencyHistogram()
+        self.orders = Counter()  # "armed" (bought by proposal id) / "cold" (bought by parameters)
+        self.timeouts = Counter()
+
+    def observe_request(self, msg_type: str, elapsed_ns: int):
+        """Record a request round trip"""
+        histogram = self.request_latency.get(msg_type)
+        if histogram is None:
+            histogram = self.request_latency[msg_type] = LatencyHistogram()
+        histogram.observe(elapsed_ns)
+
+    def observe_order(self, armed: bool, elapsed_ns: int):
+        """Record the time from a trade signal to its buy response"""
+        self.signal_to_ack.observe(elapsed_ns)
+        self.orders["armed" if armed else "cold"] += 1
+
+    def record_timeout(self, msg_type: str):
+        """Count a request that got no response in time"""
+        self.timeouts[msg_type] += 1
+
+    def merge(self, other: "ClientMetrics"):
+        """Add another client's metrics to this one (e.g. pool-wide totals)"""
+        for msg_type, histogram in other.request_latency.items():
+            if msg_type not in self.request_latency:
+                self.request_latency[msg_type] = LatencyHistogram()
+            self.request_latency[msg_type].merge(histogram)
+        self.tick_to_callback.merge(other.tick_to_callback)
+        self.signal_to_ack.merge(other.signal_to_ack)
+        self.orders.update(other.orders)
+        self.timeouts.update(other.timeouts)
+
+    def snapshot(self) -> Dict:
+        """Point-in-time copy of every metric"""
+        return {
+            "requests": {msg_type: histogram.snapshot() for msg_type, histogram in self.request_latency.items()},
+            "tick_to_callback": self.tick_to_callback.snapshot(),
+            "signal_to_ack": self.signal_to_ack.snapshot(),
+            "orders": dict(self.orders),
+            "timeouts": dict(self.timeouts),
+            "total_timeouts": sum(self.timeouts.values()),
+        }
@@ -0,0 +1,179 @@
+"""
+Client-Side Rate Limiting for Deriv API Calls
+Token buckets per call class, granted in priority order
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+# Call classes, highest priority first
+LANES = ("buy", "settlement", "proposal", "default", "balance", "ping")
+
+# Request msg_type -> call class; anything else is "default"
+MSG_TYPE_LANES = {
+    "buy": "buy",
+    "sell": "buy",
+    "proposal_open_contract": "settlement",
+    "proposal": "proposal",
+    "balance": "balance",
+    "ping": "ping",
+}
+
+# Calls per second and burst size. "connection" caps every call on the socket;
+# the per-class buckets keep housekeeping from using up that budget.
+DEFAULT_RATE_LIMITS = {
+    "connection": {"rate": 3.0, "burst": 10},
+    "proposal": {"rate": 1.0, "burst": 5},
+    "balance": {"rate": 0.5, "burst": 2},
+    "ping": {"rate": 0.2, "burst": 1},
+    "reserve": 1,  # Connection tokens only the buy lane may spend
+}
+
+
+def lane_for(msg_type: str) -> str:
+    """Call class of a request msg_type"""
+    return MSG_TYPE_LANES.get(msg_type, "default")
+
+
+class TokenBucket:
+    """Refills continuously at rate tokens per second, up to burst"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, needed: float = 1.0) -> float:
+        """Seconds until the bucket holds the needed tokens (after a refill)"""
+        return max(0.0, (needed - self.tokens) / self.rate)
+
+
+class PriorityRateLimiter:
+    """
+    Token-bucket limiter with priority lanes
+
+    Waiting calls are granted highest lane first, so a buy never waits
+    behind queued proposals, balance refreshes or pings - and `reserve`
+    connection tokens are kept back for buys even when nothing is queued.
+    """
+
+    def __init__(self, limits: Optional[Dict] = None):
+        limits = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+
+        connection = limits["connection"]
+        self.connection = TokenBucket(connection["rate"], connection["burst"])
+        self.reserve = limits.get("reserve", 0)
+        self.lanes: Dict[str, TokenBucket] = {
+            lane: TokenBucket(limits[lane]["rate"], limits[lane]["burst"])
+            for lane in LANES if limits.get(lane)
+        }
+
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.stats = {lane: {"granted": 0, "waited": 0} for lane in LANES}
+
+    def _needed(self, lane: str) -> float:
+        """Connection tokens a lane must see before it may take one"""
+        return 1.0 if lane == "buy" else 1.0 + self.reserve
+
+    def _can_take(self, lane: str) -> bool:
+        bucket = self.lanes.get(lane)
+        return (self.connection.tokens >= self._needed(lane)
+                and (bucket is None or bucket.tokens >= 1.0))
+
+    def _holds_back(self, lane: str) -> bool:
+        """Whether this lane's queued calls keep lower lanes waiting
+
+        Calls held only by their own class bucket do not: the connection
+        has tokens for them, so lower lanes may use it meanwhile.
+        """
+        bucket = self.lanes.get(lane)
+        return (self.connection.tokens < self._needed(lane)
+                or bucket is None or bucket.tokens >= 1.0)
+
+    def _take(self, lane: str):
+        self.connection.tokens -= 1.0
+        bucket = self.lanes.get(lane)
+        if bucket is not None:
+            bucket.tokens -= 1.0
+        self.stats[lane]["granted"] += 1
+
+    def _refill(self):
+        now = time.monotonic()
+        self.connection.refill(now)
+        for bucket in self.lanes.values():
+            bucket.refill(now)
+
+    async def acquire(self, lane: str = "default"):
+        """Wait until a call in this lane may be sent"""
+        self._refill()
+        position = LANES.index(lane)
+        queued_ahead = self._waiters[lane] or any(
+            self._waiters[higher] and self._holds_back(higher) for higher in LANES[:position]
+        )
+        if not queued_ahead and self._can_take(lane):
+            self._take(lane)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(future)
+        self.stats[lane]["waited"] += 1
+        self._schedule(0.0)
+        await future
+
+    def _schedule(self, delay: float):
+        """Run _dispatch after delay, unless a wakeup is already due sooner"""
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        if self._wakeup is not None:
+            if self._wakeup.when() <= when:
+                return
+            self._wakeup.cancel()
+        self._wakeup = loop.call_at(when, self._dispatch)
+
+    def _dispatch(self):
+        """Grant queued calls in lane priority order, then sleep until the next token"""
+        self._wakeup = None
+        self._refill()
+
+        next_wait = None
+        for lane in LANES:
+            waiters = self._waiters[lane]
+            while waiters and (waiters[0].done() or self._can_take(lane)):
+                future = waiters.popleft()
+                if not future.done():  # Cancelled callers give their turn up
+                    self._take(lane)
+                    future.set_result(None)
+            if not waiters:
+                continue
+
+            bucket = self.lanes.get(lane)
+            wait = max(self.connection.wait_time(self._needed(lane)),
+                       bucket.wait_time() if bucket is not None else 0.0)
+            next_wait = wait if next_wait is None else min(next_wait, wait)
+
+            if self.connection.tokens < self._needed(lane):
+                # Lower lanes wait until this one is served - or, if its own
+                # bucket is the later limit, until the connection has refilled
+                next_wait = min(next_wait, self.connection.wait_time(self._needed(lane)))
+                break
+
+        if next_wait is not None:
+            self._schedule(next_wait)
+
+    def get_stats(self) -> Dict:
+        """Grants, waits and queue depth per lane"""
+        return {
+            lane: {**self.stats[lane], "queued": len(self._waiters[lane])}
+            for lane in LANES
+        }
@@ -0,0 +1,129 @@
+"""
+Raw Frame Recording and Replay
+Captures inbound WebSocket frames and feeds them back through DerivClient
+"""
+
+import asyncio
+import gzip
+import logging
+import time
+from datetime import datetime
+from typing import Iterator, Optional, Tuple, Union
+
+
+# Lines starting with this mark a new recording session (new monotonic clock base)
+SESSION_MARKER = "#"
+
+
+class FrameRecorder:
+    """
+    Append-only gzip recording of inbound frames
+
+    One line per frame: monotonic receive time in ns, a tab, the raw frame.
+    Each open appends a new gzip member, so a file can span many sessions.
+    """
+
+    def __init__(self, path: str, compresslevel: int = 5):
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, "at", encoding="utf-8", compresslevel=compresslevel)
+        self._file.write(f"{SESSION_MARKER} session {datetime.now().isoformat()}\n")
+
+    def write(self, received_ns: int, frame: Union[str, bytes]):
+        """Record one frame"""
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8")
+        self._file.write(f"{received_ns}\t{frame}\n")
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_recording(path: str) -> Iterator[Tuple[Optional[int], str]]:
+    """
+    Frames of a recording in order
+
+    Yields (received_ns, frame), and (None, marker line) at each session start.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as recording:
+        for line in recording:
+            line = line.rstrip("\n")
+            if line.startswith(SESSION_MARKER):
+                yield None, line
+                continue
+
+            received_ns, _, frame = line.partition("\t")
+            yield int(received_ns), frame
+
+
+class FrameReplayer:
+    """
+    Feeds a recording through a client's _process_message path
+
+    Streams are adopted from the recorded subscribe responses, so tick
+    routes registered with DerivClient.route_ticks() and the proposal and
+    balance caches behave as they did live. No socket is needed.
+    """
+
+    def __init__(self, client, path: str, speed: Optional[float] = 1.0):
+        """
+        Args:
+            client: DerivClient to replay into
+            path: Recording written by FrameRecorder
+            speed: 1.0 for recorded pacing, N for N times faster, None for no pacing
+        """
+        self.client = client
+        self.path = path
+        self.speed = speed
+        self.logger = logging.getLogger(__name__)
+        self.stats = {"frames": 0, "sessions": 0, "invalid": 0, "elapsed": 0.0}
+
+    async def replay(self) -> dict:
+        """Replay the whole recording, returning frame counts and wall time"""
+        client = self.client
+        started = time.perf_counter()
+        clock_start = None  # (recorded ns, loop time) of the session's first frame
+
+        for received_ns, frame in read_recording(self.path):
+            if received_ns is None:
+                self.stats["sessions"] += 1
+                clock_start = None
+                continue
+
+            if self.speed:
+                loop_now = asyncio.get_running_loop().time()
+                if clock_start is None:
+                    clock_start = (received_ns, loop_now)
+                due = clock_start[1] + (received_ns - clock_start[0]) / 1e9 / self.speed
+                if due > loop_now:
+                    await asyncio.sleep(due - loop_now)
+
+            client._frame_received_ns = time.monotonic_ns()
+            tick = client._decode_tick_frame(frame) if client.fast_tick_decode else None
+            if tick is not None:
+                await client._route_tick(tick)
+                self.stats["frames"] += 1
+                continue
+
+            try:
+                data = client.codec.loads(frame)
+            except ValueError:
+                self.stats["invalid"] += 1
+                continue
+
+            client._adopt_stream(data)
+            await client._process_message(data)
+            self.stats["frames"] += 1
+
+        # Let the tick consumers drain before reporting
+        await client._tick_queue.join()
+        self.stats["elapsed"] = time.perf_counter() - started
+        return dict(self.stats)
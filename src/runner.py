@@ -3,15 +3,17 @@ Main Trading Bot Runner
 Orchestrates paper/live demo trading with safety controls
 """
 
+import argparse
 import asyncio
 import logging
+import math
 import os
 import signal
 import sys
 import time
 import json
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import yaml
 from dotenv import load_dotenv
 
@@ -20,6 +22,7 @@ from strategy_even_odd import create_strategy
 from risk import RiskManager, PositionSizer
 from backtest import create_backtest_engine
 from logging_utils import setup_logging, TradeLogger, DashboardPrinter
+from event_loop import LOOP_CHOICES, run as run_event_loop
 
 
 class TradingBot:
@@ -44,6 +47,10 @@ class TradingBot:
         
         # State management
         self.mode = "paper"  # "paper" or "live_demo"
+        self.armed_stake: Optional[float] = None  # Stake both sides are pre-armed at (live demo)
+        self.arm_fraction = self.risk_manager.limits.max_stake_fraction  # Stake fraction the next signal likely asks for
+        self.arm_tolerance = self.config.get("risk", {}).get("arm_tolerance", 0.25)
+        self._arm_task: Optional[asyncio.Task] = None
         self.running = False
         self.shutdown_requested = False
         
@@ -89,19 +96,29 @@ class TradingBot:
         self.logger.info(f"Configured for {account_type.upper()} account trading")
         
         # Initialize Deriv client
-        self.deriv_client = await create_deriv_client()
+        self.deriv_client = await create_deriv_client(self.config.get("api", {}))
+        self.deriv_client.on_recovery_failed = self._on_connection_failed
         await self.deriv_client.connect()
         await self.deriv_client.authenticate()
         
-        # Get initial balance and initialize risk manager
-        balance = await self.deriv_client.get_balance()
+        # Get initial balance and keep it pushed from here on
+        balance, _ = await asyncio.gather(
+            self.deriv_client.get_balance(),
+            self.deriv_client.fetch_pip_sizes()
+        )
+        await self.deriv_client.subscribe_balance()
         self.risk_manager.initialize_session(balance)
         
         # Initialize strategy
         self.strategy = create_strategy(self.config["strategy"], paper_mode=True)
         
-        # Subscribe to tick stream
-        await self.deriv_client.subscribe_ticks(callback=self._on_tick_received)
+        # Subscribe to tick stream and live payout quotes
+        await self.deriv_client.subscribe_ticks(
+            callback=self._on_tick_received,
+            backfill=self.config.get("api", {}).get("tick_backfill", 1000),
+            history_callback=self._on_history_received
+        )
+        await self.deriv_client.subscribe_proposal()
         
         self.logger.info(f"Initialization complete - Balance: ${balance:.2f}")
     
@@ -144,39 +161,37 @@ class TradingBot:
         last_status_update = 0
         tick_count = 0
         
+        if self.mode == "live_demo":
+            self._schedule_arming()
+        
         try:
             while self.running and not self.shutdown_requested:
-                # Health checks (every 30 seconds to avoid spam)
-                if time.time() - getattr(self, '_last_health_check', 0) > 30:
-                    self._last_health_check = time.time()
-                    if not await self.deriv_client.health_check():
-                        self.logger.error("Health check failed - attempting reconnection")
-                        await self._handle_connection_loss()
-                        continue
-                
                 # Check emergency stop conditions
                 emergency_stop, stop_reason = self.risk_manager.is_emergency_stop_triggered()
                 if emergency_stop:
                     self.logger.error(f"🛑 EMERGENCY STOP: {stop_reason}")
                     break
                 
-                # Update balance
-                current_balance = await self.deriv_client.get_balance()
+                # Update balance and payout information concurrently
+                current_balance, payout_info = await asyncio.gather(
+                    self.deriv_client.get_balance(),
+                    self.deriv_client.get_payout_info()
+                )
                 self.risk_manager.update_balance(current_balance)
+                if self.mode == "live_demo":
+                    self._schedule_arming()
                 
                 # Check if trading is allowed
                 trade_allowed, risk_reason = self.risk_manager.check_trade_allowed()
                 
                 if trade_allowed:
-                    # Get payout information
-                    payout_info = await self.deriv_client.get_payout_info()
-                    
                     if payout_info:
                         # Get strategy signal
                         signal = self.strategy.analyze_signal(current_balance, payout_info["payout_ratio"])
+                        signal_ns = time.monotonic_ns()
                         
                         if signal.side != "SKIP":
-                            await self._execute_trade_decision(signal, payout_info)
+                            await self._execute_trade_decision(signal, payout_info, signal_ns)
                 
                 # Status update every minute
                 if time.time() - last_status_update > 60:
@@ -184,7 +199,8 @@ class TradingBot:
                         self.risk_manager.get_risk_status(),
                         self.strategy.get_statistics(),
                         self.mode,
-                        self.session_stats
+                        self.session_stats,
+                        client_metrics=self.deriv_client.get_metrics()
                     )
                     last_status_update = time.time()
                 
@@ -197,7 +213,7 @@ class TradingBot:
         finally:
             await self._shutdown()
     
-    async def _execute_trade_decision(self, signal, payout_info: Dict):
+    async def _execute_trade_decision(self, signal, payout_info: Dict, signal_ns: Optional[int] = None):
         """Execute trade decision based on current mode"""
         stake = self.risk_manager.calculate_position_size(signal.stake_fraction)
         
@@ -214,17 +230,17 @@ class TradingBot:
                     self.session_stats["losses"] += 1
                 
         elif self.mode == "live_demo":
-            # Real demo trading
-            result = await self.deriv_client.place_odd_even_trade(signal.side, stake)
+            # Real demo trading - at the armed stake when the sized one is just above it
+            stake = self._live_stake(stake)
+            result = await self.deriv_client.place_odd_even_trade(signal.side, stake, signal_ns=signal_ns)
             
             if result["success"]:
+                # Later balance updates arm at the stake this signal's fraction gives
+                self.arm_fraction = signal.stake_fraction
                 self.logger.info(f"🎯 LIVE TRADE: {signal.side} ${stake:.2f} - {signal.reason}")
                 
-                # Wait for contract completion (simplified)
-                await asyncio.sleep(2)  # Wait for tick
-                
-                # Get contract result
-                contract_result = await self.deriv_client.get_contract_result(result["contract_id"])
+                # Wait for the contract to settle
+                contract_result = await self.deriv_client.wait_for_settlement(result["contract_id"])
                 
                 if contract_result:
                     trade_data = {
@@ -243,28 +259,53 @@ class TradingBot:
                     else:
                         self.session_stats["losses"] += 1
     
+    def _covers(self, stake: float) -> bool:
+        """Whether the armed stake may stand in for stake - never above it, at most arm_tolerance below"""
+        armed = self.armed_stake
+        return armed is not None and armed <= stake <= round(armed * (1 + self.arm_tolerance), 2)
+    
+    def _live_stake(self, stake: float) -> float:
+        """Snap a sized stake down to the armed stake so the buy goes by proposal id"""
+        return self.armed_stake if self._covers(stake) else stake
+    
+    def _schedule_arming(self):
+        """Re-arm in the background when the balance moved the likely stake out of the armed bucket"""
+        if self._arm_task is not None and not self._arm_task.done():
+            return
+        
+        stake = self.risk_manager.calculate_position_size(self.arm_fraction)
+        if self._covers(stake):
+            return
+        
+        # Centre the bucket on the likely stake so small moves either way stay armed
+        armed = max(0.35, round(stake / math.sqrt(1 + self.arm_tolerance), 2))  # Deriv minimum
+        self._arm_task = asyncio.create_task(self._arm_orders(armed))
+    
+    async def _arm_orders(self, stake: float):
+        """Keep a proposal id ready on both sides at the stake the next signal is likely to use"""
+        sides = ("ODD", "EVEN")
+        try:
+            if self.armed_stake is not None:
+                # A stream the payout quote also uses stays open
+                await asyncio.gather(*(self.deriv_client.disarm_order(side, self.armed_stake) for side in sides))
+            
+            self.armed_stake = stake
+            await asyncio.gather(*(self.deriv_client.arm_order(side, stake) for side in sides))
+            self.logger.info(f"Armed ODD/EVEN orders at ${stake:.2f}")
+        except Exception as e:
+            self.logger.warning(f"Arming orders at ${stake:.2f} failed: {e}")
+    
     async def _on_tick_received(self, tick: Dict):
         """Handle incoming tick data"""
         self.strategy.add_tick(tick)
     
+    async def _on_history_received(self, ticks: List[Dict]):
+        """Warm the strategy up from a ticks_history backfill"""
+        self.strategy.add_ticks(ticks)
     
-    async def _handle_connection_loss(self):
-        """Handle WebSocket connection loss with exponential backoff"""
-        self.logger.warning("Handling connection loss")
-        
-        for attempt in range(5):
-            try:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                await self.deriv_client.connect()
-                await self.deriv_client.authenticate()
-                await self.deriv_client.subscribe_ticks(callback=self._on_tick_received)
-                self.logger.info("Connection restored")
-                return
-                
-            except Exception as e:
-                self.logger.error(f"Reconnection attempt {attempt + 1} failed: {e}")
-        
-        self.logger.error("Failed to restore connection - stopping bot")
+    async def _on_connection_failed(self, client, reason: str):
+        """Stop trading once the client gives up restoring its connection"""
+        self.logger.error(f"Failed to restore connection ({reason}) - stopping bot")
         self.running = False
     
     async def _shutdown(self):
@@ -272,6 +313,9 @@ class TradingBot:
         self.logger.info("🛑 Initiating graceful shutdown")
         self.running = False
         
+        if self._arm_task is not None:
+            self._arm_task.cancel()
+        
         if self.deriv_client:
             await self.deriv_client.disconnect()
         
@@ -338,4 +382,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Deriv Odd/Even Trading Bot runner")
+    parser.add_argument("--loop", choices=LOOP_CHOICES, default="asyncio",
+                        help="Event loop: 'uvloop' if installed, else falls back to asyncio")
+    run_event_loop(main(), parser.parse_args().loop)
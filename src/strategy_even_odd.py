@@ -5,11 +5,30 @@ Implements statistical analysis with strict edge validation
 
 import logging
 import numpy as np
-from collections import deque
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import time
 
+from digit_stats import DigitDistribution, DigitWindow
+from tick_store import TickStore
+from window_stats import EwmaVariance, RollingWindow, rolling_moments
+
+
+# Ticks behind the historical win rate in the expected value check
+EXPECTED_VALUE_WINDOW = 200
+
+# Quote mean/variance sources for the volatility filter
+VOLATILITY_ESTIMATORS = ("welford", "ewma")
+
+# Check that decided each SignalBatch position, in analyze_signal() order
+STAGE_TRADE = 0
+STAGE_COOLDOWN = 1
+STAGE_WARMUP = 2
+STAGE_NO_EDGE = 3
+STAGE_VOLATILITY = 4
+STAGE_NO_BIAS = 5
+STAGE_LOW_CONFIDENCE = 6
+
 
 @dataclass
 class StrategySignal:
@@ -20,6 +39,59 @@ class StrategySignal:
     reason: str  # Decision rationale
 
 
+@dataclass
+class SignalBatch:
+    """analyze_signal() outputs for every position of a tick stream, as arrays"""
+    side: np.ndarray  # "ODD", "EVEN", or "SKIP"
+    confidence: np.ndarray
+    stake_fraction: np.ndarray
+    stage: np.ndarray  # STAGE_* check that decided the position
+    odd_count: np.ndarray  # Odd ticks in the lookback window
+    volatility: np.ndarray  # Coefficient of variation, NaN while too few quotes
+    expected_value: np.ndarray
+    combined_confidence: np.ndarray  # Confidence checked against the threshold
+    lookback_window: int
+    
+    def __len__(self) -> int:
+        return len(self.side)
+    
+    def reason(self, index: int) -> str:
+        """The reason analyze_signal() gives at a position"""
+        stage = self.stage[index]
+        if stage == STAGE_COOLDOWN:
+            return "Cooldown period active"
+        if stage == STAGE_WARMUP:
+            return f"Insufficient data: {index + 1}/{self.lookback_window}"
+        if stage == STAGE_NO_EDGE:
+            return f"No positive edge: EV={self.expected_value[index]:.4f}"
+        if stage == STAGE_LOW_CONFIDENCE:
+            return f"Low confidence: {self.combined_confidence[index]:.3f}"
+        
+        volatility = self.volatility[index]
+        if np.isnan(volatility):
+            volatility_reason = "Insufficient data for volatility"
+        elif stage == STAGE_VOLATILITY:
+            return f"High volatility: {volatility:.4f}"
+        else:
+            volatility_reason = f"Normal volatility: {volatility:.4f}"
+        
+        odd_count, total = int(self.odd_count[index]), self.lookback_window
+        odd_freq = odd_count / total
+        if stage == STAGE_NO_BIAS:
+            return f"No significant bias: {abs(odd_freq - 0.5):.3f}"
+        if odd_freq > 0.5:
+            return f"Mean reversion: odd_freq={odd_freq:.3f} | {volatility_reason}"
+        return f"Mean reversion: even_freq={(total - odd_count) / total:.3f} | {volatility_reason}"
+    
+    def signal(self, index: int) -> StrategySignal:
+        return StrategySignal(
+            str(self.side[index]),
+            float(self.confidence[index]),
+            float(self.stake_fraction[index]),
+            self.reason(index)
+        )
+
+
 class OddEvenStrategy:
     """
     Conservative strategy for Odd/Even binary options
@@ -38,9 +110,21 @@ class OddEvenStrategy:
         self.cooldown_seconds = config.get("cooldown_between_trades", 30)
         
         # Data storage
-        self.tick_history = deque(maxlen=1000)  # Store recent ticks
+        self.tick_history = TickStore(config.get("history_size", 1000))  # Recent ticks as NumPy columns
         self.last_trade_time = 0
         
+        # Incremental digit histograms and quote moments - signals never rescan the history
+        self.digits = DigitDistribution((self.lookback_window, EXPECTED_VALUE_WINDOW))
+        self.quote_window = RollingWindow(self.lookback_window)
+        
+        # Volatility filter input: the lookback window's Welford moments, or an EWMA
+        self.volatility_estimator = config.get("volatility_estimator", "welford")
+        if self.volatility_estimator not in VOLATILITY_ESTIMATORS:
+            raise ValueError(f"Unknown volatility estimator: {self.volatility_estimator}")
+        self.ewma = None
+        if self.volatility_estimator == "ewma":
+            self.ewma = EwmaVariance(config.get("volatility_span", self.lookback_window))
+        
         # Statistics tracking
         self.odd_count = 0
         self.even_count = 0
@@ -50,15 +134,47 @@ class OddEvenStrategy:
         """Add new tick to analysis window"""
         if "last_digit" not in tick:
             return
-            
-        self.tick_history.append(tick)
+        
+        self.add_quote(tick["quote"], tick["last_digit"], tick.get("epoch", 0))
+    
+    def add_quote(self, quote: float, last_digit: int, epoch: int = 0):
+        """add_tick() from plain values, e.g. columns read out of a TickStore"""
+        self.tick_history.append(epoch, quote, last_digit)
         self.total_ticks += 1
         
-        if tick["last_digit"] % 2 == 1:
+        odd = last_digit % 2
+        self.digits.push(last_digit)
+        self.quote_window.push(quote)
+        if self.ewma is not None:
+            self.ewma.push(quote)
+        
+        if odd:
             self.odd_count += 1
         else:
             self.even_count += 1
     
+    def add_ticks(self, ticks: Union[List[Dict], TickStore]):
+        """Add a batch of ticks (e.g. a ticks_history backfill or a TickStore), oldest first"""
+        if not isinstance(ticks, TickStore):
+            batch = [tick for tick in ticks if "last_digit" in tick]
+            ticks = TickStore(max(len(batch), 1))
+            ticks.extend_ticks(batch)
+        
+        quotes, digits = ticks.quotes(), ticks.digits()
+        odds = digits & 1
+        odd = int(odds.sum())
+        
+        self.digits.extend(digits)
+        size = self.lookback_window
+        self.quote_window.extend(quotes[-size:].tolist())
+        if self.ewma is not None:
+            self.ewma.extend(quotes.tolist())
+        
+        self.tick_history.extend(ticks.epochs(), quotes, digits)
+        self.total_ticks += len(ticks)
+        self.odd_count += odd
+        self.even_count += len(ticks) - odd
+    
     def analyze_signal(self, current_balance: float, payout_ratio: float) -> StrategySignal:
         """
         Analyze current market state and generate trading signal
@@ -75,22 +191,20 @@ class OddEvenStrategy:
             return StrategySignal("SKIP", 0.0, 0.0, "Cooldown period active")
         
         # Need minimum data for analysis
-        if len(self.tick_history) < self.lookback_window:
-            return StrategySignal("SKIP", 0.0, 0.0, f"Insufficient data: {len(self.tick_history)}/{self.lookback_window}")
+        recent = self.digits[self.lookback_window]
+        if not recent.full:
+            return StrategySignal("SKIP", 0.0, 0.0, f"Insufficient data: {len(recent)}/{self.lookback_window}")
         
         # Calculate expected value first - refuse if not positive
         expected_value = self._calculate_expected_value(payout_ratio)
         if expected_value <= 0:
             return StrategySignal("SKIP", 0.0, 0.0, f"No positive edge: EV={expected_value:.4f}")
         
-        # Analyze recent tick patterns
-        recent_ticks = list(self.tick_history)[-self.lookback_window:]
-        
         # Frequency bias analysis
-        frequency_signal = self._analyze_frequency_bias(recent_ticks)
+        frequency_signal = self._analyze_frequency_bias(recent)
         
         # Volatility filter
-        volatility_signal = self._analyze_volatility(recent_ticks)
+        volatility_signal = self._analyze_volatility(self.quote_window if self.ewma is None else self.ewma)
         
         # Time-based filter (optional - avoid high-frequency periods)
         time_signal = self._analyze_time_patterns()
@@ -112,6 +226,112 @@ class OddEvenStrategy:
             final_signal.reason
         )
     
+    def analyze_signal_batch(self, digits, quotes, payout_ratio: float) -> SignalBatch:
+        """
+        Run analyze_signal() at every position of a tick stream, vectorized
+        
+        Position i is the signal analyze_signal() gives once ticks 0..i have
+        gone through add_quote() on a strategy with no history - this
+        strategy's own ticks are neither read nor changed, and the cooldown
+        is checked once, now. Window counts come from cumulative sums and
+        quote moments from rolling_moments(); positions whose volatility is
+        within rounding of the threshold are replayed through RollingWindow,
+        so sides, confidences and stake fractions are bit-identical to the
+        per-tick path.
+        
+        Args:
+            digits: Last digits, oldest first
+            quotes: Quotes of the same ticks
+            payout_ratio: Payout ratio for odd/even
+            
+        Returns:
+            SignalBatch with one position per tick
+        """
+        digits = np.asarray(digits, dtype=np.int64)
+        quotes = np.asarray(quotes, dtype=np.float64)
+        if len(digits) != len(quotes):
+            raise ValueError("digits and quotes must have the same length")
+        
+        count = len(digits)
+        ticks = np.arange(1, count + 1)  # total_ticks after each position
+        odd_totals = np.concatenate(([0], np.cumsum(digits & 1)))
+        
+        # Expected value from the historical win rate, as _calculate_expected_value()
+        filled = np.minimum(ticks, EXPECTED_VALUE_WINDOW)
+        odd_wins = odd_totals[1:] - odd_totals[ticks - filled]
+        best_win_rate = np.maximum(odd_wins / filled, (filled - odd_wins) / filled)
+        edge = (ticks >= 100) & (filled >= 50) & (best_win_rate > 0.52)
+        expected_value = np.where(edge, best_win_rate * payout_ratio - 1.0, payout_ratio - 1.0)
+        
+        # Frequency bias over the lookback window, as _analyze_frequency_bias()
+        odd_count = odd_totals[1:] - odd_totals[np.maximum(ticks - self.lookback_window, 0)]
+        odd_freq = odd_count / self.lookback_window
+        bias_strength = np.abs(odd_freq - 0.5)
+        no_bias = bias_strength < self.frequency_bias_threshold
+        
+        volatility, high_volatility = self._batch_volatility(quotes)
+        
+        # _combine_signals() then the confidence threshold
+        combined = np.where(high_volatility | no_bias, 0.0, np.minimum(0.8, 0.5 + bias_strength) * 0.9)
+        stage = np.full(count, STAGE_TRADE, dtype=np.uint8)
+        stage[no_bias] = STAGE_NO_BIAS
+        stage[high_volatility] = STAGE_VOLATILITY
+        stage[combined < self.min_confidence] = STAGE_LOW_CONFIDENCE
+        stage[expected_value <= 0] = STAGE_NO_EDGE
+        stage[ticks < self.lookback_window] = STAGE_WARMUP
+        if time.time() - self.last_trade_time < self.cooldown_seconds:
+            stage[:] = STAGE_COOLDOWN
+        
+        trade = stage == STAGE_TRADE
+        confidence = np.where(trade, combined, 0.0)
+        # _calculate_position_size()
+        stake_fraction = np.minimum(0.01 * np.minimum(2.0, confidence / 0.5), 0.02)
+        
+        return SignalBatch(
+            side=np.where(trade, np.where(odd_freq > 0.5, "EVEN", "ODD"), "SKIP"),
+            confidence=confidence,
+            stake_fraction=stake_fraction,
+            stage=stage,
+            odd_count=odd_count,
+            volatility=volatility,
+            expected_value=expected_value,
+            combined_confidence=combined,
+            lookback_window=self.lookback_window
+        )
+    
+    def _batch_volatility(self, quotes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Volatility filter value and skip decision at every position of a batch"""
+        count = len(quotes)
+        volatility = np.full(count, np.nan)
+        
+        if self.ewma is not None:
+            # A recurrence - run it, with the same arithmetic as the live estimator
+            means, variances = EwmaVariance(self.ewma.span).trace(quotes.tolist())
+            ready = slice(min(4, count), count)
+            volatility[ready] = np.divide(
+                np.sqrt(variances[ready]), means[ready],
+                out=np.zeros(len(means[ready])), where=means[ready] > 0
+            )
+            return volatility, volatility > self.volatility_threshold
+        
+        size = self.lookback_window
+        if size < 5 or count < size:
+            return volatility, np.zeros(count, dtype=bool)
+        
+        mean, variance, error = rolling_moments(quotes, size)
+        positive = mean > 0
+        estimate = np.divide(np.sqrt(variance), mean, out=np.zeros_like(mean), where=positive)
+        
+        # Rounding can only matter next to the threshold: replay those positions exactly
+        margin = np.divide(np.sqrt(error), mean, out=np.full_like(mean, np.inf), where=positive)
+        margin += 8 * np.finfo(np.float64).eps * (estimate + abs(self.volatility_threshold))
+        for position in np.flatnonzero(np.abs(estimate - self.volatility_threshold) <= margin):
+            window = RollingWindow.replay(quotes[:position + size], size)
+            estimate[position] = self._coefficient_of_variation(window)
+        
+        volatility[size - 1:] = estimate
+        return volatility, volatility > self.volatility_threshold
+    
     def _calculate_expected_value(self, payout_ratio: float) -> float:
         """
         Calculate expected value based on historical performance
@@ -122,15 +342,14 @@ class OddEvenStrategy:
             return payout_ratio - 1.0
         
         # Calculate historical win rate (very conservative)
-        recent_window = min(200, len(self.tick_history))
+        window = self.digits[EXPECTED_VALUE_WINDOW]
+        recent_window = len(window)
         if recent_window < 50:
             return payout_ratio - 1.0
-            
-        recent_ticks = list(self.tick_history)[-recent_window:]
         
         # Test both odd and even strategies
-        odd_wins = sum(1 for tick in recent_ticks if tick["last_digit"] % 2 == 1)
-        even_wins = recent_window - odd_wins
+        odd_wins = window.odd_count
+        even_wins = window.even_count
         
         odd_win_rate = odd_wins / recent_window
         even_win_rate = even_wins / recent_window
@@ -146,17 +365,17 @@ class OddEvenStrategy:
             
         return expected_value
     
-    def _analyze_frequency_bias(self, recent_ticks: List[Dict]) -> StrategySignal:
+    def _analyze_frequency_bias(self, recent: DigitWindow) -> StrategySignal:
         """Analyze frequency bias in recent ticks"""
-        if not recent_ticks:
+        if not len(recent):
             return StrategySignal("SKIP", 0.0, 0.0, "No recent ticks")
         
         # Count odd/even in recent window
-        odd_count = sum(1 for tick in recent_ticks if tick["last_digit"] % 2 == 1)
-        even_count = len(recent_ticks) - odd_count
+        odd_count = recent.odd_count
+        even_count = recent.even_count
         
         # Calculate bias from expected 50/50
-        total = len(recent_ticks)
+        total = len(recent)
         odd_freq = odd_count / total
         even_freq = even_count / total
         
@@ -176,24 +395,24 @@ class OddEvenStrategy:
             confidence = min(0.8, 0.5 + bias_strength)
             return StrategySignal("ODD", confidence, 0.0, f"Mean reversion: even_freq={even_freq:.3f}")
     
-    def _analyze_volatility(self, recent_ticks: List[Dict]) -> Dict:
+    def _analyze_volatility(self, moments: Union[RollingWindow, EwmaVariance]) -> Dict:
         """Analyze price volatility - skip during high volatility"""
-        if len(recent_ticks) < 5:
+        if len(moments) < 5:
             return {"skip": False, "reason": "Insufficient data for volatility"}
         
-        prices = [tick["quote"] for tick in recent_ticks]
-        
-        # Calculate rolling volatility (coefficient of variation)
-        if len(prices) > 1:
-            volatility = np.std(prices) / np.mean(prices) if np.mean(prices) > 0 else 0
-        else:
-            volatility = 0
+        # Streaming volatility (coefficient of variation)
+        volatility = self._coefficient_of_variation(moments)
         
         if volatility > self.volatility_threshold:
             return {"skip": True, "reason": f"High volatility: {volatility:.4f}"}
         
         return {"skip": False, "reason": f"Normal volatility: {volatility:.4f}"}
     
+    @staticmethod
+    def _coefficient_of_variation(moments: Union[RollingWindow, EwmaVariance]) -> float:
+        mean = moments.mean
+        return moments.std / mean if mean > 0 else 0
+    
     def _analyze_time_patterns(self) -> Dict:
         """Analyze time-based patterns (placeholder for future enhancement)"""
         # For now, just check if we're in a reasonable trading window
@@ -260,6 +479,8 @@ class OddEvenStrategy:
             "odd_frequency": self.odd_count / self.total_ticks,
             "even_frequency": self.even_count / self.total_ticks,
             "recent_window_size": len(self.tick_history),
+            "digit_chi_square": self.digits[EXPECTED_VALUE_WINDOW].chi_square,
+            "digit_p_value": self.digits[EXPECTED_VALUE_WINDOW].p_value,
             "lookback_window": self.lookback_window
         }
 
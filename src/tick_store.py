@@ -0,0 +1,129 @@
+"""
+Columnar Tick Storage
+Fixed-capacity NumPy ring buffer shared by the strategy and the backtester
+"""
+
+import numpy as np
+from typing import Iterable, Iterator, Optional
+
+from ticks import TickRecord
+
+
+class TickStore:
+    """
+    Ring buffer of ticks as int64 epochs, float64 quotes and uint8 last digits
+
+    Every tick is written twice, `capacity` slots apart, so the latest n
+    ticks are always one contiguous slice: epochs(), quotes() and digits()
+    return zero-copy read-only views, oldest first, for NumPy code to use
+    directly. Indexing and iteration give TickRecords for code that reads
+    ticks like dictionaries.
+    """
+
+    def __init__(self, capacity: int = 1000, symbol: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+
+        self.capacity = capacity
+        self.symbol = symbol
+        self._epochs = np.zeros(2 * capacity, dtype=np.int64)
+        self._quotes = np.zeros(2 * capacity, dtype=np.float64)
+        self._digits = np.zeros(2 * capacity, dtype=np.uint8)
+        # Single-item writes through memoryviews skip NumPy's scalar conversion
+        self._epoch_slots = memoryview(self._epochs)
+        self._quote_slots = memoryview(self._quotes)
+        self._digit_slots = memoryview(self._digits)
+        self._next = 0  # Slot the next tick is written to
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.capacity
+
+    def append(self, epoch: int, quote: float, digit: int):
+        """Add one tick, overwriting the oldest once full"""
+        slot, mirror = self._next, self._next + self.capacity
+        self._epoch_slots[slot] = self._epoch_slots[mirror] = int(epoch)
+        self._quote_slots[slot] = self._quote_slots[mirror] = float(quote)
+        self._digit_slots[slot] = self._digit_slots[mirror] = int(digit)
+
+        self._next = (slot + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def append_tick(self, tick):
+        """Add a tick dictionary or TickRecord"""
+        self.append(tick.get("epoch", 0), tick["quote"], tick["last_digit"])
+
+    def extend(self, epochs, quotes, digits):
+        """Add equal-length columns of ticks, oldest first"""
+        epochs, quotes, digits = np.asarray(epochs), np.asarray(quotes), np.asarray(digits)
+        count = len(quotes)
+        if count == 0:
+            return
+        if count > self.capacity:
+            epochs, quotes, digits = epochs[-self.capacity:], quotes[-self.capacity:], digits[-self.capacity:]
+            count = self.capacity
+
+        slots = (self._next + np.arange(count)) % self.capacity
+        for column, values in ((self._epochs, epochs), (self._quotes, quotes), (self._digits, digits)):
+            column[slots] = values
+            column[slots + self.capacity] = values
+
+        self._next = (self._next + count) % self.capacity
+        self._count = min(self._count + count, self.capacity)
+
+    def extend_ticks(self, ticks: Iterable):
+        """Add tick dictionaries or TickRecords, oldest first"""
+        ticks = list(ticks)
+        self.extend(
+            [tick.get("epoch", 0) for tick in ticks],
+            [tick["quote"] for tick in ticks],
+            [tick["last_digit"] for tick in ticks]
+        )
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def _window(self, column: np.ndarray, count: Optional[int]) -> np.ndarray:
+        count = self._count if count is None else min(count, self._count)
+        end = self._next + self.capacity
+        view = column[end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def epochs(self, count: Optional[int] = None) -> np.ndarray:
+        """Latest count epochs (all held ticks by default) - a view, not a copy"""
+        return self._window(self._epochs, count)
+
+    def quotes(self, count: Optional[int] = None) -> np.ndarray:
+        """Latest count quotes - a view, not a copy"""
+        return self._window(self._quotes, count)
+
+    def digits(self, count: Optional[int] = None) -> np.ndarray:
+        """Latest count last digits - a view, not a copy"""
+        return self._window(self._digits, count)
+
+    def __getitem__(self, index: int) -> TickRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("TickStore index out of range")
+
+        position = self._next + self.capacity - self._count + index
+        return TickRecord(
+            self.symbol,
+            int(self._epochs[position]),
+            float(self._quotes[position]),
+            None,
+            int(self._digits[position])
+        )
+
+    def __iter__(self) -> Iterator[TickRecord]:
+        columns = (self.epochs().tolist(), self.quotes().tolist(), self.digits().tolist())
+        for epoch, quote, digit in zip(*columns):
+            yield TickRecord(self.symbol, epoch, quote, None, digit)
@@ -0,0 +1,129 @@
+"""
+Tick Decoding for Digit Contracts
+Computes last digits from pip_size with scaled-integer arithmetic
+"""
+
+import math
+import re
+from typing import Any, Dict, Optional, Tuple
+
+
+# 10 ** pip_size for every pip size Deriv quotes in
+_PIP_SCALES = tuple(10 ** places for places in range(16))
+
+# The "tick" object of a tick frame, fields in the order Deriv serializes them.
+# tick.id is the stream's subscription id.
+_TICK_OBJECT = re.compile(
+    r'"tick":\{"ask":[^,]*,"bid":[^,]*,"epoch":(\d+),"id":"([^"]+)","pip_size":(\d+),'
+    r'"quote":([-+.\deE]+),"symbol":"([^"]+)"\}'
+)
+
+
+def last_digit(quote: float, pip_size: int) -> int:
+    """
+    Last quoted digit of a price
+
+    Deriv quotes every price to pip_size decimals but JSON drops trailing
+    zeros, so 1234.50 arrives as 1234.5 - scaling by the pip restores them.
+    """
+    return round(quote * _PIP_SCALES[pip_size]) % 10
+
+
+def pip_size_from_pip(pip: float) -> int:
+    """Decimal places for an active_symbols pip value (0.01 -> 2)"""
+    return max(0, round(-math.log10(float(pip))))
+
+
+class TickRecord:
+    """
+    Compact decoded tick
+
+    Also readable like the tick dictionaries the strategy and backtester use
+    (tick["last_digit"], "last_digit" in tick).
+    """
+
+    __slots__ = ("symbol", "epoch", "quote", "pip_size", "last_digit", "received_ns")
+
+    def __init__(self, symbol: str, epoch: int, quote: float, pip_size: Optional[int],
+                 last_digit: Optional[int], received_ns: int = 0):
+        self.symbol = symbol
+        self.epoch = epoch
+        self.quote = quote
+        self.pip_size = pip_size
+        self.last_digit = last_digit
+        self.received_ns = received_ns  # time.monotonic_ns() when the frame arrived, 0 if unknown
+
+    @property
+    def is_odd(self) -> bool:
+        return self.last_digit % 2 == 1
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, None) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __repr__(self) -> str:
+        return (f"TickRecord(symbol={self.symbol!r}, epoch={self.epoch}, quote={self.quote}, "
+                f"pip_size={self.pip_size}, last_digit={self.last_digit})")
+
+
+def decode_tick(tick_data: Dict, pip_size: Optional[int] = None, received_ns: int = 0) -> TickRecord:
+    """
+    Decode a Deriv tick payload
+
+    Args:
+        tick_data: The "tick" object of a tick message
+        pip_size: Fallback when the payload carries no pip_size (from active_symbols)
+        received_ns: Monotonic arrival time of the frame, for latency metrics
+
+    Returns:
+        TickRecord, with last_digit None when the pip size is unknown
+    """
+    quote = float(tick_data.get("quote", 0))
+    pip_size = tick_data.get("pip_size", pip_size)
+    if pip_size is not None:
+        pip_size = int(pip_size)
+
+    return TickRecord(
+        tick_data.get("symbol"),
+        int(tick_data.get("epoch", 0)),
+        quote,
+        pip_size,
+        None if pip_size is None else round(quote * _PIP_SCALES[pip_size]) % 10,
+        received_ns
+    )
+
+
+def decode_tick_frame(frame: str, received_ns: int = 0) -> Optional[Tuple[str, TickRecord]]:
+    """
+    Decode a raw tick frame without parsing the rest of the JSON
+
+    Only symbol, epoch, quote and pip_size are read - echo_req and the
+    other fields are never built into dicts. Anything that does not look
+    like a plain tick push returns None and should be decoded in full.
+
+    Returns:
+        (subscription id, TickRecord), or None
+    """
+    start = frame.find('"tick":{') if isinstance(frame, str) else -1
+    if start < 0:
+        return None
+
+    match = _TICK_OBJECT.match(frame, start)
+    if match is None:
+        return None
+
+    epoch, subscription_id, pip_size, quote, symbol = match.groups()
+    quote = float(quote)
+    pip_size = int(pip_size)
+    return subscription_id, TickRecord(
+        symbol, int(epoch), quote, pip_size, round(quote * _PIP_SCALES[pip_size]) % 10, received_ns
+    )
@@ -0,0 +1,230 @@
+"""
+Rolling Window Statistics
+Streaming quote mean and variance over a fixed window or exponentially weighted
+"""
+
+import math
+from collections import deque
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Window end positions per cumulative-sum block in rolling_moments()
+MOMENT_BLOCK = 256
+
+_EPSILON = np.finfo(np.float64).eps
+
+
+class RollingWindow:
+    """
+    Welford quote mean / sum of squared deviations over the last `size` ticks
+
+    Each quote entering (and the one it pushes out) updates the mean and M2
+    in O(1) with Welford's add/replace steps, which never
+    subtract two large sums, so the variance stays accurate at any quote
+    level. The window is still recomputed exactly once every `size`
+    evictions, so rounding cannot accumulate over a long session.
+    """
+
+    __slots__ = ("size", "_quotes", "_mean", "_m2", "_evictions")
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Window size must be positive")
+
+        self.size = size
+        self._quotes = deque()
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    @property
+    def full(self) -> bool:
+        return len(self._quotes) == self.size
+
+    def push(self, quote: float):
+        """Add a quote, dropping the oldest once full"""
+        mean = self._mean
+
+        if len(self._quotes) == self.size:
+            # Replace the oldest quote: the count stays at size
+            old_quote = self._quotes.popleft()
+            delta = quote - old_quote
+            self._mean = mean + delta / self.size
+            self._m2 += delta * (quote - self._mean + old_quote - mean)
+            self._evictions += 1
+        else:
+            delta = quote - mean
+            self._mean = mean + delta / (len(self._quotes) + 1)
+            self._m2 += delta * (quote - self._mean)
+
+        self._quotes.append(quote)
+
+        if self._evictions >= self.size:
+            self._rebuild()
+
+    def extend(self, quotes: Iterable[float]):
+        """Add quotes oldest first - only the last `size` are kept"""
+        quotes = list(quotes)
+        if len(quotes) < self.size:
+            for quote in quotes:
+                self.push(quote)
+            return
+
+        self._quotes = deque(quotes[-self.size:])
+        self._rebuild()
+
+    @classmethod
+    def replay(cls, quotes: Sequence[float], size: int) -> "RollingWindow":
+        """
+        The window a new RollingWindow holds after push() of every quote, oldest first
+
+        Bit-identical to pushing them all, but only replays from the last
+        periodic rebuild, so it costs at most 2 * size pushes.
+        """
+        window = cls(size)
+        count = len(quotes)
+        # Rebuilds run after push number 2 * size, 3 * size, ...
+        rebuilt = count // size * size if count >= 2 * size else 0
+        if rebuilt:
+            window.extend(float(quote) for quote in quotes[rebuilt - size:rebuilt])
+        for quote in quotes[rebuilt:count]:
+            window.push(float(quote))
+        return window
+
+    def _rebuild(self):
+        """Recompute the mean and M2 exactly from the window"""
+        count = len(self._quotes)
+        self._mean = math.fsum(self._quotes) / count if count else 0.0
+        self._m2 = math.fsum((quote - self._mean) ** 2 for quote in self._quotes)
+        self._evictions = 0
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self._quotes else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the quotes (as numpy's default np.var)"""
+        count = len(self._quotes)
+        return max(0.0, self._m2 / count) if count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class EwmaVariance:
+    """
+    Exponentially weighted mean and variance of a quote stream
+
+    Uses the incremental form mean += a * delta, var = (1 - a) * (var + a * delta^2)
+    with a = 2 / (span + 1), so each quote costs O(1) with no window kept and
+    recent quotes weigh more than in a fixed window. Matches pandas
+    ewm(span=span, adjust=False).mean() and .var(bias=True).
+    """
+
+    __slots__ = ("span", "alpha", "count", "mean", "variance")
+
+    def __init__(self, span: float):
+        if span < 1:
+            raise ValueError("Span must be at least 1")
+
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, quote: float):
+        if self.count == 0:
+            self.mean = quote
+        else:
+            delta = quote - self.mean
+            self.mean += self.alpha * delta
+            self.variance = (1.0 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        self.count += 1
+
+    def extend(self, quotes: Iterable[float]):
+        """Add quotes oldest first"""
+        for quote in quotes:
+            self.push(quote)
+
+    def trace(self, quotes: Iterable[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Add quotes oldest first, returning the mean and variance after each one"""
+        quotes = list(quotes)
+        means, variances = [], []
+        if quotes and self.count == 0:
+            self.push(quotes[0])
+            means.append(self.mean)
+            variances.append(self.variance)
+            quotes = quotes[1:]
+
+        # Same arithmetic as push(), on locals
+        alpha, keep = self.alpha, 1.0 - self.alpha
+        mean, variance = self.mean, self.variance
+        add_mean, add_variance = means.append, variances.append
+        for quote in quotes:
+            delta = quote - mean
+            mean += alpha * delta
+            variance = keep * (variance + alpha * delta * delta)
+            add_mean(mean)
+            add_variance(variance)
+
+        self.count += len(quotes)
+        self.mean, self.variance = mean, variance
+        return np.array(means, dtype=np.float64), np.array(variances, dtype=np.float64)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+def rolling_moments(quotes: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mean and population variance of every full `size`-quote window, vectorized
+
+    Returns (mean, variance, error) for the windows ending at positions
+    size - 1 onwards. Sums come from cumulative sums restarted every
+    MOMENT_BLOCK positions, relative to the block's first quote, so
+    rounding stays local. `error` bounds how far each variance may be from
+    exact arithmetic, for callers that have to agree with RollingWindow
+    at a threshold.
+    """
+    quotes = np.asarray(quotes, dtype=np.float64)
+    windows = len(quotes) - size + 1
+    if windows <= 0:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty
+
+    blocks = -(-windows // MOMENT_BLOCK)
+    span = MOMENT_BLOCK + size - 1
+    padded = np.pad(quotes, (0, blocks * MOMENT_BLOCK - windows), mode="edge")
+    segments = sliding_window_view(padded, span)[::MOMENT_BLOCK]
+
+    anchors = segments[:, :1]
+    shifted = segments - anchors
+    sums = np.zeros((blocks, span + 1))
+    square_sums = np.zeros((blocks, span + 1))
+    np.cumsum(shifted, axis=1, out=sums[:, 1:])
+    np.cumsum(shifted * shifted, axis=1, out=square_sums[:, 1:])
+
+    shifted_mean = ((sums[:, size:] - sums[:, :-size]) / size).ravel()[:windows]
+    mean_square = ((square_sums[:, size:] - square_sums[:, :-size]) / size).ravel()[:windows]
+    variance = np.maximum(mean_square - shifted_mean * shifted_mean, 0.0)
+    mean = shifted_mean + np.repeat(anchors.ravel(), MOMENT_BLOCK)[:windows]
+
+    # Sequential summation error is at most (terms * eps) of the absolute sum
+    scale = 2 * (span + 1) * _EPSILON / size
+    deviations = np.abs(shifted)
+    row_error = scale * (square_sums[:, -1] + 2 * deviations.sum(axis=1) * deviations.max(axis=1))
+    error = np.repeat(row_error, MOMENT_BLOCK)[:windows] + 4 * _EPSILON * (mean_square + variance)
+    return mean, variance, error
@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration
+Puts src on the import path, as src/main.py does for the bot itself
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -0,0 +1,193 @@
+"""
+Integration tests for the sharded connection pool
+Runs DerivClientPool against the local Deriv API stand-in server
+"""
+
+import pytest
+import asyncio
+from src.client_pool import DerivClientPool
+from src.deriv_client import DerivClient
+from src.local_server import LocalDerivServer
+
+
+SYMBOLS = ["R_10", "R_25", "R_50", "R_75", "R_100"]
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop"""
+    return asyncio.run(coro)
+
+
+async def connected_pool(server: LocalDerivServer, size: int, **kwargs) -> DerivClientPool:
+    """Connected, authenticated pool for a running server"""
+    pool = DerivClientPool([DerivClient("1089", "test-token", ws_url=server.url, **kwargs) for _ in range(size)])
+    assert await pool.connect()
+    assert await pool.authenticate()
+    return pool
+
+
+class TestDerivClientPool:
+    """Test sharding, trading and rebalancing"""
+
+    def test_symbols_spread_over_members(self):
+        """Test each member streams only the symbols hashed to it"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                pool = await connected_pool(server, 3)
+                received = {symbol: set() for symbol in SYMBOLS}
+
+                def collector(symbol):
+                    async def on_tick(tick):
+                        received[symbol].add(tick.symbol)
+                    return on_tick
+
+                for symbol in SYMBOLS:
+                    await pool.subscribe_ticks(symbol, collector(symbol))
+                await asyncio.sleep(0.2)
+
+                per_member = [client.tick_symbols for client in pool.clients]
+                await pool.disconnect()
+                return received, per_member
+
+        received, per_member = run(scenario())
+        assert all(received[symbol] == {symbol} for symbol in SYMBOLS)
+        assert sorted(sum(per_member, [])) == sorted(SYMBOLS)  # Each symbol on one member
+        assert sum(1 for symbols in per_member if symbols) > 1
+
+    def test_trade_settles_on_buying_member(self):
+        """Test a pooled trade buys from the member streaming its proposal"""
+        async def scenario():
+            async with LocalDerivServer(seed=3, tick_rate=20, balance=100.0) as server:
+                pool = await connected_pool(server, 2)
+                await pool.subscribe_balance()
+                await pool.subscribe_proposal("R_50", "DIGITEVEN", 1)
+
+                trade = await pool.place_odd_even_trade("EVEN", 1, "R_50")
+                result = await pool.wait_for_settlement(trade["contract_id"], timeout=5)
+
+                await pool.disconnect()
+                return trade, result
+
+        trade, result = run(scenario())
+        assert trade["success"]
+        assert result["is_sold"]
+
+    def test_settlement_polls_elsewhere_when_buyer_drops(self):
+        """Test a contract whose buying member drops mid-settlement is read from another member"""
+        async def scenario():
+            async with LocalDerivServer(seed=3, tick_rate=1, balance=100.0) as server:
+                pool = await connected_pool(server, 2)
+                trade = await pool.place_odd_even_trade("EVEN", 1, "R_50")
+                buyer = pool._contract_owners[trade["contract_id"]]
+
+                settlement = asyncio.create_task(pool.wait_for_settlement(trade["contract_id"], timeout=0.3))
+                await asyncio.sleep(0.1)
+                await buyer.disconnect()
+                result = await settlement
+
+                await pool.disconnect()
+                return trade, result
+
+        trade, result = run(scenario())
+        assert trade["success"]
+        assert result["contract_id"] == trade["contract_id"]
+
+    def test_rebalance_moves_streams_off_dropped_member(self):
+        """Test ticks keep flowing after their member drops"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                pool = await connected_pool(server, 2)
+                epochs = []
+
+                async def on_tick(tick):
+                    epochs.append(tick.epoch)
+
+                await pool.subscribe_ticks("R_50", on_tick)
+                await asyncio.sleep(0.1)
+
+                owner = next(client for client in pool.clients if "R_50" in client.tick_symbols)
+                await owner.disconnect()
+                moved = await pool.rebalance()
+                epochs.clear()
+                await asyncio.sleep(0.2)
+
+                new_owner = next(client for client in pool.clients if "R_50" in client.tick_symbols)
+                await pool.disconnect()
+                return moved, epochs, owner, new_owner
+
+        moved, epochs, owner, new_owner = run(scenario())
+        assert moved == 1
+        assert new_owner is not owner
+        assert epochs
+        assert len(epochs) == len(set(epochs))
+
+    def test_streams_follow_member_down_and_back(self):
+        """Test streams leave a member that stays down and return when it reconnects, unprompted"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                pool = await connected_pool(server, 2, watchdog_interval=0.05)
+                epochs = []
+
+                async def on_tick(tick):
+                    epochs.append(tick.epoch)
+
+                await pool.subscribe_ticks("R_50", on_tick)
+                owner = next(client for client in pool.clients if "R_50" in client.tick_symbols)
+                other = next(client for client in pool.clients if client is not owner)
+
+                await owner.disconnect()  # Stops its own watchdog - it stays down
+                await asyncio.sleep(0.3)
+                while_down = (list(owner.tick_symbols), list(other.tick_symbols))
+                epochs.clear()
+                await asyncio.sleep(0.2)
+                flowing = bool(epochs)
+
+                assert await owner.reconnect()
+                after_recovery = (list(owner.tick_symbols), list(other.tick_symbols))
+
+                await pool.disconnect()
+                return while_down, flowing, after_recovery, epochs
+
+        while_down, flowing, after_recovery, epochs = run(scenario())
+        assert while_down == ([], ["R_50"])
+        assert flowing
+        assert after_recovery == (["R_50"], [])
+        assert len(epochs) == len(set(epochs))
+
+    def test_member_that_cannot_recover_is_retired(self):
+        """Test a member whose recoveries keep failing hands its streams over without escalating"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                pool = await connected_pool(server, 2, watchdog_interval=0.05, max_recovery_attempts=1)
+                escalations = []
+                epochs = []
+
+                async def on_recovery_failed(failed, reason):
+                    escalations.append(reason)
+
+                async def on_tick(tick):
+                    epochs.append(tick.epoch)
+
+                pool.on_recovery_failed = on_recovery_failed
+                await pool.subscribe_ticks("R_50", on_tick)
+                owner = next(client for client in pool.clients if "R_50" in client.tick_symbols)
+                other = next(client for client in pool.clients if client is not owner)
+
+                owner.api_token = ""  # Its re-authorization is refused from now on
+                await server.drop_connections()
+                await asyncio.sleep(0.5)
+                epochs.clear()
+                await asyncio.sleep(0.2)
+
+                state = (owner.is_connected, list(other.tick_symbols))
+                await pool.disconnect()
+                return state, epochs, escalations
+
+        state, epochs, escalations = run(scenario())
+        assert state == (False, ["R_50"])
+        assert epochs
+        assert escalations == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
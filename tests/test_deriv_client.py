@@ -0,0 +1,554 @@
+"""
+Integration tests for the Deriv WebSocket client
+Runs DerivClient against the local Deriv API stand-in server
+"""
+
+import pytest
+import asyncio
+import time
+from src.deriv_client import DerivClient, Subscription, HISTORY_PAGE_SIZE
+from src.ticks import decode_tick
+from src.local_server import LocalDerivServer
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop"""
+    return asyncio.run(coro)
+
+
+async def connected_client(server: LocalDerivServer, **kwargs) -> DerivClient:
+    """Connected, authenticated client for a running server"""
+    client = DerivClient("1089", "test-token", ws_url=server.url, **kwargs)
+    assert await client.connect()
+    assert await client.authenticate()
+    return client
+
+
+class TestRequests:
+    """Test request/response handling"""
+
+    def test_concurrent_requests_overlap(self):
+        """Test independent requests are in flight together"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, latency=0.2) as server:
+                client = await connected_client(server)
+
+                start = time.perf_counter()
+                responses = await client.send_requests([{"ping": 1} for _ in range(10)])
+                elapsed = time.perf_counter() - start
+
+                await client.disconnect()
+                return responses, elapsed
+
+        responses, elapsed = run(scenario())
+        assert all(response["ping"] == "pong" for response in responses)
+        assert elapsed < 1.0  # Sequential would take 2s
+
+    def test_balance_served_from_subscription(self):
+        """Test get_balance does not hit the network once subscribed"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, balance=50.0) as server:
+                client = await connected_client(server)
+                await client.subscribe_balance()
+
+                sent_before = client.request_id
+                balance = await client.get_balance()
+                sent_after = client.request_id
+
+                await client.disconnect()
+                return balance, sent_before, sent_after
+
+        balance, sent_before, sent_after = run(scenario())
+        assert balance == 50.0
+        assert sent_before == sent_after
+
+
+class TestTrading:
+    """Test proposal streaming, buying and settlement"""
+
+    def test_buy_from_cached_proposal_and_settle(self):
+        """Test a trade placed from the proposal stream settles from the contract stream"""
+        async def scenario():
+            async with LocalDerivServer(seed=3, tick_rate=20, balance=100.0) as server:
+                client = await connected_client(server)
+                await client.subscribe_balance()
+                await client.subscribe_proposal("R_50", "DIGITEVEN", 1)
+
+                payout_info = await client.get_payout_info("R_50")
+                trade = await client.place_odd_even_trade("EVEN", 1, "R_50")
+                result = await client.wait_for_settlement(trade["contract_id"], timeout=5)
+                await asyncio.sleep(0.1)  # Let the balance push land
+
+                balance = client.balance
+                await client.disconnect()
+                return payout_info, trade, result, balance
+
+        payout_info, trade, result, balance = run(scenario())
+        assert payout_info["payout_ratio"] == pytest.approx(1.95)
+        assert trade["success"]
+        assert result["is_sold"]
+        assert result["status"] in ("won", "lost")
+        assert balance == pytest.approx(100.0 + result["profit"])
+
+    def test_refused_contract_stream_polls_at_once(self):
+        """Test a settlement wait falls back to polling without sitting out the timeout"""
+        async def scenario():
+            async with LocalDerivServer(seed=3) as server:
+                client = await connected_client(server)
+
+                start = time.perf_counter()
+                result = await client.wait_for_settlement("999999", timeout=3)
+                elapsed = time.perf_counter() - start
+
+                await client.disconnect()
+                return result, elapsed
+
+        result, elapsed = run(scenario())
+        assert result == {}  # Polled - the server knows no such contract
+        assert elapsed < 1.0
+
+    def test_armed_order_buys_by_id_and_rearms(self):
+        """Test an armed order buys by proposal id once and re-arms after a rejected id"""
+        async def scenario():
+            async with LocalDerivServer(seed=3, tick_rate=1, balance=100.0) as server:
+                client = await connected_client(server)
+                armed_id = (await client.arm_order("ODD", 1, "R_50"))["proposal_id"]
+
+                first = await client.place_odd_even_trade("ODD", 1, "R_50", signal_ns=time.monotonic_ns())
+                # Same tick - the id is spent, so this one goes by parameters
+                second = await client.place_odd_even_trade("ODD", 1, "R_50", signal_ns=time.monotonic_ns())
+
+                client.get_cached_proposal("R_50", "DIGITODD", 1)["proposal_id"] = "expired-proposal"
+                rejected = await client.place_odd_even_trade("ODD", 1, "R_50", signal_ns=time.monotonic_ns())
+                for _ in range(50):
+                    rearmed = client.get_cached_proposal("R_50", "DIGITODD", 1) or {}
+                    if rearmed.get("proposal_id"):
+                        break
+                    await asyncio.sleep(0.01)
+
+                metrics = client.get_metrics()
+                await client.disconnect()
+                return armed_id, first, second, rejected, rearmed, metrics
+
+        armed_id, first, second, rejected, rearmed, metrics = run(scenario())
+        assert armed_id
+        assert first["success"] and first["armed"]
+        assert second["success"] and not second["armed"]
+        assert rejected["error"]["code"] == "InvalidContractProposal"
+        assert rearmed["proposal_id"] not in (None, armed_id, "expired-proposal")
+        assert metrics["orders"] == {"armed": 2, "cold": 1}
+        assert metrics["signal_to_ack"]["count"] == 3
+
+    def test_disarm_keeps_a_quoted_stream(self):
+        """Test disarming leaves a stream subscribe_proposal() still holds, and closes one it does not"""
+        async def scenario():
+            async with LocalDerivServer(seed=3, tick_rate=1) as server:
+                client = await connected_client(server)
+                await client.subscribe_proposal("R_50", "DIGITEVEN", 1)  # Payout quotes
+                await client.arm_order("EVEN", 1, "R_50")
+                await client.arm_order("ODD", 1, "R_50")
+                await client.disarm_order("EVEN", 1, "R_50")
+                await client.disarm_order("ODD", 1, "R_50")
+
+                open_after_disarm = sorted(key[2] for key in client.subscriptions)
+                quoted = client.get_cached_proposal("R_50", "DIGITEVEN", 1)
+                await client.unsubscribe_proposal("R_50", "DIGITEVEN", 1)
+                open_after_unsubscribe = list(client.subscriptions)
+
+                await client.disconnect()
+                return open_after_disarm, quoted, open_after_unsubscribe
+
+        open_after_disarm, quoted, open_after_unsubscribe = run(scenario())
+        assert open_after_disarm == ["DIGITEVEN"]
+        assert quoted["payout_ratio"] > 0
+        assert open_after_unsubscribe == []
+
+
+class TestTickRouting:
+    """Test per-symbol tick delivery"""
+
+    def test_ticks_reach_only_their_symbol(self):
+        """Test each consumer sees its own symbol and forgotten symbols go quiet"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server)
+                received = {"R_10": [], "R_75": []}
+
+                async def on_r10(tick):
+                    received["R_10"].append(tick.symbol)
+
+                async def on_r75(tick):
+                    received["R_75"].append(tick.symbol)
+
+                await client.subscribe_ticks("R_10", on_r10)
+                await client.subscribe_ticks("R_75", on_r75)
+                await asyncio.sleep(0.2)
+
+                assert await client.unsubscribe_ticks("R_10", on_r10)
+                await asyncio.sleep(0.05)
+                r10_count = len(received["R_10"])
+                await asyncio.sleep(0.2)
+
+                streams = [stream["symbol"] for stream in server.sessions[0].subscriptions.values()]
+                symbols = client.tick_symbols
+                await client.disconnect()
+                return received, r10_count, symbols, streams
+
+        received, r10_count, symbols, streams = run(scenario())
+        assert set(received["R_10"]) == {"R_10"}
+        assert set(received["R_75"]) == {"R_75"}
+        assert len(received["R_10"]) == r10_count  # Nothing after the forget
+        assert symbols == ["R_75"]
+        assert streams == ["R_75"]  # R_10 forgotten server-side
+
+
+    @pytest.mark.parametrize("policy", ["drop_oldest", "coalesce"])
+    def test_backfill_survives_queue_overflow(self, policy):
+        """Test a full queue evicts live ticks, never a queued backfill batch"""
+        async def scenario():
+            client = DerivClient("1089", "test-token", tick_queue_size=1, tick_overflow=policy)
+            delivered = []
+
+            async def on_tick(tick):
+                delivered.append(tick.epoch)
+
+            async def on_history(ticks):
+                delivered.append([tick.epoch for tick in ticks])
+
+            client.route_ticks("R_50", on_tick, on_history)
+            history = {"history": {"times": [100, 101], "prices": [250.01, 250.02]}, "pip_size": 2}
+            await client._handle_history(history, Subscription(("ticks", "R_50"), {}))
+            # Queue full with the batch - this tick is the one dropped
+            await client._enqueue_tick(decode_tick({"symbol": "R_50", "epoch": 102, "quote": 250.03}, 2))
+            await client._tick_queue.join()
+
+            for epoch in (103, 104):
+                await client._enqueue_tick(decode_tick({"symbol": "R_50", "epoch": epoch, "quote": 250.04}, 2))
+                await client._tick_queue.join()
+
+            client._stop_tick_consumers()
+            return delivered, client.tick_stats["dropped"]
+
+        delivered, dropped = run(scenario())
+        assert delivered == [[100, 101], 103, 104]
+        assert dropped == 1
+
+
+class TestDispatch:
+    """Test msg_type dispatch and stream release"""
+
+    def test_forget_all_and_unhandled_counts(self):
+        """Test forget_all releases one stream type and unknown types are counted"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server)
+
+                async def on_tick(tick):
+                    pass
+
+                await client.subscribe_ticks("R_50", on_tick)
+                await client.subscribe_proposal("R_50", "DIGITEVEN", 1)
+                released = await client.forget_all("proposal")
+                await asyncio.sleep(0.1)
+
+                await client._process_message({"msg_type": "transaction", "transaction": {}})
+                await client._process_message({"msg_type": "transaction", "transaction": {}})
+
+                kinds = [stream["kind"] for stream in server.sessions[0].subscriptions.values()]
+                metrics = client.get_metrics()
+                cached = client.get_cached_proposal("R_50", "DIGITEVEN", 1)
+                await client.disconnect()
+                return released, kinds, metrics, cached
+
+        released, kinds, metrics, cached = run(scenario())
+        assert len(released) == 1
+        assert kinds == ["ticks"]
+        assert cached is None
+        assert metrics["messages"]["unhandled"] == {"transaction": 2}
+
+
+class TestMetrics:
+    """Test latency instrumentation"""
+
+    def test_records_latency_and_timeouts(self):
+        """Test round trips, tick delivery and timeouts are counted"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server)
+
+                async def on_tick(tick):
+                    pass
+
+                await client.subscribe_ticks("R_50", on_tick)
+                await client.send_requests([{"ping": 1} for _ in range(5)])
+                await asyncio.sleep(0.2)
+
+                server.latency = 0.5
+                await client._send_request({"ping": 1}, timeout=0.05)
+
+                metrics = client.get_metrics()
+                await client.disconnect()
+                return metrics
+
+        metrics = run(scenario())
+        assert metrics["requests"]["ping"]["count"] == 5
+        assert metrics["requests"]["authorize"]["count"] == 1
+        assert metrics["tick_to_callback"]["count"] > 0
+        assert metrics["timeouts"] == {"ping": 1}
+        assert metrics["tick_queue"]["policy"] == "drop_oldest"
+
+
+class TestReconnect:
+    """Test recovery after the socket drops"""
+
+    def test_pending_requests_fail_fast(self):
+        """Test requests in flight fail as soon as the socket closes"""
+        async def scenario():
+            async with LocalDerivServer(seed=1) as server:
+                client = await connected_client(server)
+                server.latency = 2.0  # Responses from here on arrive late
+                request = asyncio.create_task(client._send_request({"ping": 1}))
+                await asyncio.sleep(0.1)
+
+                start = time.perf_counter()
+                await server.drop_connections()
+                response = await request
+                elapsed = time.perf_counter() - start
+
+                await client.disconnect()
+                return response, elapsed
+
+        response, elapsed = run(scenario())
+        assert "error" in response
+        assert elapsed < 1.0
+
+    def test_resubscribes_once(self):
+        """Test ticks resume after reconnect without duplicate callbacks"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server)
+                ticks = []
+
+                async def on_tick(tick):
+                    ticks.append(tick.epoch)
+
+                await client.subscribe_ticks("R_50", on_tick)
+                await server.drop_connections()
+                await asyncio.sleep(0.1)
+
+                assert await client.reconnect()
+                await client.subscribe_ticks("R_50", on_tick)  # As a caller might
+                ticks.clear()
+                await asyncio.sleep(0.3)
+
+                await client.disconnect()
+                return ticks
+
+        ticks = run(scenario())
+        assert ticks
+        assert len(ticks) == len(set(ticks))  # Every tick delivered once
+
+    def test_second_drop_during_resubscribe_keeps_registry(self):
+        """Test streams stay registered when the socket drops again while they are re-opened"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server)
+                ticks = []
+
+                async def on_tick(tick):
+                    ticks.append(tick.symbol)
+
+                await client.subscribe_ticks("R_50", on_tick)
+                await client.subscribe_ticks("R_10", on_tick)
+                await server.drop_connections()
+                await asyncio.sleep(0.1)
+
+                server.latency = 0.3
+                recovery = asyncio.create_task(client.reconnect())
+                while len(client._streams_by_req_id) < 2:  # Both re-opens on the wire
+                    await asyncio.sleep(0.01)
+                await server.drop_connections()
+                first = await recovery
+                registered = sorted(client.subscriptions)
+
+                server.latency = 0.0
+                await asyncio.sleep(0.1)
+                second = await client.reconnect()
+                ticks.clear()
+                await asyncio.sleep(0.3)
+
+                await client.disconnect()
+                return first, registered, second, set(ticks)
+
+        first, registered, second, symbols = run(scenario())
+        assert not first
+        assert registered == [("ticks", "R_10"), ("ticks", "R_50")]
+        assert second
+        assert symbols == {"R_10", "R_50"}
+
+    def test_backfill_bridges_history_and_live(self):
+        """Test backfilled and live ticks form one gapless, duplicate-free series"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server)
+                epochs = []
+                batches = []
+
+                async def on_tick(tick):
+                    epochs.append(tick.epoch)
+
+                async def on_history(ticks):
+                    batches.append(len(ticks))
+                    epochs.extend(tick.epoch for tick in ticks)
+
+                await client.subscribe_ticks("R_50", on_tick, backfill=1000, history_callback=on_history)
+                await asyncio.sleep(0.2)
+                await server.drop_connections()
+                await asyncio.sleep(0.2)
+                assert await client.reconnect()
+                await asyncio.sleep(0.2)
+
+                await client.disconnect()
+                return epochs, batches
+
+        epochs, batches = run(scenario())
+        assert batches[0] == 1000
+        assert all(later == earlier + 1 for earlier, later in zip(epochs, epochs[1:]))
+
+    def test_backfill_beyond_one_page(self):
+        """Test a backfill larger than a ticks_history page is delivered in full and in order"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                for _ in range(3000):  # 8000 ticks of history
+                    server.streams["R_50"].next_tick()
+                client = await connected_client(server)
+                batches = []
+
+                async def on_history(ticks):
+                    batches.append([tick.epoch for tick in ticks])
+
+                await client.subscribe_ticks("R_50", backfill=HISTORY_PAGE_SIZE + 2000, history_callback=on_history)
+                await asyncio.sleep(0.1)
+
+                await client.disconnect()
+                return batches
+
+        batches = run(scenario())
+        assert len(batches[0]) >= HISTORY_PAGE_SIZE + 2000
+        assert all(later == earlier + 1 for earlier, later in zip(batches[0], batches[0][1:]))
+
+
+class TestWatchdog:
+    """Test background connection recovery"""
+
+    def test_reconnects_quiet_tick_stream(self):
+        """Test a stream that stops ticking is re-opened without any API ping"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server, watchdog_interval=0.05, stale_tick_intervals=0.1)
+                ticks = []
+
+                async def on_tick(tick):
+                    ticks.append(tick.epoch)
+
+                await client.subscribe_ticks("R_50", on_tick)
+                await asyncio.sleep(0.1)
+                pings_before = client.get_metrics()["requests"].get("ping", {}).get("count", 0)
+
+                server.stalled = True
+                while client.watchdog_stats["recoveries"] == 0:
+                    await asyncio.sleep(0.05)
+                server.stalled = False
+                ticks.clear()
+                await asyncio.sleep(0.3)
+
+                pings_after = client.get_metrics()["requests"].get("ping", {}).get("count", 0)
+                stats = dict(client.watchdog_stats)
+                await client.disconnect()
+                return ticks, stats, pings_before, pings_after
+
+        ticks, stats, pings_before, pings_after = run(scenario())
+        assert stats["last_reason"].startswith("No ticks for R_50")
+        assert ticks
+        assert pings_before == pings_after == 0
+
+    def test_reconnects_dropped_socket(self):
+        """Test a closed socket is replaced without the caller noticing"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server, watchdog_interval=0.05)
+                ticks = []
+
+                async def on_tick(tick):
+                    ticks.append(tick.epoch)
+
+                await client.subscribe_ticks("R_50", on_tick)
+                await server.drop_connections()
+                await asyncio.sleep(0.3)
+                ticks.clear()
+                await asyncio.sleep(0.2)
+
+                connected = client.is_connected
+                await client.disconnect()
+                return connected, ticks
+
+        connected, ticks = run(scenario())
+        assert connected
+        assert ticks
+
+    def test_reopens_registered_stream_left_closed(self):
+        """Test a registered stream that is not open on the connection counts as unhealthy"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server, watchdog_interval=0.05)
+                ticks = []
+
+                async def on_tick(tick):
+                    ticks.append(tick.epoch)
+
+                await client.subscribe_ticks("R_50", on_tick)
+                client._streams_by_req_id.clear()  # As after a re-open that timed out
+                healthy = await client.health_check()
+                await asyncio.sleep(0.3)
+                ticks.clear()
+                await asyncio.sleep(0.2)
+
+                stats = dict(client.watchdog_stats)
+                await client.disconnect()
+                return healthy, stats, ticks
+
+        healthy, stats, ticks = run(scenario())
+        assert not healthy
+        assert stats["last_reason"] == "1 registered streams not open"
+        assert ticks
+
+    def test_escalates_when_authorization_keeps_failing(self):
+        """Test a reconnected but unauthorized socket is unhealthy and escalates after the retry limit"""
+        async def scenario():
+            async with LocalDerivServer(seed=1, tick_rate=50) as server:
+                client = await connected_client(server, watchdog_interval=0.05, max_recovery_attempts=2)
+                failures = []
+
+                async def on_recovery_failed(failed, reason):
+                    failures.append((failed, reason))
+
+                client.on_recovery_failed = on_recovery_failed
+                client.api_token = ""  # The server now refuses to authorize
+                await server.drop_connections()
+                while not failures:
+                    await asyncio.sleep(0.05)
+
+                state = (client.is_connected, client.is_authenticated, await client.health_check())
+                stats = dict(client.watchdog_stats)
+                await client.disconnect()
+                return client, failures, state, stats
+
+        client, failures, state, stats = run(scenario())
+        assert failures[0][0] is client
+        assert state == (True, False, False)
+        assert stats["failed_recoveries"] >= 2
+        assert stats["last_reason"] == "Connected but not authorized"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+"""
+Unit tests for the last digit distribution
+Tests incremental histograms and the chi-square test against SciPy
+"""
+
+import pytest
+import random
+import numpy as np
+from scipy import stats
+from src.digit_stats import DigitDistribution, chi_square_sf
+from src.strategy_even_odd import OddEvenStrategy
+
+
+def skewed_digits(count: int, seed: int = 3):
+    """Last digits with 1 drawn twice as often as the rest"""
+    rng = random.Random(seed)
+    return [rng.choice([0, 1, 1, 2, 3, 4, 5, 6, 7, 8, 9]) for _ in range(count)]
+
+
+class TestChiSquare:
+    """Test the closed-form p-value"""
+
+    @pytest.mark.parametrize("dof", [1, 2, 3, 8, 9, 10])
+    def test_matches_scipy(self, dof):
+        """Test odd and even degrees of freedom across the tail"""
+        for statistic in (0.05, 1.0, 4.2, 9.0, 16.9, 40.0, 150.0):
+            assert chi_square_sf(statistic, dof) == pytest.approx(stats.chi2.sf(statistic, dof), rel=1e-10)
+
+        assert chi_square_sf(0.0, dof) == 1.0
+
+
+class TestDigitDistribution:
+    """Test window histograms stay equal to recounting the latest digits"""
+
+    def test_matches_recount(self):
+        """Test counts, odd counts and the chi-square test at every tick"""
+        digits = skewed_digits(2500)
+        distribution = DigitDistribution((7, 100, 400))
+
+        for i, digit in enumerate(digits):
+            distribution.push(digit)
+            for size, window in distribution.windows.items():
+                recent = digits[max(0, i - size + 1):i + 1]
+                counts = np.bincount(recent, minlength=10)
+                assert window.counts == counts.tolist()
+                assert window.odd_count == sum(d % 2 for d in recent)
+
+                if i % 97 == 0:
+                    expected = stats.chisquare(counts)
+                    assert window.chi_square == pytest.approx(expected.statistic, rel=1e-12, abs=1e-12)
+                    assert window.p_value == pytest.approx(expected.pvalue, rel=1e-9)
+
+        assert len(distribution) == 400
+
+    def test_extend_matches_push(self):
+        """Test batches shorter and longer than the largest window equal single pushes"""
+        digits = skewed_digits(900)
+        pushed, extended = DigitDistribution((20, 200)), DigitDistribution((20, 200))
+
+        for digit in digits:
+            pushed.push(digit)
+        extended.extend(digits[:50])
+        extended.extend(np.array(digits[50:], dtype=np.uint8))
+        extended.extend(digits[:10])
+        for digit in digits[:10]:
+            pushed.push(digit)
+
+        for size in (20, 200):
+            assert extended[size].counts == pushed[size].counts
+            assert extended[size].chi_square == pytest.approx(pushed[size].chi_square)
+
+    def test_contract_counts(self):
+        """Test the matches/differs and over/under counts read off one window"""
+        distribution = DigitDistribution((10,))
+        distribution.extend([0, 1, 1, 2, 3, 5, 7, 7, 7, 9])
+        window = distribution[10]
+
+        assert (window.matches(7), window.differs(7)) == (3, 7)
+        assert window.frequency(1) == pytest.approx(0.2)
+        assert (window.over(5), window.under(5)) == (4, 5)
+        assert (window.odd_count, window.even_count) == (8, 2)
+
+    def test_strategy_reports_uniformity(self):
+        """Test the strategy's statistics carry the digit test"""
+        strategy = OddEvenStrategy({"lookback_window": 20})
+        for i, digit in enumerate(skewed_digits(300)):
+            strategy.add_quote(250.0 + i / 100, digit)
+
+        statistics = strategy.get_statistics()
+        expected = stats.chisquare(np.bincount(skewed_digits(300)[-200:], minlength=10))
+        assert statistics["digit_chi_square"] == pytest.approx(expected.statistic)
+        assert statistics["digit_p_value"] == pytest.approx(expected.pvalue)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,111 @@
+"""
+Unit tests for the client-side rate limiter
+Tests token-bucket pacing and priority lanes
+"""
+
+import pytest
+import asyncio
+import time
+from src.rate_limit import PriorityRateLimiter, lane_for
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop"""
+    return asyncio.run(coro)
+
+
+class TestPriorityRateLimiter:
+    """Test token buckets and lane ordering"""
+
+    def test_lanes(self):
+        """Test msg_types map to call classes"""
+        assert lane_for("buy") == "buy"
+        assert lane_for("proposal_open_contract") == "settlement"
+        assert lane_for("ticks_history") == "default"
+
+    def test_paces_to_rate(self):
+        """Test calls beyond the burst wait for refills"""
+        async def scenario():
+            limiter = PriorityRateLimiter({"connection": {"rate": 20.0, "burst": 5}, "reserve": 0})
+            start = time.perf_counter()
+            await asyncio.gather(*(limiter.acquire() for _ in range(15)))
+            return time.perf_counter() - start
+
+        elapsed = run(scenario())
+        assert 0.4 < elapsed < 1.0  # 10 calls past the burst at 20/s
+
+    def test_buy_jumps_the_queue(self):
+        """Test a buy is granted before pings queued ahead of it"""
+        async def scenario():
+            limiter = PriorityRateLimiter({"connection": {"rate": 20.0, "burst": 1}, "ping": None, "reserve": 0})
+            order = []
+
+            async def call(lane):
+                await limiter.acquire(lane)
+                order.append(lane)
+
+            await limiter.acquire("ping")  # Empty the bucket
+            pings = [asyncio.create_task(call("ping")) for _ in range(3)]
+            await asyncio.sleep(0)
+            buy = asyncio.create_task(call("buy"))
+            await asyncio.gather(buy, *pings)
+            return order
+
+        assert run(scenario())[0] == "buy"
+
+    def test_reserve_held_for_buys(self):
+        """Test low lanes leave the reserved tokens to buys"""
+        async def scenario():
+            limiter = PriorityRateLimiter({"connection": {"rate": 0.1, "burst": 3},
+                                           "balance": None, "reserve": 1})
+            await limiter.acquire("balance")
+            await limiter.acquire("balance")
+            blocked = asyncio.create_task(limiter.acquire("balance"))
+            await asyncio.wait_for(limiter.acquire("buy"), timeout=0.1)
+            await asyncio.sleep(0.05)
+            waiting = not blocked.done()
+            blocked.cancel()
+            return waiting
+
+        assert run(scenario())
+
+    def test_lower_lane_not_held_by_class_bucket(self):
+        """Test a proposal waiting on its own bucket does not hold up other calls"""
+        async def scenario():
+            limiter = PriorityRateLimiter({"connection": {"rate": 1.0, "burst": 100},
+                                           "proposal": {"rate": 0.2, "burst": 1}})
+            await limiter.acquire("proposal")
+            paced = asyncio.create_task(limiter.acquire("proposal"))
+            await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+            await limiter.acquire("default")
+            elapsed = time.perf_counter() - start
+            queued = not paced.done()
+            paced.cancel()
+            return elapsed, queued
+
+        elapsed, queued = run(scenario())
+        assert queued
+        assert elapsed < 0.05
+
+    def test_wakes_for_connection_refill(self):
+        """Test a queued call is granted when the connection refills, not when a slower bucket does"""
+        async def scenario():
+            limiter = PriorityRateLimiter({"connection": {"rate": 10.0, "burst": 1},
+                                           "proposal": {"rate": 0.2, "burst": 1}, "reserve": 0})
+            await limiter.acquire("proposal")
+            paced = asyncio.create_task(limiter.acquire("proposal"))
+            await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+            await limiter.acquire("default")
+            elapsed = time.perf_counter() - start
+            paced.cancel()
+            return elapsed
+
+        assert run(scenario()) < 0.3  # Connection refill is 0.1s, the proposal bucket 5s
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+"""
+Tests for frame recording and replay
+Records a local server session and replays it through DerivClient
+"""
+
+import pytest
+import asyncio
+import time
+from src.deriv_client import DerivClient
+from src.local_server import LocalDerivServer
+from src.recorder import FrameRecorder, FrameReplayer, read_recording
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop"""
+    return asyncio.run(coro)
+
+
+async def record_session(path: str) -> list:
+    """Record a short tick and proposal session, returning the ticks seen live"""
+    async with LocalDerivServer(seed=5, tick_rate=50) as server:
+        client = DerivClient("1089", "test-token", ws_url=server.url, record_path=path)
+        assert await client.connect()
+        assert await client.authenticate()
+        live = []
+
+        async def on_tick(tick):
+            live.append((tick.epoch, tick.last_digit))
+
+        await client.subscribe_ticks("R_50", on_tick, backfill=100)
+        await client.subscribe_proposal("R_50", "DIGITEVEN", 1)
+        await asyncio.sleep(0.3)
+        await client.disconnect()
+        return live
+
+
+class TestRecorder:
+    """Test the recording file format"""
+
+    def test_sessions_append(self, tmp_path):
+        """Test reopening a recording appends a new session"""
+        path = str(tmp_path / "frames.txt.gz")
+        for frame in ('{"a": 1}', '{"b": 2}'):
+            with FrameRecorder(path) as recorder:
+                recorder.write(time.monotonic_ns(), frame)
+
+        entries = list(read_recording(path))
+        assert [frame for received_ns, frame in entries if received_ns is not None] == ['{"a": 1}', '{"b": 2}']
+        assert sum(1 for received_ns, _ in entries if received_ns is None) == 2
+
+
+class TestReplayer:
+    """Test replay through the live message path"""
+
+    def test_replay_matches_live(self, tmp_path):
+        """Test a max-speed replay delivers the ticks and quotes seen live"""
+        path = str(tmp_path / "session.txt.gz")
+        live = run(record_session(path))
+
+        async def replay():
+            client = DerivClient("replay", "replay", tick_overflow="block")
+            replayed = []
+
+            async def on_tick(tick):
+                replayed.append((tick.epoch, tick.last_digit))
+
+            client.route_ticks("R_50", on_tick)
+            stats = await FrameReplayer(client, path, speed=None).replay()
+            client._stop_tick_consumers()
+            return replayed, stats, client.get_cached_proposal("R_50", "DIGITEVEN", 1)
+
+        replayed, stats, proposal = run(replay())
+        # Backfill and live ticks in the same order; the recording may hold a
+        # last tick that arrived as the live client disconnected
+        assert len(live) > 100
+        assert replayed[:len(live)] == live
+        assert len(replayed) - len(live) <= 1
+        assert stats["sessions"] == 1
+        assert proposal["payout_ratio"] == pytest.approx(1.95)
+
+    def test_paced_replay(self, tmp_path):
+        """Test 1x replay takes the recorded time and 4x a quarter of it"""
+        path = str(tmp_path / "paced.txt.gz")
+        with FrameRecorder(path) as recorder:
+            for index in range(5):
+                recorder.write(index * 100_000_000, '{"msg_type": "ping", "ping": "pong"}')
+
+        async def replay(speed):
+            return (await FrameReplayer(DerivClient("replay", "replay"), path, speed).replay())["elapsed"]
+
+        assert 0.35 < run(replay(1.0)) < 0.6
+        assert run(replay(4.0)) < 0.2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
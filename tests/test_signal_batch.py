@@ -0,0 +1,102 @@
+"""
+Unit tests for batch signal evaluation
+Tests analyze_signal_batch() against analyze_signal() tick by tick
+"""
+
+import pytest
+import random
+from src.strategy_even_odd import OddEvenStrategy
+from src.backtest import BacktestEngine
+
+
+def biased_stream(count: int, seed: int = 1):
+    """(digits, quotes) with runs of odd digits and a slowly wandering quote"""
+    rng = random.Random(seed)
+    quote, digits, quotes = 250.0, [], []
+    for _ in range(count):
+        quote = round(quote + rng.gauss(0, 0.05), 4)
+        digit = round(quote * 10000) % 10
+        digits.append(1 if rng.random() < 0.3 else digit)
+        quotes.append(quote)
+    return digits, quotes
+
+
+def assert_matches_live(config, digits, quotes, payout_ratio=1.9):
+    """Every batch position equals the live signal after the same ticks"""
+    config = dict(config, cooldown_between_trades=0)
+    live = OddEvenStrategy(config)
+    batch = OddEvenStrategy(config).analyze_signal_batch(digits, quotes, payout_ratio)
+    assert len(batch) == len(digits)
+
+    traded = 0
+    for i, (digit, quote) in enumerate(zip(digits, quotes)):
+        live.add_quote(quote, digit)
+        expected = live.analyze_signal(10.0, payout_ratio)
+        assert batch.signal(i) == expected, i
+        traded += expected.side != "SKIP"
+    return traded
+
+
+class TestSignalBatch:
+    """Test the vectorized path is bit-identical to the per-tick path"""
+
+    @pytest.mark.parametrize("config", [
+        {},
+        {"volatility_threshold": 0.0003},
+        {"volatility_threshold": 0.0003, "min_confidence_threshold": 0.0},
+        {"volatility_estimator": "ewma", "volatility_threshold": 0.0003},
+        {"lookback_window": 3, "frequency_bias_threshold": 0.1},
+        {"lookback_window": 40, "frequency_bias_threshold": 0.05, "volatility_threshold": 0.0002},
+    ])
+    def test_matches_per_tick(self, config):
+        """Test sides, confidences, stake fractions and reasons at every tick"""
+        digits, quotes = biased_stream(3000)
+        assert assert_matches_live(config, digits, quotes) > 0
+
+    def test_threshold_at_live_volatility(self):
+        """Test a threshold equal to a live volatility value, where rounding decides"""
+        digits, quotes = biased_stream(3000)
+        strategy = OddEvenStrategy({"lookback_window": 20})
+        strategy.add_ticks([{"last_digit": d, "quote": q} for d, q in zip(digits[:1700], quotes[:1700])])
+        threshold = strategy._coefficient_of_variation(strategy.quote_window)
+
+        config = {"volatility_threshold": threshold, "frequency_bias_threshold": 0.05}
+        assert assert_matches_live(config, digits, quotes) > 0
+
+    def test_cooldown_and_state(self):
+        """Test an active cooldown skips everything and the strategy's ticks are untouched"""
+        digits, quotes = biased_stream(500)
+        strategy = OddEvenStrategy({"cooldown_between_trades": 60})
+        strategy.update_trade_result("ODD", 1.0, 0.9)
+
+        batch = strategy.analyze_signal_batch(digits, quotes, 1.9)
+        assert set(batch.side.tolist()) == {"SKIP"}
+        assert batch.reason(499) == "Cooldown period active"
+        assert strategy.total_ticks == 0
+        with pytest.raises(ValueError):
+            strategy.analyze_signal_batch(digits, quotes[:-1], 1.9)
+
+    def test_backtest_uses_batch(self):
+        """Test the backtest trades exactly where the per-tick signal does"""
+        engine = BacktestEngine({"backtest": {"min_samples": 2000}})
+        random.seed(3)
+        engine.generate_synthetic_ticks(2000)
+        config = {"cooldown_between_trades": 0, "volatility_threshold": 0.0005}
+
+        results = engine.run_backtest(OddEvenStrategy(config))
+
+        live = OddEvenStrategy(config)
+        expected = []
+        for i, tick in enumerate(engine.synthetic_ticks):
+            live.add_quote(tick.quote, tick.last_digit)
+            if i >= live.lookback_window and i + 1 < 2000:
+                signal = live.analyze_signal(10.0, 1.9)
+                if signal.side != "SKIP":
+                    expected.append((i, signal.side, signal.reason))
+
+        trades = [(t["tick_index"], t["side"], t["reason"]) for t in results["trades_data"]]
+        assert trades and trades == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,88 @@
+"""
+Unit tests for the columnar tick store
+Tests ring-buffer wraparound and zero-copy window views
+"""
+
+import pytest
+import numpy as np
+from src.tick_store import TickStore
+from src.strategy_even_odd import OddEvenStrategy
+
+
+def sample_ticks(count: int):
+    """(epoch, quote, digit) rows"""
+    return [(1700000000 + i, 250.0 + i / 100, i % 10) for i in range(count)]
+
+
+class TestTickStore:
+    """Test appends, wraparound and views"""
+
+    def test_windows_after_wraparound(self):
+        """Test every window is the latest ticks in order, across many wraps"""
+        store = TickStore(capacity=7)
+        rows = sample_ticks(40)
+
+        for i, row in enumerate(rows):
+            store.append(*row)
+            held = rows[max(0, i - 6):i + 1]
+            assert len(store) == len(held)
+            for count in (1, 3, 7, 50):
+                expected = held[-count:]
+                assert store.epochs(count).tolist() == [epoch for epoch, _, _ in expected]
+                assert store.quotes(count).tolist() == [quote for _, quote, _ in expected]
+                assert store.digits(count).tolist() == [digit for _, _, digit in expected]
+
+    def test_views_are_zero_copy_and_read_only(self):
+        """Test windows share the store's memory and cannot be written through"""
+        store = TickStore(capacity=5)
+        for row in sample_ticks(12):
+            store.append(*row)
+
+        window = store.quotes(4)
+        assert window.flags.c_contiguous
+        assert np.shares_memory(window, store._quotes)
+        with pytest.raises(ValueError):
+            window[0] = 1.0
+
+    def test_extend_matches_append(self):
+        """Test column batches (shorter and longer than capacity) equal single appends"""
+        rows = sample_ticks(23)
+        appended, extended = TickStore(capacity=10), TickStore(capacity=10)
+
+        for row in rows:
+            appended.append(*row)
+        extended.extend(*zip(*rows[:4]))
+        extended.extend(*zip(*rows[4:]))
+
+        assert extended.quotes().tolist() == appended.quotes().tolist()
+        assert extended.digits().tolist() == appended.digits().tolist()
+        assert [tick.epoch for tick in extended] == [tick.epoch for tick in appended]
+
+    def test_records(self):
+        """Test indexing and iteration give tick-like records"""
+        store = TickStore(capacity=3, symbol="R_50")
+        for row in sample_ticks(5):
+            store.append(*row)
+
+        assert store[-1]["last_digit"] == 4
+        assert store[0].quote == pytest.approx(250.02)
+        assert [tick.symbol for tick in store] == ["R_50"] * 3
+        with pytest.raises(IndexError):
+            store[3]
+
+    def test_strategy_loads_store(self):
+        """Test a strategy takes a store's columns in one batch"""
+        store = TickStore(capacity=500)
+        for row in sample_ticks(500):
+            store.append(*row)
+
+        strategy = OddEvenStrategy({"lookback_window": 20})
+        strategy.add_ticks(store)
+
+        assert strategy.total_ticks == 500
+        assert strategy.tick_history.digits().tolist() == store.digits().tolist()
+        assert strategy.digits[20].odd_count == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
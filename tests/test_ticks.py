@@ -0,0 +1,109 @@
+"""
+Unit tests for tick decoding
+Tests last-digit extraction against pip_size
+"""
+
+import pytest
+import json
+import random
+from decimal import Decimal
+from src.ticks import TickRecord, decode_tick, decode_tick_frame, last_digit, pip_size_from_pip
+
+
+class TestLastDigit:
+    """Test scaled-integer last digit extraction"""
+
+    def test_trailing_zero_quotes(self):
+        """Test quotes whose trailing zero JSON dropped"""
+        assert last_digit(1234.5, 2) == 0  # quoted 1234.50
+        assert last_digit(1234.0, 2) == 0  # quoted 1234.00
+        assert last_digit(250.1, 4) == 0   # quoted 250.1000
+
+    def test_matches_exact_decimal(self):
+        """Test float quotes give the same digit as exact decimal arithmetic"""
+        rng = random.Random(7)
+        for pip_size in (1, 2, 3, 4, 5):
+            for _ in range(2000):
+                text = f"{rng.uniform(1, 20000):.{pip_size}f}"
+                expected = int(Decimal(text).scaleb(pip_size)) % 10
+                assert last_digit(float(text), pip_size) == expected
+
+    def test_pip_size_from_pip(self):
+        """Test active_symbols pip values map to decimal places"""
+        assert pip_size_from_pip(0.01) == 2
+        assert pip_size_from_pip(0.0001) == 4
+        assert pip_size_from_pip(1) == 0
+
+
+class TestDecodeTick:
+    """Test tick payload decoding"""
+
+    def test_decodes_payload(self):
+        """Test a full tick payload"""
+        tick = decode_tick({"symbol": "R_50", "epoch": 1718000000, "quote": 253.45, "pip_size": 4})
+
+        assert isinstance(tick, TickRecord)
+        assert tick.symbol == "R_50"
+        assert tick.epoch == 1718000000
+        assert tick.last_digit == 0
+        assert not tick.is_odd
+
+    def test_fallback_pip_size(self):
+        """Test pip size from active_symbols when the payload has none"""
+        tick = decode_tick({"symbol": "R_50", "epoch": 1, "quote": 253.4517}, pip_size=4)
+        assert tick.last_digit == 7
+        assert tick.is_odd
+
+    def test_unknown_pip_size(self):
+        """Test ticks without a known pip size carry no digit"""
+        tick = decode_tick({"symbol": "R_50", "epoch": 1, "quote": 253.4517})
+        assert "last_digit" not in tick
+
+    def test_dict_style_access(self):
+        """Test records read like tick dictionaries"""
+        tick = decode_tick({"symbol": "R_50", "epoch": 1, "quote": 253.4517, "pip_size": 4})
+
+        assert "last_digit" in tick
+        assert tick["quote"] == 253.4517
+        with pytest.raises(KeyError):
+            tick["missing"]
+
+
+def tick_frame(tick: dict, **message) -> str:
+    """Compact tick frame as Deriv sends it"""
+    payload = {"echo_req": {"ticks": tick["symbol"], "subscribe": 1}, "msg_type": "tick",
+               "subscription": {"id": "abc-123"}, "tick": tick, **message}
+    return json.dumps(payload, separators=(",", ":"))
+
+
+class TestDecodeTickFrame:
+    """Test the raw-frame tick fast path"""
+
+    def test_matches_full_decode(self):
+        """Test the fast path gives the same record as decoding the parsed JSON"""
+        rng = random.Random(11)
+        for pip_size in (2, 3, 4):
+            for _ in range(1000):
+                quote = round(rng.uniform(1, 20000), pip_size)
+                tick = {"ask": quote, "bid": quote, "epoch": rng.randrange(1 << 31), "id": "abc-123",
+                        "pip_size": pip_size, "quote": quote, "symbol": "R_50"}
+
+                subscription_id, fast = decode_tick_frame(tick_frame(tick), received_ns=5)
+                full = decode_tick(json.loads(tick_frame(tick))["tick"], received_ns=5)
+
+                assert subscription_id == "abc-123"
+                assert (fast.symbol, fast.epoch, fast.quote, fast.pip_size, fast.last_digit, fast.received_ns) == \
+                       (full.symbol, full.epoch, full.quote, full.pip_size, full.last_digit, full.received_ns)
+
+    def test_other_frames_fall_back(self):
+        """Test non-tick, error and unexpected tick layouts are left to full decoding"""
+        tick = {"epoch": 1, "quote": 253.45, "symbol": "R_50", "pip_size": 4, "id": "abc-123"}
+
+        assert decode_tick_frame('{"msg_type":"balance","balance":{"balance":10}}') is None
+        assert decode_tick_frame('{"error":{"code":"MarketIsClosed"},"msg_type":"tick"}') is None
+        assert decode_tick_frame(tick_frame(tick)) is None  # Fields out of Deriv's order
+        assert decode_tick_frame(tick_frame(tick).encode()) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
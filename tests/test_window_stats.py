@@ -0,0 +1,167 @@
+"""
+Unit tests for rolling window statistics
+Tests the O(1) accumulators against recomputing each window from scratch
+"""
+
+import pytest
+import random
+import numpy as np
+import pandas as pd
+from src.window_stats import EwmaVariance, RollingWindow, rolling_moments
+from src.strategy_even_odd import OddEvenStrategy
+
+
+def random_walk(count: int, seed: int = 5, start: float = 6340.0):
+    """Quotes shaped like a volatility index stream"""
+    rng = random.Random(seed)
+    quote = start
+    quotes = []
+    for _ in range(count):
+        quote = round(quote + rng.gauss(0, 0.5), 2)
+        quotes.append(quote)
+    return quotes
+
+
+class TestRollingWindow:
+    """Test incremental window updates"""
+
+    def test_matches_recomputed_window(self):
+        """Test moments match the window recomputed at every tick"""
+        walk = random_walk(3000)
+        window = RollingWindow(50)
+
+        for i, quote in enumerate(walk):
+            window.push(quote)
+            quotes = walk[max(0, i - 49):i + 1]
+
+            assert len(window) == len(quotes)
+            assert window.mean == pytest.approx(np.mean(quotes), rel=1e-12)
+            assert window.std == pytest.approx(np.std(quotes), rel=1e-6, abs=1e-9)
+
+    def test_extend_matches_push(self):
+        """Test a batch gives the same window as pushing one at a time"""
+        quotes = random_walk(500)
+        pushed, extended, short = RollingWindow(100), RollingWindow(100), RollingWindow(100)
+
+        for quote in quotes:
+            pushed.push(quote)
+        extended.extend(quotes)
+        short.extend(quotes[:30])
+        short.extend(quotes[30:])
+
+        for window in (extended, short):
+            assert len(window) == len(pushed)
+            assert window.mean == pytest.approx(pushed.mean, rel=1e-12)
+            assert window.std == pytest.approx(pushed.std, rel=1e-9)
+
+    def test_stable_over_long_session(self):
+        """Test a tiny spread on a large quote level stays accurate across many evictions"""
+        walk = random_walk(200000, seed=11, start=1_000_000.0)
+        window = RollingWindow(64)
+
+        for i, quote in enumerate(walk):
+            window.push(quote)
+            # Sample just before the periodic rebuild, where drift would be largest
+            if i % 9973 == 0 or window._evictions == window.size - 1 and i > 150000:
+                quotes = walk[max(0, i - 63):i + 1]
+                assert window.std == pytest.approx(np.std(quotes), rel=1e-7)
+
+    def test_replay_matches_push(self):
+        """Test replaying from the last rebuild gives the pushed window bit for bit"""
+        quotes = random_walk(700)
+        window = RollingWindow(30)
+
+        for i, quote in enumerate(quotes):
+            window.push(quote)
+            replayed = RollingWindow.replay(quotes[:i + 1], 30)
+            assert (replayed.mean, replayed.variance) == (window.mean, window.variance)
+
+
+class TestRollingMoments:
+    """Test the vectorized window moments"""
+
+    def test_matches_numpy_within_bound(self):
+        """Test every window's mean and variance, and that the error bound holds"""
+        quotes = np.array(random_walk(5000, start=1_000_000.0))
+        mean, variance, error = rolling_moments(quotes, 25)
+        windows = np.lib.stride_tricks.sliding_window_view(quotes, 25)
+
+        assert len(mean) == len(windows)
+        np.testing.assert_allclose(mean, windows.mean(axis=1), rtol=1e-14)
+        assert np.all(np.abs(variance - windows.var(axis=1)) <= error)
+        assert all(len(part) == 0 for part in rolling_moments(quotes[:10], 25))
+
+
+class TestEwmaVariance:
+    """Test the exponentially weighted estimator"""
+
+    def test_matches_pandas(self):
+        """Test mean and variance equal pandas' recursive EWM"""
+        quotes = pd.Series(random_walk(2000))
+        ewma = EwmaVariance(span=20)
+        ewma.extend(quotes.tolist())
+
+        expected = quotes.ewm(span=20, adjust=False)
+        assert len(ewma) == 2000
+        assert ewma.mean == pytest.approx(expected.mean().iloc[-1], rel=1e-12)
+        assert ewma.variance == pytest.approx(expected.var(bias=True).iloc[-1], rel=1e-9)
+
+    def test_trace_matches_push(self):
+        """Test tracing a stream records exactly the pushed states"""
+        quotes = random_walk(300)
+        pushed, traced = EwmaVariance(span=15), EwmaVariance(span=15)
+        means, variances = traced.trace(quotes[:100])
+        more_means, _ = traced.trace(quotes[100:])
+
+        for i, quote in enumerate(quotes[:100]):
+            pushed.push(quote)
+            assert (means[i], variances[i]) == (pushed.mean, pushed.variance)
+        pushed.extend(quotes[100:])
+        assert (more_means[-1], traced.variance, len(traced)) == (pushed.mean, pushed.variance, 300)
+
+    def test_first_quote(self):
+        """Test one quote gives its value and zero variance"""
+        ewma = EwmaVariance(span=10)
+        ewma.push(6340.5)
+        assert (ewma.mean, ewma.std) == (6340.5, 0.0)
+        with pytest.raises(ValueError):
+            EwmaVariance(span=0)
+
+
+class TestStrategyWindows:
+    """Test the strategy reads its windows instead of rescanning history"""
+
+    def test_signal_inputs_match_history(self):
+        """Test frequency and volatility inputs equal a scan of the latest ticks"""
+        strategy = OddEvenStrategy({"lookback_window": 20})
+        strategy.add_ticks([{"last_digit": round(q * 100) % 10, "quote": q} for q in random_walk(5000)])
+
+        recent = list(strategy.tick_history)[-20:]
+        quotes = [tick["quote"] for tick in recent]
+        window = strategy.quote_window
+
+        assert strategy.digits[20].odd_count == sum(tick["last_digit"] % 2 for tick in recent)
+        assert window.std / window.mean == pytest.approx(np.std(quotes) / np.mean(quotes), rel=1e-6)
+        assert strategy.digits[200].odd_count == sum(tick["last_digit"] % 2 for tick in list(strategy.tick_history)[-200:])
+
+    def test_ewma_volatility_filter(self):
+        """Test the EWMA option is fed by batches and single ticks and drives the filter"""
+        ticks = [{"last_digit": round(q * 100) % 10, "quote": q} for q in random_walk(300)]
+        strategy = OddEvenStrategy({"lookback_window": 20, "volatility_estimator": "ewma", "volatility_span": 30})
+        strategy.add_ticks(ticks[:250])
+        for tick in ticks[250:]:
+            strategy.add_tick(tick)
+
+        expected = EwmaVariance(span=30)
+        expected.extend(tick["quote"] for tick in ticks)
+        assert strategy.ewma.std == pytest.approx(expected.std, rel=1e-12)
+
+        strategy.volatility_threshold = expected.std / expected.mean / 2
+        assert strategy._analyze_volatility(strategy.ewma)["skip"]
+
+        with pytest.raises(ValueError):
+            OddEvenStrategy({"volatility_estimator": "garch"})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])